@@ -114,9 +114,21 @@ _ensure_keras_2_importable()
 # pylint: disable=g-import-not-at-top
 # pylint: disable=g-bad-import-order
 # Symbols exposed via tensorflow_hub.
+from tensorflow_hub.async_loading import load_async
+from tensorflow_hub.batching import batched
+from tensorflow_hub.dataset_mapping import map_dataset
+from tensorflow_hub.inspection import inspect
+from tensorflow_hub.instrumentation import disable as disable_instrumentation
+from tensorflow_hub.instrumentation import enable as enable_instrumentation
+from tensorflow_hub.instrumentation import snapshot as instrumentation_snapshot
 from tensorflow_hub.keras_layer import KerasLayer
+from tensorflow_hub.load_report import add_listener as add_load_listener
+from tensorflow_hub.load_report import LoadReport
+from tensorflow_hub.load_report import remove_listener as remove_load_listener
 from tensorflow_hub.module_v2 import load
 from tensorflow_hub.module_v2 import resolve
+from tensorflow_hub.output_cache import OutputCache
+from tensorflow_hub.replica_pool import ReplicaPool
 from tensorflow_hub.version import __version__
 
 from tensorflow_hub.config import _run, _get_extra_deps  # pylint: disable=g-multiple-import
@@ -130,7 +142,19 @@ _run()
 # `from tensorflow_hub import *`).
 __all__ = [
     "KerasLayer",
+    "LoadReport",
+    "OutputCache",
+    "ReplicaPool",
+    "add_load_listener",
+    "batched",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "inspect",
+    "instrumentation_snapshot",
     "load",
+    "load_async",
+    "map_dataset",
+    "remove_load_listener",
     "resolve",
 ]
 
@@ -0,0 +1,441 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Sidecar index for random access to single files of a module archive.
+
+A module archive is normally a gzip-compressed tar stream, which can only be
+read front to back. A publisher can instead write a *seekable* archive with
+write_seekable_archive(): a regular .tar.gz file, so existing clients keep
+working, in which the compressor is reset at the start of every tar entry.
+The byte range of each entry can then be decompressed on its own. The
+offsets are stored in a JSON sidecar file next to the archive
+(`<archive>.index.json`), which allows fetching single files such as
+`saved_model.pb` over HTTP Range requests or GFile.seek().
+
+For uncompressed .tar archives build_tar_index() computes the same index
+from the archive itself.
+"""
+
+import json
+import os
+import struct
+import tarfile
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+
+from tensorflow_hub import file_utils
+from tensorflow_hub import filesystem
+
+
+INDEX_SUFFIX = ".index.json"
+_FORMAT_VERSION = 1
+_TAR_BLOCK_SIZE = tarfile.BLOCKSIZE
+_BUFFER_SIZE = 10 << 20
+
+# Entries are raw deflate streams starting at a full flush point.
+COMPRESSION_DEFLATE = "deflate"
+COMPRESSION_NONE = "none"
+
+
+def index_filename(archive_path):
+  """Returns the name of the sidecar index file for `archive_path`."""
+  return archive_path + INDEX_SUFFIX
+
+
+class ArchiveMember(object):
+  """Location of one tar entry inside an indexed archive.
+
+  Attributes:
+    name: Normalized relative path of the entry, e.g. "saved_model.pb".
+    is_dir: Whether the entry is a directory.
+    size: Size of the file content in bytes.
+    offset: Offset in the archive of the byte range holding the entry.
+    length: Length of that byte range (compressed, if the archive is).
+    data_offset: Offset of the file content inside the (decompressed) range.
+  """
+
+  def __init__(self, name, is_dir, size, offset, length, data_offset):
+    self.name = name
+    self.is_dir = is_dir
+    self.size = size
+    self.offset = offset
+    self.length = length
+    self.data_offset = data_offset
+
+  def to_dict(self):
+    return {
+        "name": self.name,
+        "is_dir": self.is_dir,
+        "size": self.size,
+        "offset": self.offset,
+        "length": self.length,
+        "data_offset": self.data_offset,
+    }
+
+
+class ArchiveIndex(object):
+  """Maps the files of a module archive to byte ranges of the archive."""
+
+  def __init__(self, compression, members):
+    if compression not in (COMPRESSION_DEFLATE, COMPRESSION_NONE):
+      raise ValueError("Unsupported archive index compression: %r" %
+                       compression)
+    self._compression = compression
+    self._members = {m.name: m for m in members}
+
+  @property
+  def compression(self):
+    return self._compression
+
+  @classmethod
+  def from_json(cls, content):
+    """Parses an index from the contents of a sidecar index file."""
+    data = json.loads(content)
+    if data.get("format_version") != _FORMAT_VERSION:
+      raise ValueError("Unsupported archive index format version: %r" %
+                       data.get("format_version"))
+    return cls(data["compression"],
+               [ArchiveMember(**member) for member in data["members"]])
+
+  def to_json(self):
+    """Returns the contents of a sidecar index file for this index."""
+    return json.dumps({
+        "format_version": _FORMAT_VERSION,
+        "compression": self._compression,
+        "members": [m.to_dict() for m in self._members.values()],
+    }, indent=1)
+
+  def names(self):
+    """Returns the names of all entries, in archive order."""
+    return list(self._members)
+
+  def __contains__(self, name):
+    return _normalize_name(name) in self._members
+
+  def member(self, name):
+    """Returns the ArchiveMember for `name`. Raises KeyError if missing."""
+    try:
+      return self._members[_normalize_name(name)]
+    except KeyError:
+      raise KeyError("%s is not part of the archive." % name)
+
+
+def _normalize_name(name):
+  norm = os.path.normpath(name.lstrip("/"))
+  return "" if norm == "." else norm
+
+
+class _ArchiveWriter(object):
+  """Writes a tar stream whose entries can be decompressed independently.
+
+  With compression, the archive is a single regular gzip member. After each
+  tar entry the deflate stream is flushed with Z_FULL_FLUSH, which aligns it
+  to a byte boundary and resets the compression history, so decompression
+  can start at the offset of any entry.
+  """
+
+  def __init__(self, dst, compress):
+    self._dst = dst
+    self._offset = 0
+    self._compressor = None
+    if compress:
+      self._compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+      self._crc = 0
+      self._size = 0
+      # Gzip header without file name or modification time.
+      self._write_raw(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+
+  @property
+  def offset(self):
+    return self._offset
+
+  def _write_raw(self, buf):
+    self._dst.write(buf)
+    self._offset += len(buf)
+
+  def write(self, buf):
+    if self._compressor is None:
+      self._write_raw(buf)
+      return
+    self._crc = zlib.crc32(buf, self._crc)
+    self._size += len(buf)
+    self._write_raw(self._compressor.compress(buf))
+
+  def end_entry(self):
+    """Makes the next entry start at an independently decodable offset."""
+    if self._compressor is not None:
+      self._write_raw(self._compressor.flush(zlib.Z_FULL_FLUSH))
+
+  def close(self):
+    if self._compressor is not None:
+      self._write_raw(self._compressor.flush(zlib.Z_FINISH))
+      self._write_raw(
+          struct.pack("<II", self._crc & 0xffffffff, self._size & 0xffffffff))
+
+
+def write_seekable_archive(module_dir, archive_path, compress=True):
+  """Packs `module_dir` into an archive and writes its sidecar index.
+
+  Args:
+    module_dir: Directory with the module files (may be any filesystem
+      supported by TensorFlow).
+    archive_path: Where to write the archive. The index is written to
+      index_filename(archive_path).
+    compress: Whether to write a .tar.gz or a plain .tar archive.
+
+  Returns:
+    The ArchiveIndex that was written.
+  """
+  members = []
+  with filesystem.open_file(archive_path, "wb") as dst:
+    writer = _ArchiveWriter(dst, compress)
+    for dirname, subdirs, files in filesystem.walk(module_dir):
+      subdirs.sort()
+      rel_dir = os.path.relpath(dirname, module_dir)
+      for name in [None] + sorted(files):
+        rel_path = _normalize_name(
+            os.path.join(rel_dir, name) if name else rel_dir)
+        if not rel_path:
+          continue
+        tarinfo = tarfile.TarInfo(rel_path)
+        if name is None:
+          tarinfo.type = tarfile.DIRTYPE
+          tarinfo.mode = 0o755
+        else:
+          path = os.path.join(dirname, name)
+          tarinfo.size = filesystem.stat(path).length
+          tarinfo.mode = 0o644
+        header = tarinfo.tobuf(tarfile.GNU_FORMAT, "utf-8", "surrogateescape")
+        offset = writer.offset
+        writer.write(header)
+        if name is not None:
+          with filesystem.open_file(path, "rb") as src:
+            while True:
+              buf = src.read(_BUFFER_SIZE)
+              if not buf:
+                break
+              writer.write(buf)
+          padding = -tarinfo.size % _TAR_BLOCK_SIZE
+          if padding:
+            writer.write(b"\0" * padding)
+        writer.end_entry()
+        members.append(
+            ArchiveMember(rel_path, name is None, tarinfo.size, offset,
+                          writer.offset - offset, len(header)))
+    # End-of-archive marker.
+    writer.write(b"\0" * (2 * _TAR_BLOCK_SIZE))
+    writer.close()
+  index = ArchiveIndex(COMPRESSION_DEFLATE if compress else COMPRESSION_NONE,
+                       members)
+  filesystem.atomic_write_string_to_file(
+      index_filename(archive_path), index.to_json(), overwrite=True)
+  return index
+
+
+def build_tar_index(archive_path):
+  """Returns an ArchiveIndex for an existing uncompressed .tar archive."""
+  members = []
+  with filesystem.open_file(archive_path, "rb") as f:
+    with tarfile.open(mode="r:", fileobj=f) as tar:
+      for tarinfo in tar:
+        if not (tarinfo.isfile() or tarinfo.isdir()):
+          raise ValueError("Unexpected object type in tar archive: %s" %
+                           tarinfo.type)
+        name = _normalize_name(tarinfo.name)
+        if not name:
+          continue
+        members.append(
+            ArchiveMember(name, tarinfo.isdir(), tarinfo.size,
+                          tarinfo.offset_data, tarinfo.size, 0))
+  return ArchiveIndex(COMPRESSION_NONE, members)
+
+
+class GFileRangeReader(object):
+  """Reads byte ranges of a file through tf.io.gfile (or os) and seek()."""
+
+  def __init__(self, path):
+    self._path = path
+
+  def read_index(self):
+    """Returns the ArchiveIndex of the archive, or None if there is none."""
+    filename = index_filename(self._path)
+    if not filesystem.exists(filename):
+      return None
+    with filesystem.open_file(filename, "r") as f:
+      return ArchiveIndex.from_json(f.read())
+
+  def iter_range(self, offset, length, buffer_size=_BUFFER_SIZE):
+    """Yields the bytes in [offset, offset + length) in chunks."""
+    with filesystem.open_file(self._path, "rb") as f:
+      f.seek(offset)
+      while length > 0:
+        buf = f.read(min(buffer_size, length))
+        if not buf:
+          raise IOError("Unexpected end of file in %s." % self._path)
+        length -= len(buf)
+        yield buf
+
+
+class HttpRangeReader(object):
+  """Reads byte ranges of a URL with HTTP Range requests.
+
+  Servers that ignore the Range header are supported too, by skipping over
+  the leading bytes of the full response.
+  """
+
+  def __init__(self, url, urlopen_fn=None):
+    """Creates a reader.
+
+    Args:
+      url: URL of the archive. Redirects are followed; the sidecar index is
+        looked up next to the final location.
+      urlopen_fn: Optional function that takes a urllib.request.Request and
+        returns a response, e.g. a resolver's `_call_urlopen`.
+    """
+    self._url = url
+    self._urlopen = urlopen_fn or urllib.request.urlopen
+
+  def _open(self, url, offset=None, length=None):
+    request = urllib.request.Request(url)
+    if offset is not None:
+      request.add_header("Range", "bytes=%d-%d" % (offset, offset + length - 1))
+    return self._urlopen(request)
+
+  def _archive_url(self):
+    """Returns the URL of the archive after following redirects."""
+    if not hasattr(self, "_final_url"):
+      response = self._open(self._url, 0, 1)
+      self._final_url = response.geturl()
+      response.close()
+    return self._final_url
+
+  def read_index(self):
+    """Returns the ArchiveIndex of the archive, or None if there is none."""
+    parsed = list(urllib.parse.urlparse(self._archive_url()))
+    parsed[2] += INDEX_SUFFIX
+    try:
+      response = self._open(urllib.parse.urlunparse(parsed))
+    except urllib.error.HTTPError as error:
+      # Google Cloud Storage answers 403 for missing public objects.
+      if error.code in (403, 404):
+        return None
+      raise
+    try:
+      return ArchiveIndex.from_json(response.read().decode("utf-8"))
+    finally:
+      response.close()
+
+  def iter_range(self, offset, length, buffer_size=_BUFFER_SIZE):
+    """Yields the bytes in [offset, offset + length) in chunks."""
+    response = self._open(self._archive_url(), offset, length)
+    # Also closes the response if the consumer stops early.
+    try:
+      if response.getcode() != 206:
+        # The server sent the whole file; skip to the requested range.
+        to_skip = offset
+        while to_skip > 0:
+          skipped = len(response.read(min(buffer_size, to_skip)))
+          if not skipped:
+            raise IOError("Unexpected end of response from %s." % self._url)
+          to_skip -= skipped
+      while length > 0:
+        buf = response.read(min(buffer_size, length))
+        if not buf:
+          raise IOError("Unexpected end of response from %s." % self._url)
+        length -= len(buf)
+        yield buf
+    finally:
+      response.close()
+
+
+def iter_member(reader, index, name, buffer_size=_BUFFER_SIZE):
+  """Yields the contents of archive entry `name` in chunks.
+
+  Args:
+    reader: A GFileRangeReader, HttpRangeReader or any object with a
+      compatible `iter_range(offset, length)` method.
+    index: ArchiveIndex of the archive.
+    name: Relative path of the file inside the archive.
+    buffer_size: Approximate size of the chunks read from `reader`.
+
+  Raises:
+    KeyError: if `name` is not in the archive.
+    ValueError: if `name` is a directory.
+  """
+  member = index.member(name)
+  if member.is_dir:
+    raise ValueError("%s is a directory." % name)
+  decompressor = None
+  if index.compression == COMPRESSION_DEFLATE:
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+  to_skip = member.data_offset
+  remaining = member.size
+  for buf in reader.iter_range(member.offset, member.length, buffer_size):
+    if decompressor is not None:
+      buf = decompressor.decompress(buf)
+    if to_skip:
+      skipped = min(to_skip, len(buf))
+      buf = buf[skipped:]
+      to_skip -= skipped
+    if remaining < len(buf):
+      buf = buf[:remaining]
+    remaining -= len(buf)
+    if buf:
+      yield buf
+    if not remaining:
+      return
+  if remaining:
+    raise IOError("Archive entry %s is truncated." % name)
+
+
+def read_member(reader, index, name):
+  """Returns the contents of archive entry `name` as bytes."""
+  return b"".join(iter_member(reader, index, name))
+
+
+def extract_members(reader, index, dst_path, names=None, log_function=None):
+  """Extracts (some of) the entries of an indexed archive into `dst_path`.
+
+  Args:
+    reader: See iter_member().
+    index: ArchiveIndex of the archive.
+    dst_path: Directory to extract into (may be any filesystem supported by
+      TensorFlow).
+    names: Optional iterable of entry names to extract. Directories in it
+      are extracted with all their contents. Defaults to all entries.
+    log_function: Optional function called with the number of bytes written
+      after each chunk.
+  """
+  if names is None:
+    selected = index.names()
+  else:
+    prefixes = [_normalize_name(name) for name in names]
+    selected = [
+        name for name in index.names()
+        if any(name == p or name.startswith(p + "/") for p in prefixes)
+    ]
+  filesystem.makedirs(dst_path)
+  for name in selected:
+    target = file_utils.merge_relative_path(dst_path, name)
+    if index.member(name).is_dir:
+      filesystem.makedirs(target)
+      continue
+    filesystem.makedirs(os.path.dirname(target))
+    with filesystem.open_file(target, "wb") as dst:
+      for buf in iter_member(reader, index, name):
+        dst.write(buf)
+        if log_function is not None:
+          log_function(len(buf))
@@ -0,0 +1,215 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.archive_index."""
+
+import os
+import io
+import tarfile
+import urllib.error
+
+import tensorflow as tf
+from tensorflow_hub import archive_index
+from tensorflow_hub import file_utils
+from tensorflow_hub import test_utils
+
+
+def _write_module_dir(module_dir):
+  tf.io.gfile.makedirs(os.path.join(module_dir, "variables"))
+  files = {
+      "saved_model.pb": b"graph" * 1000,
+      "variables/variables.index": b"index",
+      "variables/variables.data-00000-of-00001": os.urandom(3 << 20),
+  }
+  for name, content in files.items():
+    with tf.io.gfile.GFile(os.path.join(module_dir, name), "wb") as f:
+      f.write(content)
+  return files
+
+
+class CountingReader(object):
+  """Wraps a reader and records the byte ranges requested from it."""
+
+  def __init__(self, reader):
+    self._reader = reader
+    self.ranges = []
+
+  def iter_range(self, offset, length, buffer_size=1 << 20):
+    self.ranges.append((offset, length))
+    return self._reader.iter_range(offset, length, buffer_size)
+
+
+class ArchiveIndexTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.module_dir = os.path.join(self.get_temp_dir(), "module")
+    self.files = _write_module_dir(self.module_dir)
+
+  def testSeekableArchiveIsValidTarGz(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    archive_index.write_seekable_archive(self.module_dir, archive)
+
+    with tarfile.open(archive, "r:gz") as tar:
+      names = tar.getnames()
+      content = tar.extractfile("saved_model.pb").read()
+    self.assertCountEqual(names, ["variables"] + list(self.files))
+    self.assertEqual(content, self.files["saved_model.pb"])
+
+  def testSeekableArchiveCanBeStreamed(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    archive_index.write_seekable_archive(self.module_dir, archive)
+    dst = os.path.join(self.get_temp_dir(), "extracted")
+    tf.io.gfile.makedirs(dst)
+
+    with tf.io.gfile.GFile(archive, "rb") as f:
+      file_utils.extract_tarfile_to_destination(f, dst)
+    for name, content in self.files.items():
+      with tf.io.gfile.GFile(os.path.join(dst, name), "rb") as f:
+        self.assertEqual(f.read(), content)
+
+  def testIndexRoundTrip(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    index = archive_index.write_seekable_archive(self.module_dir, archive)
+
+    reader = archive_index.GFileRangeReader(archive)
+    read_index = reader.read_index()
+    self.assertEqual(read_index.to_json(), index.to_json())
+    self.assertIn("variables/variables.index", read_index)
+    self.assertIn("/saved_model.pb", read_index)
+    self.assertNotIn("assets", read_index)
+
+  def testReadIndexWithoutSidecar(self):
+    archive = os.path.join(self.get_temp_dir(), "plain.tar.gz")
+    with tarfile.open(archive, "w:gz") as tar:
+      tar.add(self.module_dir, arcname="/")
+    self.assertIsNone(archive_index.GFileRangeReader(archive).read_index())
+
+  def testReadMemberOnlyReadsItsRange(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    index = archive_index.write_seekable_archive(self.module_dir, archive)
+
+    reader = CountingReader(archive_index.GFileRangeReader(archive))
+    content = archive_index.read_member(reader, index, "saved_model.pb")
+    self.assertEqual(content, self.files["saved_model.pb"])
+    member = index.member("saved_model.pb")
+    self.assertEqual(reader.ranges, [(member.offset, member.length)])
+    self.assertLess(member.length, os.path.getsize(archive) // 10)
+
+  def testReadMemberFromUncompressedArchive(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar")
+    index = archive_index.write_seekable_archive(
+        self.module_dir, archive, compress=False)
+    reader = archive_index.GFileRangeReader(archive)
+
+    for name, content in self.files.items():
+      self.assertEqual(archive_index.read_member(reader, index, name), content)
+    with tarfile.open(archive, "r:") as tar:
+      self.assertEqual(
+          tar.extractfile("variables/variables.index").read(), b"index")
+
+  def testBuildTarIndex(self):
+    archive = os.path.join(self.get_temp_dir(), "regular.tar")
+    with tarfile.open(archive, "w") as tar:
+      tar.add(self.module_dir, arcname="/")
+    index = archive_index.build_tar_index(archive)
+    reader = archive_index.GFileRangeReader(archive)
+
+    for name, content in self.files.items():
+      self.assertEqual(archive_index.read_member(reader, index, name), content)
+
+  def testReadMissingOrDirectoryMemberFails(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    index = archive_index.write_seekable_archive(self.module_dir, archive)
+    reader = archive_index.GFileRangeReader(archive)
+
+    with self.assertRaisesRegex(KeyError, "not part of the archive"):
+      archive_index.read_member(reader, index, "tfhub_module.pb")
+    with self.assertRaisesRegex(ValueError, "is a directory"):
+      archive_index.read_member(reader, index, "variables")
+
+  def testExtractSelectedMembers(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    index = archive_index.write_seekable_archive(self.module_dir, archive)
+    dst = os.path.join(self.get_temp_dir(), "extracted")
+
+    archive_index.extract_members(
+        archive_index.GFileRangeReader(archive), index, dst,
+        names=["saved_model.pb", "variables/variables.index"])
+    self.assertCountEqual(tf.io.gfile.listdir(dst),
+                          ["saved_model.pb", "variables"])
+    self.assertEqual(tf.io.gfile.listdir(os.path.join(dst, "variables")),
+                     ["variables.index"])
+
+  def testHttpRangeReaderWithoutRangeSupport(self):
+    archive = os.path.join(self.get_temp_dir(), "module.tar.gz")
+    index = archive_index.write_seekable_archive(self.module_dir, archive)
+    # The HTTP server serves the current directory.
+    self.addCleanup(os.chdir, os.getcwd())
+    os.chdir(self.get_temp_dir())
+    port = test_utils.start_http_server()
+
+    reader = archive_index.HttpRangeReader(
+        "http://localhost:%d/module.tar.gz" % port)
+    self.assertEqual(reader.read_index().to_json(), index.to_json())
+    self.assertEqual(
+        archive_index.read_member(reader, index, "variables/variables.index"),
+        b"index")
+    missing = archive_index.HttpRangeReader(
+        "http://localhost:%d/missing.tar.gz" % port)
+    with self.assertRaises(urllib.error.HTTPError):
+      missing.read_index()
+
+  def testHttpRangeReaderForbiddenIndexMeansNoIndex(self):
+
+    class Response(io.BytesIO):
+
+      def geturl(self):
+        return "https://storage.googleapis.com/bucket/module.tar.gz"
+
+    def urlopen(request):
+      if request.full_url.endswith(archive_index.INDEX_SUFFIX):
+        raise urllib.error.HTTPError(request.full_url, 403, "Forbidden", {},
+                                     None)
+      return Response(b"x")
+
+    reader = archive_index.HttpRangeReader(
+        "https://storage.googleapis.com/bucket/module.tar.gz", urlopen)
+    self.assertIsNone(reader.read_index())
+
+  def testHttpRangeReaderClosesResponseWhenStoppedEarly(self):
+
+    class Response(io.BytesIO):
+
+      def geturl(self):
+        return "http://localhost/module.tar.gz"
+
+      def getcode(self):
+        return 206
+
+    responses = []
+    def urlopen(unused_request):
+      responses.append(Response(b"x" * 100))
+      return responses[-1]
+
+    reader = archive_index.HttpRangeReader("http://localhost/module.tar.gz",
+                                           urlopen)
+    chunks = reader.iter_range(0, 100, buffer_size=10)
+    self.assertEqual(next(chunks), b"x" * 10)
+    chunks.close()
+    self.assertTrue(all(response.closed for response in responses))
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -0,0 +1,124 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Loads models on a background thread pool."""
+
+from concurrent import futures
+
+from tensorflow_hub import module_v2
+
+_MAX_CONCURRENT_LOADS = 2
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class AsyncLoads(object):
+  """The pending results of hub.load_async().
+
+  Each handle maps to a concurrent.futures.Future of the loaded object, which
+  can also be passed as the handle of a hub.KerasLayer.
+  """
+
+  def __init__(self, futures_by_handle):
+    self._futures = futures_by_handle
+
+  def __getitem__(self, handle):
+    return self._futures[handle]
+
+  def __iter__(self):
+    return iter(self._futures)
+
+  def __len__(self):
+    return len(self._futures)
+
+  def result(self, handle, timeout=None):
+    """Waits for the model `handle` and returns it, or raises its error."""
+    return self._futures[handle].result(timeout)
+
+  def status(self):
+    """Returns a dict from handles to LOADING, READY or FAILED."""
+    statuses = {}
+    for handle, future in self._futures.items():
+      if not future.done():
+        statuses[handle] = LOADING
+      elif future.exception() is not None:
+        statuses[handle] = FAILED
+      else:
+        statuses[handle] = READY
+    return statuses
+
+  def ready(self):
+    """Returns whether all models are loaded successfully, without waiting."""
+    return all(status == READY for status in self.status().values())
+
+  def wait(self, timeout=None):
+    """Waits until all loads have finished, and returns whether they have.
+
+    Args:
+      timeout: Optional number of seconds to wait at most.
+
+    Returns:
+      True if all loads have finished (successfully or not), False if the
+      timeout expired before.
+    """
+    _, not_done = futures.wait(list(self._futures.values()), timeout)
+    return not not_done
+
+
+def load_async(handles, max_concurrent_loads=_MAX_CONCURRENT_LOADS,
+               **kwargs):
+  """Starts loading models in the background and returns right away.
+
+  Loading a model needs about as much memory as its variables, on top of what
+  the loaded model keeps. Limiting the number of concurrent loads bounds that
+  peak.
+
+  Example for a server that reports readiness only once its models are there:
+
+  ```python
+  loads = hub.load_async([handle1, handle2])
+  model = build_keras_model(hub.KerasLayer(loads[handle1]), ...)
+  ...
+  def health_check():
+    return loads.ready()
+  ```
+
+  Args:
+    handles: An iterable of handles; see hub.load(). Each distinct handle is
+      loaded once.
+    max_concurrent_loads: The maximum number of models loaded at the same
+      time.
+    **kwargs: Further arguments for hub.load(), applied to all handles.
+
+  Returns:
+    An AsyncLoads object with a future of the loaded object for each handle.
+  """
+  if isinstance(handles, str):
+    raise ValueError("Expected an iterable of handles, got the string %r. "
+                     "Use load_async([handle]) to load a single handle."
+                     % handles)
+  executor = futures.ThreadPoolExecutor(max_workers=max_concurrent_loads,
+                                        thread_name_prefix="tfhub_load")
+  futures_by_handle = {}
+  for handle in handles:
+    if handle not in futures_by_handle:
+      future = executor.submit(module_v2.load, handle, **kwargs)
+      # Lets hub.KerasLayer(future) record the handle in its config.
+      future.handle = handle
+      futures_by_handle[handle] = future
+  # The submitted loads still run; the threads exit when they are done.
+  executor.shutdown(wait=False)
+  return AsyncLoads(futures_by_handle)
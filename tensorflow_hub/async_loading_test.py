@@ -0,0 +1,97 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.async_loading."""
+
+import os
+import threading
+import time
+from unittest import mock
+
+import tensorflow as tf
+from tensorflow_hub import async_loading
+from tensorflow_hub import module_v2
+
+
+def _save_plus_model(path, value):
+  obj = tf.Module()
+  obj.b = tf.Variable(value)
+
+  @tf.function(input_signature=[tf.TensorSpec([], tf.float32)])
+  def call(x):
+    return x + obj.b
+
+  obj.__call__ = call
+  tf.saved_model.save(obj, path)
+
+
+class AsyncLoadingTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.handles = []
+    for i in range(3):
+      path = os.path.join(self.get_temp_dir(), "model%d" % i)
+      _save_plus_model(path, float(i))
+      self.handles.append(path)
+
+  def testLoadsAllHandles(self):
+    loads = async_loading.load_async(self.handles + self.handles[:1])
+    self.assertTrue(loads.wait(timeout=60))
+    self.assertTrue(loads.ready())
+    self.assertLen(loads, 3)
+    for i, handle in enumerate(self.handles):
+      self.assertEqual(loads.result(handle)(tf.constant(1.0)), 1.0 + i)
+    self.assertEqual(set(loads.status().values()), {async_loading.READY})
+
+  def testReportsFailures(self):
+    missing = os.path.join(self.get_temp_dir(), "missing")
+    loads = async_loading.load_async([self.handles[0], missing])
+    loads.wait()
+    self.assertFalse(loads.ready())
+    self.assertEqual(loads.status(), {self.handles[0]: async_loading.READY,
+                                      missing: async_loading.FAILED})
+    with self.assertRaises(Exception):
+      loads.result(missing)
+
+  def testBoundsConcurrency(self):
+    lock = threading.Lock()
+    running = [0]
+    max_running = [0]
+
+    def load(handle, **kwargs):
+      with lock:
+        running[0] += 1
+        max_running[0] = max(max_running[0], running[0])
+      time.sleep(0.1)
+      with lock:
+        running[0] -= 1
+      return handle, kwargs
+
+    with mock.patch.object(module_v2, "load", side_effect=load):
+      loads = async_loading.load_async(
+          ["a", "b", "c", "d", "e"], max_concurrent_loads=2, tags=["serve"])
+      self.assertFalse(loads.ready())
+      self.assertIn(async_loading.LOADING, loads.status().values())
+      loads.wait()
+    self.assertEqual(max_running[0], 2)
+    self.assertEqual(loads.result("e"), ("e", {"tags": ["serve"]}))
+
+  def testFailsForSingleString(self):
+    with self.assertRaisesRegex(ValueError, "iterable"):
+      async_loading.load_async(self.handles[0])
+
+
+if __name__ == "__main__":
+  tf.test.main()
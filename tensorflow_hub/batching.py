@@ -0,0 +1,262 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Merges concurrent calls of a model into batches."""
+
+import collections
+from concurrent import futures
+import threading
+import time
+import weakref
+
+import numpy as np
+import tensorflow as tf
+
+_MAX_BATCH_SIZE = 32
+_MAX_WAIT_MS = 5.
+
+_Request = collections.namedtuple(
+    "_Request", ["structure", "flat_args", "batch_positions", "flat_inputs",
+                 "batch_size", "key", "future"])
+
+
+def _is_batched(x):
+  """Returns whether an argument is a tensor with a batch dimension."""
+  if not (tf.is_tensor(x) or isinstance(x, np.ndarray)):
+    return False
+  return x.shape.rank != 0 if tf.is_tensor(x) else x.ndim != 0
+
+
+def _static_value(x):
+  """Returns a value to compare a non-batched argument of calls by."""
+  return x.numpy() if tf.is_tensor(x) else x
+
+
+def _batch_key(structure, flat_args, batch_positions, flat_inputs):
+  """Returns what calls must have in common to be merged into one batch.
+
+  These are the structure of the arguments, the dtypes and non-leading
+  dimensions of the batched inputs, and the values of all other arguments.
+  """
+  static_args = tuple(
+      (i, _static_value(x)) for i, x in enumerate(flat_args)
+      if i not in batch_positions)
+  return (tf.nest.map_structure(lambda _: None, structure), static_args,
+          tuple((x.dtype, tuple(x.shape[1:])) for x in flat_inputs))
+
+
+class _Batcher(object):
+  """The queue of pending calls, run by the batching thread.
+
+  It is separate from the BatchedCallable, so that the thread does not keep
+  the BatchedCallable alive.
+  """
+
+  def __init__(self, fn, max_batch_size, max_wait_ms, output_key):
+    self._fn = fn
+    self._max_batch_size = max_batch_size
+    self._max_wait_sec = max_wait_ms / 1000.
+    self._output_key = output_key
+    self._requests = collections.deque()
+    self._condition = threading.Condition()
+    self._closed = False
+
+  def add(self, request):
+    with self._condition:
+      if self._closed:
+        raise ValueError("Calling a closed hub.batched() callable.")
+      self._requests.append(request)
+      self._condition.notify()
+
+  def close(self):
+    with self._condition:
+      self._closed = True
+      self._condition.notify()
+
+  def _next_batch(self):
+    """Waits for and returns the requests of the next batch, or None."""
+    with self._condition:
+      while not self._requests:
+        if self._closed:
+          return None
+        self._condition.wait()
+      deadline = time.monotonic() + self._max_wait_sec
+      while not self._closed:
+        pending = sum(r.batch_size for r in self._requests
+                      if r.key == self._requests[0].key)
+        remaining = deadline - time.monotonic()
+        if pending >= self._max_batch_size or remaining <= 0:
+          break
+        self._condition.wait(remaining)
+      # Takes the oldest request and the compatible requests after it that
+      # fit into the batch. A request bigger than max_batch_size runs alone.
+      first = self._requests.popleft()
+      batch = [first]
+      size = first.batch_size
+      kept = collections.deque()
+      while self._requests:
+        request = self._requests.popleft()
+        if (request.key == first.key and
+            size + request.batch_size <= self._max_batch_size):
+          batch.append(request)
+          size += request.batch_size
+        else:
+          kept.append(request)
+      self._requests = kept
+      return batch
+
+  def run(self):
+    while True:
+      batch = self._next_batch()
+      if batch is None:
+        return
+      try:
+        results = self._call_batch(batch)
+      except Exception as e:  # pylint: disable=broad-except
+        for request in batch:
+          request.future.set_exception(e)
+      else:
+        for request, result in zip(batch, results):
+          request.future.set_result(result)
+
+  def _call_batch(self, batch):
+    """Calls the wrapped callable on a batch and returns each call's part."""
+    first = batch[0]
+    if len(batch) == 1:
+      flat_inputs = first.flat_inputs
+    else:
+      flat_inputs = [tf.concat(inputs, axis=0)
+                     for inputs in zip(*[r.flat_inputs for r in batch])]
+    flat_args = list(first.flat_args)
+    for position, x in zip(first.batch_positions, flat_inputs):
+      flat_args[position] = x
+    args, kwargs = tf.nest.pack_sequence_as(first.structure, flat_args)
+    result = self._fn(*args, **kwargs)
+    if self._output_key is not None:
+      # Like hub.KerasLayer(..., output_key=...) for signatures.
+      if not isinstance(result, dict):
+        raise ValueError("Specifying `output_key` is forbidden if output "
+                         "type %s is not a dict." % type(result))
+      if self._output_key not in result:
+        raise ValueError(
+            "Batched output does not contain the output key %s "
+            "(available: %s)." % (self._output_key, result.keys()))
+      result = result[self._output_key]
+    if len(batch) == 1:
+      return [result]
+    sizes = [r.batch_size for r in batch]
+    flat_parts = [tf.split(output, sizes, axis=0)
+                  for output in tf.nest.flatten(result)]
+    return [tf.nest.pack_sequence_as(result, [parts[i] for parts in flat_parts])
+            for i in range(len(batch))]
+
+
+class BatchedCallable(object):
+  """Merges concurrent calls of a callable into batches, see batched()."""
+
+  def __init__(self, fn, max_batch_size=_MAX_BATCH_SIZE,
+               max_wait_ms=_MAX_WAIT_MS, output_key=None):
+    self._batcher = _Batcher(fn, max_batch_size, max_wait_ms, output_key)
+    self._thread = threading.Thread(target=self._batcher.run,
+                                    name="tfhub_batching", daemon=True)
+    self._thread.start()
+    # Stops the thread once this object is garbage collected.
+    self._finalizer = weakref.finalize(self, self._batcher.close)
+
+  def __call__(self, *args, **kwargs):
+    """Calls the wrapped callable as part of a batch and returns its part.
+
+    Args:
+      *args: Positional arguments for the wrapped callable. Each tensor with
+        a rank of at least 1 (also in nests) is batched, and all of them must
+        have the same leading batch dimension. Other arguments, like
+        `training=False` or scalars, are passed as they are; only calls with
+        equal values of them are merged.
+      **kwargs: Keyword arguments for the wrapped callable, like the inputs of
+        a signature, treated like `args`.
+
+    Returns:
+      The rows of the result for the inputs of this call, with the output
+      selected by `output_key`, if set.
+    """
+    if not tf.executing_eagerly():
+      raise ValueError("hub.batched() callables require eager mode.")
+    structure = (args, kwargs)
+    flat_args = tf.nest.flatten(structure)
+    batch_positions = tuple(
+        i for i, x in enumerate(flat_args) if _is_batched(x))
+    if not batch_positions:
+      raise ValueError("hub.batched() callables require inputs with a "
+                       "leading batch dimension.")
+    flat_inputs = [tf.convert_to_tensor(flat_args[i]) for i in batch_positions]
+    batch_size = flat_inputs[0].shape[0]
+    if any(x.shape[0] != batch_size for x in flat_inputs):
+      raise ValueError("All inputs must have the same batch size.")
+    future = futures.Future()
+    self._batcher.add(_Request(
+        structure, flat_args, batch_positions, flat_inputs, batch_size,
+        _batch_key(structure, flat_args, batch_positions, flat_inputs),
+        future))
+    return future.result()
+
+  def close(self):
+    """Stops the batching thread once the pending calls are done."""
+    self._finalizer()
+    self._thread.join()
+
+
+def batched(fn, max_batch_size=_MAX_BATCH_SIZE, max_wait_ms=_MAX_WAIT_MS,
+            output_key=None):
+  """Wraps a callable to merge concurrent calls into batches.
+
+  Serving code that calls a model from many threads, each with a small
+  batch, uses only a fraction of the model's throughput. The returned
+  callable queues the calls and runs them as one batch, concatenated along
+  the leading dimension of all inputs, as soon as `max_batch_size` rows are
+  waiting or the oldest call has waited for `max_wait_ms`. Each caller then
+  gets its rows of the result. Only calls with the same structure, dtypes
+  and non-leading dimensions of their inputs, and the same values of their
+  other arguments (like `training=False`), are merged.
+
+  Example:
+
+  ```python
+  layer = hub.KerasLayer(handle)
+  model = hub.batched(layer, max_batch_size=64)
+  def handle_request(text):  # Runs on many threads.
+    return model(tf.constant([text]))[0]
+
+  # Signatures take their inputs as keyword arguments:
+  obj = hub.load(handle)
+  embed = hub.batched(obj.signatures["default"], output_key="default")
+  embed(text=tf.constant(["hello"]))
+  ```
+
+  Args:
+    fn: The callable to wrap, like a hub.KerasLayer, the object returned by
+      hub.load() or one of its signatures. Its inputs and outputs must have a
+      leading batch dimension.
+    max_batch_size: The number of rows at which a batch runs without waiting
+      further. Calls with more rows run alone.
+    max_wait_ms: The maximum time in milliseconds that a call waits for
+      others to join its batch.
+    output_key: Optional name of the output to return if `fn` returns a dict,
+      like for signatures.
+
+  Returns:
+    A BatchedCallable that can be called like `fn` from many threads, and
+    whose `close()` method stops its batching thread.
+  """
+  return BatchedCallable(fn, max_batch_size=max_batch_size,
+                         max_wait_ms=max_wait_ms, output_key=output_key)
@@ -0,0 +1,128 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.batching."""
+
+from concurrent import futures
+import gc
+
+import tensorflow as tf
+from tensorflow_hub import batching
+
+
+class BatchingTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.batch_sizes = []
+
+  def _times_two(self, x):
+    self.batch_sizes.append(int(tf.nest.flatten(x)[0].shape[0]))
+    return x * 2
+
+  def _call_concurrently(self, fn, inputs, **kwargs):
+    with futures.ThreadPoolExecutor(len(inputs)) as executor:
+      return list(executor.map(lambda x: fn(x, **kwargs), inputs))
+
+  def testMergesConcurrentCalls(self):
+    fn = batching.batched(self._times_two, max_batch_size=8,
+                          max_wait_ms=10000)
+    self.addCleanup(fn.close)
+    results = self._call_concurrently(
+        fn, [tf.constant([[float(i)]]) for i in range(8)])
+    self.assertEqual(self.batch_sizes, [8])
+    for i, result in enumerate(results):
+      self.assertAllEqual(result, [[2. * i]])
+
+  def testRunsAfterMaxWait(self):
+    fn = batching.batched(self._times_two, max_batch_size=8, max_wait_ms=1)
+    self.addCleanup(fn.close)
+    self.assertAllEqual(fn(tf.constant([1., 2.])), [2., 4.])
+    self.assertEqual(self.batch_sizes, [2])
+
+  def testSplitsIncompatibleAndOversizedCalls(self):
+    fn = batching.batched(self._times_two, max_batch_size=4,
+                          max_wait_ms=100)
+    self.addCleanup(fn.close)
+    results = self._call_concurrently(
+        fn, [tf.ones([1, 2]), tf.ones([1, 3]), tf.ones([6, 2])])
+    self.assertEqual([r.shape for r in results], [[1, 2], [1, 3], [6, 2]])
+    self.assertCountEqual(self.batch_sizes, [1, 1, 6])
+
+  def testSignatureWithOutputKey(self):
+    def signature(text, ids):
+      self.batch_sizes.append(int(ids.shape[0]))
+      return {"ids": ids + 1, "text": text}
+    fn = batching.batched(signature, max_batch_size=2, max_wait_ms=10000,
+                          output_key="ids")
+    self.addCleanup(fn.close)
+    with futures.ThreadPoolExecutor(2) as executor:
+      results = list(executor.map(
+          lambda i: fn(text=tf.constant(["a"]), ids=tf.constant([i])),
+          [10, 20]))
+    self.assertEqual(self.batch_sizes, [2])
+    self.assertCountEqual([int(r[0]) for r in results], [11, 21])
+
+  def testMissingOutputKey(self):
+    fn = batching.batched(lambda x: {"y": x}, max_wait_ms=1,
+                          output_key="z")
+    self.addCleanup(fn.close)
+    with self.assertRaisesRegex(ValueError,
+                                "output key z .*available: .*'y'"):
+      fn(tf.ones([1]))
+
+  def testPropagatesErrors(self):
+    def fail(x):
+      raise ValueError("bad input %s" % x.shape)
+    fn = batching.batched(fail, max_wait_ms=1)
+    self.addCleanup(fn.close)
+    with self.assertRaisesRegex(ValueError, "bad input"):
+      fn(tf.ones([1]))
+    with self.assertRaisesRegex(ValueError, "batch dimension"):
+      fn(tf.constant(1.))
+
+  def testPassesNonBatchedArguments(self):
+    def scale(x, factor, training=None):
+      self.batch_sizes.append((int(x.shape[0]), training))
+      return x * factor
+    fn = batching.batched(scale, max_batch_size=2, max_wait_ms=1000)
+    self.addCleanup(fn.close)
+    calls = [(1., 2., False), (2., 2., False), (3., 2., True),
+             (4., tf.constant(3.), True)]
+    with futures.ThreadPoolExecutor(len(calls)) as executor:
+      results = list(executor.map(
+          lambda c: fn(tf.constant([c[0]]), c[1], training=c[2]), calls))
+    self.assertAllEqual(results, [[2.], [4.], [6.], [12.]])
+    # Only the calls with the same factor and training argument are merged.
+    self.assertCountEqual(self.batch_sizes,
+                          [(2, False), (1, True), (1, True)])
+
+  def testThreadStopsWhenGarbageCollected(self):
+    fn = batching.batched(self._times_two, max_wait_ms=1)
+    self.assertAllEqual(fn(tf.constant([1.])), [2.])
+    thread = fn._thread
+    del fn
+    gc.collect()
+    thread.join(10)
+    self.assertFalse(thread.is_alive())
+
+  def testClose(self):
+    fn = batching.batched(self._times_two)
+    fn.close()
+    with self.assertRaisesRegex(ValueError, "closed"):
+      fn(tf.ones([1]))
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -16,9 +16,14 @@
 
 import hashlib
 import logging
-import urllib
-
-import tensorflow as tf
+import tarfile
+import urllib.parse
+import urllib.request
+
+from tensorflow_hub import archive_index
+from tensorflow_hub import file_utils
+from tensorflow_hub import filesystem
+from tensorflow_hub import load_report
 from tensorflow_hub import resolver
 
 
@@ -28,6 +33,7 @@ _GCS_GOOGLE_CN_TEMPLATE = (
     "https://gcs.tensorflow.google.cn/tfhub-modules/%s.tar.gz"
 )
 _COMPRESSED_FORMAT_QUERY = ("tf-hub-format", "compressed")
+_FILE_URL_PREFIX = "file://"
 
 
 def _module_dir(handle):
@@ -81,6 +87,19 @@ class HttpCompressedFileResolver(resolver.HttpResolverBase):
     return resolver.atomic_download(handle, download, module_dir,
                                     self._lock_file_timeout_sec())
 
+  def cached_module_dir(self, handle):
+    """Returns the cached module directory of `handle`, or None."""
+    return resolver.cached_module_dir(_module_dir(handle))
+
+  def archive_reader(self, handle):
+    """Returns an archive_index.HttpRangeReader for the archive of `handle`."""
+    if handle.startswith(_HUB_TF_GOOGLE_CN):
+      return archive_index.HttpRangeReader(
+          _GCS_GOOGLE_CN_TEMPLATE % handle[len(_HUB_TF_GOOGLE_CN):],
+          self._call_urlopen)
+    return archive_index.HttpRangeReader(
+        self._append_compressed_format_query(handle), self._call_urlopen)
+
   def _lock_file_timeout_sec(self):
     # This method is provided as a convenience to simplify testing.
     return LOCK_FILE_TIMEOUT_SEC
@@ -92,6 +111,8 @@ class HttpCompressedFileResolver(resolver.HttpResolverBase):
 class GcsCompressedFileResolver(resolver.Resolver):
   """Resolves GCS handles by downloading and decompressing them to local fs."""
 
+  dispatch_keys = ("gs",)
+
   def is_supported(self, handle):
     return handle.startswith("gs://") and _is_tarfile(handle)
 
@@ -100,7 +121,70 @@ class GcsCompressedFileResolver(resolver.Resolver):
 
     def download(handle, tmp_dir):
       return resolver.DownloadManager(handle).download_and_uncompress(
-          tf.compat.v1.gfile.GFile(handle, "rb"), tmp_dir)
+          filesystem.open_file(handle, "rb"), tmp_dir)
 
     return resolver.atomic_download(handle, download, module_dir,
                                     LOCK_FILE_TIMEOUT_SEC)
+
+  def cached_module_dir(self, handle):
+    """Returns the cached module directory of `handle`, or None."""
+    return resolver.cached_module_dir(_module_dir(handle))
+
+  def archive_reader(self, handle):
+    """Returns an archive_index.GFileRangeReader for the archive `handle`."""
+    return archive_index.GFileRangeReader(handle)
+
+
+class LocalCompressedFileResolver(resolver.Resolver):
+  """Resolves local and file:// handles of tarfiles by extracting them.
+
+  The archive is extracted into the cache directory like for the other
+  compressed resolvers, keyed by the handle and the archive's size and
+  modification time. Members of uncompressed .tar files are extracted in
+  parallel, see file_utils.extract_local_tarfile().
+  """
+
+  dispatch_keys = ("", "file")
+
+  def _archive_path(self, handle):
+    if handle.startswith(_FILE_URL_PREFIX):
+      return urllib.request.url2pathname(urllib.parse.urlparse(handle).path)
+    return handle
+
+  def _module_dir(self, handle):
+    # Local archives can be rewritten in place, so their size and mtime are
+    # part of the cache key.
+    archive_stat = filesystem.stat(self._archive_path(handle))
+    return _module_dir("%s@%d:%d" % (handle, archive_stat.length,
+                                     archive_stat.mtime_nsec))
+
+  def is_supported(self, handle):
+    path = self._archive_path(handle)
+    if not (filesystem.is_local(path) and _is_tarfile(path)):
+      return False
+    # Directories named like archives are left to the PathResolver.
+    return filesystem.exists(path) and not filesystem.isdir(path)
+
+  def __call__(self, handle):
+    module_dir = self._module_dir(handle)
+
+    def extract(handle, tmp_dir):
+      logging.info("Extracting %s", handle)
+      try:
+        file_utils.extract_local_tarfile(self._archive_path(handle), tmp_dir)
+      except tarfile.ReadError:
+        raise IOError("%s does not appear to be a valid module." % handle)
+      if load_report.is_recording():
+        # Members are written on a thread pool, so count them afterwards.
+        load_report.add_bytes(filesystem.dir_size(tmp_dir))
+
+    return resolver.atomic_download(handle, extract, module_dir,
+                                    LOCK_FILE_TIMEOUT_SEC)
+
+  def cached_module_dir(self, handle):
+    """Returns the cached module directory of `handle`, or None."""
+    return resolver.cached_module_dir(self._module_dir(handle))
+
+  def archive_reader(self, handle):
+    """Returns an archive_index.GFileRangeReader for the archive `handle`."""
+    return archive_index.GFileRangeReader(self._archive_path(handle))
@@ -14,6 +14,7 @@
 # ==============================================================================
 """Tests for tensorflow_hub.compressed_module_resolver."""
 
+import io
 import os
 import re
 import socket
@@ -26,9 +27,12 @@ import urllib.request
 import uuid
 
 from absl import flags
+from absl.testing import flagsaver
 from absl.testing import parameterized
 import tensorflow as tf
+from tensorflow_hub import archive_index
 from tensorflow_hub import compressed_module_resolver
+from tensorflow_hub import module_v2
 from tensorflow_hub import resolver
 from tensorflow_hub import test_utils
 from tensorflow_hub import tf_utils
@@ -101,6 +105,23 @@ class HttpCompressedFileResolverTest(tf.test.TestCase, parameterized.TestCase):
     files = os.listdir(path)
     self.assertListEqual(sorted(files), ["file1", "file2", "file3"])
 
+  def testArchiveReaderFromSmartLocation(self):
+    tf.compat.v1.gfile.MakeDirs("seekable_module")
+    for name in self.files:
+      tf.compat.v1.gfile.Copy(name, os.path.join("seekable_module", name))
+    archive_index.write_seekable_archive("seekable_module",
+                                         "seekable_module.tar.gz")
+    smart_server_port = test_utils.start_smart_module_server(
+        "http://localhost:%d/seekable_module.tar.gz" % self.server_port)
+    http_resolver = compressed_module_resolver.HttpCompressedFileResolver()
+
+    reader = http_resolver.archive_reader(
+        "http://localhost:%d/seekable_module" % smart_server_port)
+    index = reader.read_index()
+    self.assertCountEqual(index.names(), self.files)
+    self.assertEqual(archive_index.read_member(reader, index, "file2"),
+                     b"file2")
+
   def testModuleDescriptor(self):
     FLAGS.tfhub_cache_dir = os.path.join(self.get_temp_dir(), "cache_dir")
     http_resolver = compressed_module_resolver.HttpCompressedFileResolver()
@@ -217,6 +238,7 @@ class HttpCompressedFileResolverTest(tf.test.TestCase, parameterized.TestCase):
         tf.compat.v1.gfile.Stat(os.path.join(path, f)).mtime_nsec for f in files
     ])
 
+  @flagsaver.flagsaver
   def testCorruptedArchive(self):
     with tf.compat.v1.gfile.GFile("bad_archive.tar.gz", mode="w") as f:
       f.write("bad_archive")
@@ -260,5 +282,88 @@ class HttpCompressedFileResolverTest(tf.test.TestCase, parameterized.TestCase):
     self.assertCountEqual(os.listdir(path), ["file1", "file2", "file3"])
 
 
+class LocalCompressedFileResolverTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.archive_dir = os.path.join(self.get_temp_dir(), "archives")
+    tf.io.gfile.makedirs(self.archive_dir)
+    self.files = {"file1": b"content1", "variables/file2": b"content2"}
+    for mode, suffix in (("w", ".tar"), ("w:gz", ".tar.gz")):
+      with tarfile.open(
+          os.path.join(self.archive_dir, "module" + suffix), mode) as tar:
+        for name, content in self.files.items():
+          info = tarfile.TarInfo(name)
+          info.size = len(content)
+          tar.addfile(info, io.BytesIO(content))
+
+  def _assert_module(self, path):
+    for name, content in self.files.items():
+      with tf.io.gfile.GFile(os.path.join(path, name), "rb") as f:
+        self.assertEqual(f.read(), content)
+
+  def testIsSupported(self):
+    local_resolver = compressed_module_resolver.LocalCompressedFileResolver()
+    archive = os.path.join(self.archive_dir, "module.tar")
+    self.assertTrue(local_resolver.is_supported(archive))
+    self.assertTrue(local_resolver.is_supported("file://" + archive))
+    self.assertFalse(local_resolver.is_supported(self.archive_dir))
+    self.assertFalse(local_resolver.is_supported(
+        os.path.join(self.archive_dir, "missing.tar")))
+    self.assertFalse(local_resolver.is_supported("gs://bucket/module.tar"))
+    dir_named_like_archive = os.path.join(self.archive_dir, "dir.tar.gz")
+    tf.io.gfile.makedirs(dir_named_like_archive)
+    self.assertFalse(local_resolver.is_supported(dir_named_like_archive))
+
+  @flagsaver.flagsaver
+  def testGetModulePath(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "cache_dir")
+    FLAGS.tfhub_cache_dir = cache_dir
+    local_resolver = compressed_module_resolver.LocalCompressedFileResolver()
+    for handle in (os.path.join(self.archive_dir, "module.tar"),
+                   os.path.join(self.archive_dir, "module.tar.gz"),
+                   "file://" + os.path.join(self.archive_dir, "module.tar")):
+      path = local_resolver(handle)
+      self.assertStartsWith(path, cache_dir)
+      self._assert_module(path)
+      # Resolving again returns the cached module.
+      self.assertEqual(local_resolver(handle), path)
+
+  @flagsaver.flagsaver
+  def testRewrittenArchiveIsExtractedAgain(self):
+    FLAGS.tfhub_cache_dir = os.path.join(self.get_temp_dir(), "cache_dir")
+    local_resolver = compressed_module_resolver.LocalCompressedFileResolver()
+    handle = os.path.join(self.archive_dir, "module.tar")
+    old_path = local_resolver(handle)
+
+    self.files = {"file1": b"rewritten"}
+    with tarfile.open(handle, "w") as tar:
+      info = tarfile.TarInfo("file1")
+      info.size = len(self.files["file1"])
+      tar.addfile(info, io.BytesIO(self.files["file1"]))
+    # Makes sure the mtime changes even on filesystems with coarse timestamps.
+    mtime = os.stat(handle).st_mtime + 10
+    os.utime(handle, (mtime, mtime))
+
+    new_path = local_resolver(handle)
+    self.assertNotEqual(new_path, old_path)
+    self._assert_module(new_path)
+
+  @flagsaver.flagsaver
+  def testResolvedThroughRegistry(self):
+    FLAGS.tfhub_cache_dir = os.path.join(self.get_temp_dir(), "cache_dir")
+    handle = os.path.join(self.archive_dir, "module.tar.gz")
+    self._assert_module(module_v2.resolve(handle))
+
+  @flagsaver.flagsaver
+  def testCorruptedArchive(self):
+    FLAGS.tfhub_cache_dir = os.path.join(self.get_temp_dir(), "cache_dir")
+    handle = os.path.join(self.archive_dir, "bad_archive.tar")
+    with tf.io.gfile.GFile(handle, "w") as f:
+      f.write("bad_archive")
+    with self.assertRaisesRegex(IOError, "does not appear to be a valid"):
+      compressed_module_resolver.LocalCompressedFileResolver()(handle)
+
+
 if __name__ == "__main__":
   tf.test.main()
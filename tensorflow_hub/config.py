@@ -24,6 +24,7 @@ from tensorflow_hub import uncompressed_module_resolver
 def _install_default_resolvers():
   for impl in [
       resolver.PathResolver(),
+      compressed_module_resolver.LocalCompressedFileResolver(),
       uncompressed_module_resolver.HttpUncompressedFileResolver(),
       compressed_module_resolver.GcsCompressedFileResolver(),
       compressed_module_resolver.HttpCompressedFileResolver()
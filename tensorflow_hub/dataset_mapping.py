@@ -0,0 +1,107 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Applies a model to the elements of a tf.data.Dataset."""
+
+import tensorflow as tf
+
+from tensorflow_hub import keras_layer
+
+_BATCH_SIZE = 128
+
+
+def map_dataset(model,
+                dataset,
+                batch_size=_BATCH_SIZE,
+                signature=None,
+                output_key=None,
+                signature_outputs_as_dict=None,
+                arguments=None,
+                with_keys=False,
+                unbatch=True):
+  """Returns a dataset of the outputs of a model for the elements of another.
+
+  Mapping a model over single elements runs it once per element, and
+  hand-written pipelines often miss parallelism or prefetching. This builds
+  the pipeline for scoring many elements offline:
+
+    1. the elements are batched to `batch_size` (in parallel);
+    2. the model is called on each batch, with several batches in flight,
+       as many as tf.data's autotuning finds useful;
+    3. the outputs are split back into elements, if `unbatch`;
+    4. the results are prefetched, so that the consumer does not wait.
+
+  The order of the elements is preserved.
+
+  Example:
+
+  ```python
+  texts = tf.data.TextLineDataset(path)
+  embeddings = hub.map_dataset(handle, texts, batch_size=256)
+
+  # Keys, like IDs, are passed through next to the outputs:
+  ids_and_texts = tf.data.Dataset.from_tensor_slices((ids, texts))
+  for ids, embeddings in hub.map_dataset(handle, ids_and_texts,
+                                         with_keys=True, unbatch=False):
+    ...
+  ```
+
+  Args:
+    model: A string handle, a callable object like the result of hub.load(),
+      or a hub.KerasLayer. Handles and callables are called like by
+      hub.KerasLayer with the arguments below.
+    dataset: A tf.data.Dataset of model inputs (one tensor or a nest of
+      tensors per element), or of (key, inputs) pairs if `with_keys`.
+    batch_size: The number of elements per call of the model. None if
+      `dataset` is batched already; `unbatch` does not apply then.
+    signature: Optional. The signature to call, see hub.KerasLayer. The
+      inputs must then be a dict of the signature's inputs.
+    output_key: Optional. The output to return, see hub.KerasLayer.
+    signature_outputs_as_dict: Optional. Whether to return all outputs of
+      the signature as a dict, see hub.KerasLayer.
+    arguments: Optional. A dict with additional keyword arguments for the
+      model, see hub.KerasLayer.
+    with_keys: If True, each element of `dataset` is a pair of a key (one
+      tensor or a nest of them, such as an ID or the raw input) and the
+      model inputs, and each result is a pair of the key and the outputs.
+    unbatch: If True, the results are single elements, like the input
+      elements. If False, they are batches of up to `batch_size` elements.
+
+  Returns:
+    A tf.data.Dataset of the outputs, or (key, outputs) pairs if `with_keys`.
+  """
+  if isinstance(model, keras_layer.KerasLayer):
+    if signature or output_key or signature_outputs_as_dict or arguments:
+      raise ValueError("Pass signature, output_key, signature_outputs_as_dict "
+                       "and arguments to the hub.KerasLayer instead.")
+    layer = model
+  else:
+    layer = keras_layer.KerasLayer(
+        model, signature=signature, output_key=output_key,
+        signature_outputs_as_dict=signature_outputs_as_dict,
+        arguments=arguments)
+
+  if with_keys:
+    apply_fn = lambda key, inputs: (key, layer(inputs, training=False))
+  else:
+    apply_fn = lambda inputs: layer(inputs, training=False)
+
+  if batch_size:
+    dataset = dataset.batch(batch_size, num_parallel_calls=tf.data.AUTOTUNE,
+                            deterministic=True)
+  dataset = dataset.map(apply_fn, num_parallel_calls=tf.data.AUTOTUNE,
+                        deterministic=True)
+  if batch_size and unbatch:
+    dataset = dataset.unbatch()
+  return dataset.prefetch(tf.data.AUTOTUNE)
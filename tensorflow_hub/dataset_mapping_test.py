@@ -0,0 +1,74 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.dataset_mapping."""
+
+import os
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import dataset_mapping
+from tensorflow_hub import keras_layer
+from tensorflow_hub import module_v2
+
+
+def _save_plus_one_model(export_dir):
+  obj = tf.train.Checkpoint()
+  obj.__call__ = tf.function(
+      lambda x: x + 1., input_signature=[tf.TensorSpec([None, 2])])
+  tf.saved_model.save(obj, export_dir, signatures={
+      "serving_default": obj.__call__.get_concrete_function(),
+  })
+
+
+class MapDatasetTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_plus_one_model(self.model_dir)
+    self.inputs = np.arange(14, dtype=np.float32).reshape([7, 2])
+
+  def testMapDataset(self):
+    dataset = tf.data.Dataset.from_tensor_slices(self.inputs)
+    outputs = dataset_mapping.map_dataset(self.model_dir, dataset,
+                                          batch_size=3)
+    self.assertAllEqual(list(outputs.as_numpy_iterator()), self.inputs + 1.)
+    outputs = dataset_mapping.map_dataset(module_v2.load(self.model_dir),
+                                          dataset, batch_size=3,
+                                          unbatch=False)
+    self.assertEqual([len(batch) for batch in outputs], [3, 3, 1])
+
+  def testMapDatasetWithKeys(self):
+    keys = [b"k%d" % i for i in range(7)]
+    dataset = tf.data.Dataset.from_tensor_slices((keys, self.inputs))
+    outputs = dataset_mapping.map_dataset(
+        self.model_dir, dataset, batch_size=4, with_keys=True,
+        signature="serving_default", output_key="output_0")
+    results = list(outputs.as_numpy_iterator())
+    self.assertEqual([key for key, _ in results], keys)
+    self.assertAllEqual([output for _, output in results], self.inputs + 1.)
+
+  def testMapBatchedDatasetWithLayer(self):
+    dataset = tf.data.Dataset.from_tensor_slices(self.inputs).batch(5)
+    layer = keras_layer.KerasLayer(self.model_dir)
+    outputs = dataset_mapping.map_dataset(layer, dataset, batch_size=None)
+    self.assertAllEqual(np.concatenate(list(outputs.as_numpy_iterator())),
+                        self.inputs + 1.)
+    with self.assertRaisesRegex(ValueError, "hub.KerasLayer instead"):
+      dataset_mapping.map_dataset(layer, dataset, output_key="output_0")
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -52,7 +52,8 @@ def _compute_output_shape(layer, shape, dtype):
 def text_embedding_column_v2(key,
                              module_path,
                              output_key=None,
-                             trainable=False):
+                             trainable=False,
+                             share_loaded_object=False):
   """Uses a TF2 SavedModel to construct a dense representation from text.
 
   Args:
@@ -66,6 +67,9 @@ def text_embedding_column_v2(key,
       the pre-trained weights are frozen. This is different from the ordinary
       tf.feature_column.embedding_column(), but that one is intended for
       training from scratch.
+    share_loaded_object: Whether to share the loaded module with other users
+      of the same `module_path`, see `hub.load()`. Ignored when the module is
+      trained, so trained columns always get their own variables.
 
   Returns:
     `DenseColumn` that converts from text input.
@@ -81,13 +85,16 @@ def text_embedding_column_v2(key,
       key=key,
       module_path=module_path,
       output_key=output_key,
-      trainable=trainable)
+      trainable=trainable,
+      share_loaded_object=share_loaded_object)
 
 
 class _TextEmbeddingColumnV2(
     feature_column_v2.DenseColumn,
     collections.namedtuple("_ModuleEmbeddingColumn",
-                           ("key", "module_path", "output_key", "trainable"))):
+                           ("key", "module_path", "output_key", "trainable",
+                            "share_loaded_object"),
+                           defaults=(False,))):
   """Returned by text_embedding_column(). Do not use directly."""
 
   @property
@@ -118,7 +125,8 @@ class _TextEmbeddingColumnV2(
     # self._get_dense_tensor.
     trainable = self.trainable and state_manager._trainable  # pylint: disable=protected-access
     layer = keras_layer.KerasLayer(
-        self.module_path, output_key=self.output_key, trainable=trainable)
+        self.module_path, output_key=self.output_key, trainable=trainable,
+        share_loaded_object=self.share_loaded_object and not trainable)
     # Note: state manager attaches the loaded resource onto the layer.
     state_manager.add_resource(self, self._resource_name, layer)
     self._variable_shape = _compute_output_shape(layer, [None], tf.string)
@@ -15,10 +15,17 @@
 """Utilities for file operations."""
 
 
+from concurrent import futures
+import mmap
 import os
 import tarfile
+import threading
 
-import tensorflow as tf
+from tensorflow_hub import filesystem
+
+# Leading bytes of gzip data, used to tell .tar.gz from .tar content.
+_GZIP_MAGIC = b"\x1f\x8b"
+_MAX_EXTRACT_WORKERS = 8
 
 
 def extract_file(tgz,
@@ -30,7 +37,7 @@ def extract_file(tgz,
   src = tgz.extractfile(tarinfo)
   if src is None:
     return
-  dst = tf.compat.v1.gfile.GFile(dst_path, "wb")
+  dst = filesystem.open_file(dst_path, "wb")
   while 1:
     buf = src.read(buffer_size)
     if not buf:
@@ -49,15 +56,100 @@ def extract_tarfile_to_destination(fileobj, dst_path, log_function=None):
       abs_target_path = merge_relative_path(dst_path, tarinfo.name)
 
       if tarinfo.isfile():
+        # Archives need not have entries for all parent directories.
+        filesystem.makedirs(os.path.dirname(abs_target_path))
         extract_file(tgz, tarinfo, abs_target_path, log_function=log_function)
       elif tarinfo.isdir():
-        tf.compat.v1.gfile.MakeDirs(abs_target_path)
+        filesystem.makedirs(abs_target_path)
       else:
         # We do not support symlinks and other uncommon objects.
         raise ValueError("Unexpected object type in tar archive: %s" %
                          tarinfo.type)
 
 
+def extract_local_tarfile(path,
+                          dst_path,
+                          max_workers=None,
+                          buffer_size=10 << 20,
+                          log_function=None):
+  """Extracts a tarfile on the local filesystem into 'dst_path'.
+
+  The archive is read through mmap. Compressed archives are extracted
+  sequentially. For uncompressed archives all headers are read first and the
+  members are then written in parallel, each straight from its byte range in
+  the mapped file.
+
+  Args:
+    path: Local path of a .tar or .tar.gz file.
+    dst_path: Directory to extract into.
+    max_workers: Maximum number of threads writing members in parallel.
+      Defaults to min(8, number of CPUs).
+    buffer_size: Size of the chunks written to the destination files.
+    log_function: Optional function called with the number of bytes written
+      after each chunk. It is called from the worker threads, but never
+      concurrently.
+
+  Raises:
+    tarfile.ReadError: if 'path' is not a valid tarfile.
+    ValueError: Unknown object encountered inside the TAR file.
+  """
+  with open(path, "rb") as f:
+    if not os.fstat(f.fileno()).st_size:
+      raise tarfile.ReadError("%s is empty." % path)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+      if mapped[:len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        extract_tarfile_to_destination(mapped, dst_path, log_function)
+        return
+      with tarfile.open(mode="r:", fileobj=mapped) as tar:
+        members = tar.getmembers()
+      _extract_mapped_members(mapped, members, dst_path, max_workers,
+                              buffer_size, log_function)
+
+
+def _extract_mapped_members(mapped, members, dst_path, max_workers,
+                            buffer_size, log_function):
+  """Writes the members of an uncompressed tarfile mapped in memory."""
+  files = []
+  directories = set()
+  for tarinfo in members:
+    if not (tarinfo.isfile() or tarinfo.isdir()):
+      raise ValueError("Unexpected object type in tar archive: %s" %
+                       tarinfo.type)
+    target = merge_relative_path(dst_path, tarinfo.name)
+    if tarinfo.isdir():
+      directories.add(target)
+    else:
+      directories.add(os.path.dirname(target))
+      files.append((tarinfo, target))
+  # Create all directories up front, so the writers do not race on them.
+  for directory in sorted(directories):
+    filesystem.makedirs(directory)
+
+  log_lock = threading.Lock()
+  # tf.io.gfile only accepts bytes, local files take the mapped memory as is.
+  copy_chunks = not filesystem.is_local(dst_path)
+
+  def write_member(view, tarinfo, target):
+    with filesystem.open_file(target, "wb") as dst:
+      end = tarinfo.offset_data + tarinfo.size
+      for start in range(tarinfo.offset_data, end, buffer_size):
+        # The chunk is released right away, even on errors: the mmap cannot
+        # be closed while a view of it is alive (e.g. in a traceback).
+        with view[start:min(start + buffer_size, end)] as chunk:
+          dst.write(bytes(chunk) if copy_chunks else chunk)
+          num_bytes = len(chunk)
+        if log_function is not None:
+          with log_lock:
+            log_function(num_bytes)
+
+  if max_workers is None:
+    max_workers = min(_MAX_EXTRACT_WORKERS, os.cpu_count() or 1)
+  with memoryview(mapped) as view:
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+      for future in [executor.submit(write_member, view, *f) for f in files]:
+        future.result()
+
+
 def merge_relative_path(dst_path, rel_path):
   """Merge a relative tar file to a destination (which can be "gs://...")."""
   # Convert rel_path to be relative and normalize it to remove ".", "..", "//",
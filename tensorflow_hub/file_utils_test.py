@@ -86,6 +86,69 @@ class FileUtilsTest(tf.test.TestCase):
         gfile.Open(os.path.join(extraction_dir, dir_name, inner_file)).read(),
         inner_content)
 
+  def _make_archive(self, mode):
+    contents = {
+        "a": b"content1",
+        "empty": b"",
+        "sub_directory/b": os.urandom(100000),
+        "sub_directory/c": b"content3",
+    }
+    source_dir = tempfile.mkdtemp()
+    os.mkdir(os.path.join(source_dir, "sub_directory"))
+    for name, content in contents.items():
+      with open(os.path.join(source_dir, name), "wb") as f:
+        f.write(content)
+    archive = os.path.join(tempfile.mkdtemp(), "archive")
+    with tarfile.open(archive, mode) as tar:
+      tar.add(source_dir, arcname="/")
+    return archive, contents
+
+  def _assert_extracted(self, extraction_dir, contents):
+    for name, content in contents.items():
+      with open(os.path.join(extraction_dir, name), "rb") as f:
+        self.assertEqual(f.read(), content)
+
+  def test_local_tarfile_extraction(self):
+    for mode in ("w", "w:gz"):
+      archive, contents = self._make_archive(mode)
+      extraction_dir = tempfile.mkdtemp()
+      logged = []
+      file_utils.extract_local_tarfile(
+          archive, extraction_dir, max_workers=3, buffer_size=4096,
+          log_function=logged.append)
+      self._assert_extracted(extraction_dir, contents)
+      self.assertEqual(sum(logged), sum(len(c) for c in contents.values()))
+
+  def test_local_tarfile_extraction_reports_writer_errors(self):
+    archive, _ = self._make_archive("w")
+
+    def log_function(unused_num_bytes):
+      raise RuntimeError("Writer failed.")
+
+    # Views of the mapped file must not outlive the error, or closing the
+    # mmap raises a BufferError instead.
+    with self.assertRaisesRegex(RuntimeError, "Writer failed."):
+      file_utils.extract_local_tarfile(
+          archive, tempfile.mkdtemp(), max_workers=2, buffer_size=16,
+          log_function=log_function)
+
+  def test_local_tarfile_extraction_rejects_symlinks(self):
+    archive = os.path.join(tempfile.mkdtemp(), "archive.tar")
+    with tarfile.open(archive, "w") as tar:
+      link = tarfile.TarInfo("link")
+      link.type = tarfile.SYMTYPE
+      link.linkname = "/etc/passwd"
+      tar.addfile(link)
+    with self.assertRaisesRegex(ValueError, "Unexpected object type"):
+      file_utils.extract_local_tarfile(archive, tempfile.mkdtemp())
+
+  def test_local_tarfile_extraction_of_invalid_file(self):
+    archive = os.path.join(tempfile.mkdtemp(), "archive.tar")
+    with open(archive, "wb") as f:
+      f.write(b"not a tarfile")
+    with self.assertRaises(tarfile.ReadError):
+      file_utils.extract_local_tarfile(archive, tempfile.mkdtemp())
+
 
 if __name__ == "__main__":
   tf.test.main()
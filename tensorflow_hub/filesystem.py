@@ -0,0 +1,406 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""File operations with a native fast path for local paths.
+
+Local paths are handled with `os` directly, paths with a scheme like "gs://"
+go through tf.io.gfile. TensorFlow is only imported when it is needed, i.e.
+for non-local paths or to raise an error.
+
+Errors are reported as the tf.errors.OpError subclasses tf.io.gfile would
+raise (e.g. tf.errors.NotFoundError), so callers can handle both kinds of
+paths the same way. If TensorFlow has not been imported, errors of local
+paths are raised as the classes of the same name in this module instead,
+which are OSErrors. Callers that must not import TensorFlow catch
+error_types(...), which covers both.
+
+This module, resolver.py and the modules it uses to download and cache
+models do not import TensorFlow themselves.
+"""
+
+import builtins
+import codecs
+import contextlib
+import errno
+import os
+import shutil
+import stat as stat_lib
+import sys
+import uuid
+
+
+def _tf():
+  import tensorflow as tf  # pylint: disable=g-import-not-at-top
+  return tf
+
+
+def _tf_if_imported():
+  """Returns the tensorflow module if it has been imported, else None."""
+  tf = sys.modules.get("tensorflow")
+  return tf if hasattr(tf, "errors") else None
+
+
+def _as_str(path):
+  return os.fsdecode(path)
+
+
+def is_local(path):
+  """Returns whether `path` is on the local filesystem (has no scheme)."""
+  return "://" not in _as_str(path)
+
+
+class OpError(OSError):
+  """An error of a local file operation, raised without TensorFlow."""
+
+
+class NotFoundError(OpError, FileNotFoundError):
+  pass
+
+
+class AlreadyExistsError(OpError, FileExistsError):
+  pass
+
+
+class PermissionDeniedError(OpError, PermissionError):
+  pass
+
+
+class FailedPreconditionError(OpError):
+  pass
+
+
+class ResourceExhaustedError(OpError):
+  pass
+
+
+class UnknownError(OpError):
+  pass
+
+
+def error_types(*names):
+  """Returns the exception classes for names of tf.errors.OpError subclasses.
+
+  For use in except clauses of code that must not import TensorFlow: the
+  result has the class of each name in this module, if any, and in
+  tf.errors, if TensorFlow has been imported.
+
+  Args:
+    *names: Names like "NotFoundError" or "OpError".
+
+  Returns:
+    A tuple of exception classes.
+  """
+  tf = _tf_if_imported()
+  result = []
+  for name in names:
+    if name in globals():
+      result.append(globals()[name])
+    if tf is not None:
+      result.append(getattr(tf.errors, name))
+  return tuple(result)
+
+
+# Maps errno values to names of tf.errors.OpError subclasses.
+_ERRNO_TO_TF_ERROR = {
+    errno.ENOENT: "NotFoundError",
+    errno.EEXIST: "AlreadyExistsError",
+    errno.EACCES: "PermissionDeniedError",
+    errno.EPERM: "PermissionDeniedError",
+    errno.ENOTDIR: "FailedPreconditionError",
+    errno.EISDIR: "FailedPreconditionError",
+    errno.ENOTEMPTY: "FailedPreconditionError",
+    errno.ENOSPC: "ResourceExhaustedError",
+}
+
+
+@contextlib.contextmanager
+def _translate_os_errors(path):
+  """Re-raises OSErrors as the corresponding tf.errors.OpError."""
+  try:
+    yield
+  except OSError as e:
+    error_name = _ERRNO_TO_TF_ERROR.get(e.errno, "UnknownError")
+    message = "%s; %s" % (_as_str(path), e.strerror)
+    tf = _tf_if_imported()
+    if tf is None:
+      raise globals()[error_name](e.errno, message) from e
+    raise getattr(tf.errors, error_name)(None, None, message) from e
+
+
+class FileStat(object):
+  """The subset of tf.io.gfile.stat() results used by this library."""
+
+  def __init__(self, length, is_directory, mtime_nsec):
+    self.length = length
+    self.is_directory = is_directory
+    self.mtime_nsec = mtime_nsec
+
+
+def exists(path):
+  """Returns whether `path` exists."""
+  if is_local(path):
+    return os.path.exists(path)
+  return _tf().io.gfile.exists(path)
+
+
+def isdir(path):
+  """Returns whether `path` is a directory."""
+  if is_local(path):
+    return os.path.isdir(path)
+  return _tf().io.gfile.isdir(path)
+
+
+def listdir(path):
+  """Returns the entries of directory `path`, like tf.io.gfile.listdir()."""
+  if is_local(path):
+    with _translate_os_errors(path):
+      return os.listdir(path)
+  return _tf().io.gfile.listdir(path)
+
+
+def stat(path):
+  """Returns a FileStat for `path`."""
+  if is_local(path):
+    with _translate_os_errors(path):
+      result = os.stat(path)
+    return FileStat(result.st_size, stat_lib.S_ISDIR(result.st_mode),
+                    result.st_mtime_ns)
+  result = _tf().io.gfile.stat(path)
+  return FileStat(result.length, result.is_directory, result.mtime_nsec)
+
+
+def dir_size(path):
+  """Returns the total size in bytes of the files below directory `path`."""
+  if is_local(path):
+    size = 0
+    with _translate_os_errors(path):
+      with os.scandir(path) as entries:
+        for entry in entries:
+          if entry.is_dir(follow_symlinks=False):
+            size += dir_size(entry.path)
+          else:
+            size += entry.stat(follow_symlinks=False).st_size
+    return size
+  size = 0
+  for elem in listdir(path):
+    elem_full_path = os.path.join(path, elem)
+    elem_stat = stat(elem_full_path)
+    size += (dir_size(elem_full_path) if elem_stat.is_directory
+             else elem_stat.length)
+  return size
+
+
+def walk(top):
+  """Yields (dirname, subdirs, files) below `top`, like tf.io.gfile.walk()."""
+  if is_local(top):
+    for dirname, subdirs, files in os.walk(top):
+      yield dirname, subdirs, files
+    return
+  for item in _tf().io.gfile.walk(top):
+    yield item
+
+
+def makedirs(path):
+  """Creates `path` and its missing parents; no error if it exists."""
+  if is_local(path):
+    with _translate_os_errors(path):
+      os.makedirs(path, exist_ok=True)
+    return
+  _tf().io.gfile.makedirs(path)
+
+
+def remove(path):
+  """Deletes the file `path`."""
+  if is_local(path):
+    with _translate_os_errors(path):
+      os.remove(path)
+    return
+  _tf().io.gfile.remove(path)
+
+
+def rmtree(path):
+  """Deletes the directory `path` recursively."""
+  if is_local(path):
+    with _translate_os_errors(path):
+      shutil.rmtree(path)
+    return
+  _tf().io.gfile.rmtree(path)
+
+
+def rename(src, dst, overwrite=False):
+  """Renames `src` to `dst`.
+
+  Args:
+    src: Existing file or directory.
+    dst: New name.
+    overwrite: Whether an existing file at `dst` may be replaced. Without
+      overwrite, renaming a local file is atomic: the rename fails if `dst`
+      appears concurrently. Renaming a local directory is atomic too, except
+      that an empty directory at `dst` is replaced on POSIX systems.
+
+  Raises:
+    tf.errors.AlreadyExistsError: if `dst` exists and `overwrite` is False.
+  """
+  if not (is_local(src) and is_local(dst)):
+    _tf().io.gfile.rename(src, dst, overwrite)
+    return
+  src, dst = _as_str(src), _as_str(dst)
+  with _translate_os_errors(dst):
+    if overwrite:
+      os.replace(src, dst)
+    elif os.path.isdir(src):
+      try:
+        os.rename(src, dst)
+      except OSError as e:
+        # A non-empty directory at dst makes the rename fail atomically.
+        if e.errno in (errno.EEXIST, errno.ENOTEMPTY):
+          raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST),
+                                dst) from e
+        raise
+    else:
+      try:
+        # Hard-linking fails if dst exists, which makes this atomic.
+        os.link(src, dst)
+      except OSError as e:
+        if e.errno == errno.EEXIST:
+          raise
+        # Hard links are not supported everywhere; fall back to a check.
+        if os.path.exists(dst):
+          raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+        os.rename(src, dst)
+      else:
+        os.remove(src)
+
+
+class _LocalFile(object):
+  """A local file with the semantics of tf.io.gfile.GFile.
+
+  Like GFile, text mode accepts both str and bytes for writing and returns
+  str from reading, and errors are raised as tf.errors.
+  """
+
+  def __init__(self, path, mode):
+    self._path = path
+    self._binary_mode = "b" in mode
+    # Characters can span the chunks returned by read(n).
+    self._decoder = codecs.getincrementaldecoder("utf-8")()
+    with _translate_os_errors(path):
+      self._file = builtins.open(path, mode.replace("b", "") + "b")
+
+  def read(self, n=-1):
+    with _translate_os_errors(self._path):
+      data = self._file.read(n)
+      if self._binary_mode:
+        return data
+      text = self._decoder.decode(data, final=n is None or n < 0 or not data)
+      # Returning "" would mean end of file; complete the next character.
+      while data and not text:
+        data = self._file.read(1)
+        text = self._decoder.decode(data, final=not data)
+    return text
+
+  def write(self, data):
+    if isinstance(data, str):
+      data = data.encode("utf-8")
+    with _translate_os_errors(self._path):
+      self._file.write(data)
+
+  def __getattr__(self, name):
+    return getattr(self._file, name)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self._file.close()
+
+
+def open_file(path, mode="r"):
+  """Returns a file object for `path`, like tf.io.gfile.GFile(path, mode)."""
+  if is_local(path):
+    return _LocalFile(path, mode)
+  return _tf().io.gfile.GFile(path, mode)
+
+
+def read_file_to_string(path, binary_mode=False):
+  """Returns the contents of the file `path`."""
+  with open_file(path, "rb" if binary_mode else "r") as f:
+    return f.read()
+
+
+def atomic_write_string_to_file(filename, contents, overwrite):
+  """Writes to `filename` atomically.
+
+  This means that when `filename` appears in the filesystem, it will contain
+  all of `contents`. With write_string_to_file, it is possible for the file
+  to appear in the filesystem with `contents` only partially written.
+
+  Accomplished by writing to a temp file and then renaming it.
+
+  Args:
+    filename: string, pathname for a file
+    contents: string, contents that need to be written to the file
+    overwrite: boolean, if false it's an error for `filename` to be occupied by
+      an existing file.
+  """
+  temp_pathname = _as_str(filename) + ".tmp" + uuid.uuid4().hex
+  with open_file(temp_pathname, mode="w") as f:
+    f.write(contents)
+  try:
+    rename(temp_pathname, filename, overwrite)
+  except error_types("OpError"):
+    remove(temp_pathname)
+    raise
+
+
+def absolute_path(path):
+  """Returns absolute path.
+
+  Args:
+    path: Path to compute absolute path from.
+
+  This implementation avoids calling os.path.abspath(path) if 'path' already
+  represents an absolute Tensorflow filesystem location (e.g. <fs type>://).
+  """
+  return path if not is_local(path) else os.path.abspath(path)
+
+
+def bytes_to_readable_str(num_bytes, include_b=False):
+  """Generate a human-readable string representing number of bytes.
+
+  The units B, kB, MB and GB are used.
+
+  Args:
+    num_bytes: (`int` or None) Number of bytes.
+    include_b: (`bool`) Include the letter B at the end of the unit.
+
+  Returns:
+    (`str`) A string representing the number of bytes in a human-readable way,
+      including a unit at the end.
+  """
+
+  if num_bytes is None:
+    return str(num_bytes)
+  if num_bytes < 1024:
+    result = "%d" % num_bytes
+  elif num_bytes < 1048576:
+    result = "%.2fk" % (num_bytes / float(1 << 10))
+  elif num_bytes < 1073741824:
+    result = "%.2fM" % (num_bytes / float(1 << 20))
+  else:
+    result = "%.2fG" % (num_bytes / float(1 << 30))
+
+  if include_b:
+    result += "B"
+  return result
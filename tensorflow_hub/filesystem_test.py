@@ -0,0 +1,174 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.filesystem."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import tensorflow as tf
+from tensorflow_hub import filesystem
+
+
+class FilesystemTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.root = os.path.join(self.get_temp_dir(), "root")
+    filesystem.makedirs(os.path.join(self.root, "sub"))
+
+  def _write(self, path, contents):
+    with filesystem.open_file(path, "wb") as f:
+      f.write(contents)
+
+  def testIsLocal(self):
+    self.assertTrue(filesystem.is_local("/tmp/foo"))
+    self.assertTrue(filesystem.is_local(b"relative/foo"))
+    self.assertFalse(filesystem.is_local("gs://bucket/foo"))
+    self.assertFalse(filesystem.is_local("ram://foo"))
+
+  def testLocalOperations(self):
+    path = os.path.join(self.root, "sub", "file")
+    self._write(path, b"12345")
+    self._write(os.path.join(self.root, "other"), b"abc")
+
+    self.assertTrue(filesystem.exists(path))
+    self.assertFalse(filesystem.isdir(path))
+    self.assertTrue(filesystem.isdir(os.path.join(self.root, "sub")))
+    self.assertCountEqual(filesystem.listdir(self.root), ["sub", "other"])
+    self.assertEqual(filesystem.stat(path).length, 5)
+    self.assertEqual(filesystem.dir_size(self.root), 8)
+
+    filesystem.remove(path)
+    self.assertFalse(filesystem.exists(path))
+    filesystem.rmtree(self.root)
+    self.assertFalse(filesystem.exists(self.root))
+
+  def testTextModeMatchesGFile(self):
+    path = os.path.join(self.root, "text")
+    with filesystem.open_file(path, "w") as f:
+      f.write("abc")
+      f.write(b"def")
+    self.assertEqual(filesystem.read_file_to_string(path), "abcdef")
+    self.assertEqual(
+        filesystem.read_file_to_string(path, binary_mode=True), b"abcdef")
+    with tf.io.gfile.GFile(path, "r") as f:
+      self.assertEqual(f.read(), "abcdef")
+
+  def testTextModeDecodesCharactersAcrossReads(self):
+    path = os.path.join(self.root, "text")
+    with filesystem.open_file(path, "w") as f:
+      f.write("h\u00e9llo \u20ac")
+    chunks = []
+    with filesystem.open_file(path, "r") as f:
+      while True:
+        chunk = f.read(1)
+        if not chunk:
+          break
+        chunks.append(chunk)
+    self.assertEqual("".join(chunks), "h\u00e9llo \u20ac")
+
+  def testErrorTypes(self):
+    self.assertEqual(
+        filesystem.error_types("NotFoundError", "UnauthenticatedError"),
+        (filesystem.NotFoundError, tf.errors.NotFoundError,
+         tf.errors.UnauthenticatedError))
+
+  def testResolvingDoesNotImportTensorFlow(self):
+    # The package's __init__.py imports TensorFlow, so it is bypassed.
+    script = textwrap.dedent("""
+        import os, sys, types
+        package = types.ModuleType("tensorflow_hub")
+        package.__path__ = [%r]
+        sys.modules["tensorflow_hub"] = package
+        from tensorflow_hub import config
+        from tensorflow_hub import filesystem
+        from tensorflow_hub import resolver
+        path = os.path.join(%r, "model")
+        filesystem.makedirs(path)
+        assert resolver.PathResolver()(path) == path
+        try:
+          filesystem.listdir(path + "/missing")
+        except filesystem.error_types("NotFoundError"):
+          pass
+        assert "tensorflow" not in sys.modules, "TensorFlow was imported."
+        """) % (os.path.dirname(filesystem.__file__), self.root)
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+  def testErrorsAreTranslated(self):
+    missing = os.path.join(self.root, "missing")
+    with self.assertRaises(tf.errors.NotFoundError):
+      filesystem.listdir(missing)
+    with self.assertRaises(tf.errors.NotFoundError):
+      filesystem.stat(missing)
+    with self.assertRaises(tf.errors.NotFoundError):
+      filesystem.remove(missing)
+    with self.assertRaises(tf.errors.NotFoundError):
+      filesystem.read_file_to_string(missing)
+
+  def testRename(self):
+    src = os.path.join(self.root, "src")
+    dst = os.path.join(self.root, "dst")
+    self._write(src, b"new")
+    self._write(dst, b"old")
+
+    with self.assertRaises(tf.errors.AlreadyExistsError):
+      filesystem.rename(src, dst)
+    self.assertEqual(
+        filesystem.read_file_to_string(dst, binary_mode=True), b"old")
+    self.assertTrue(filesystem.exists(src))
+
+    filesystem.rename(src, dst, overwrite=True)
+    self.assertEqual(
+        filesystem.read_file_to_string(dst, binary_mode=True), b"new")
+    self.assertFalse(filesystem.exists(src))
+
+  def testRenameDirectory(self):
+    dst = os.path.join(self.root, "renamed")
+    filesystem.rename(os.path.join(self.root, "sub"), dst)
+    self.assertTrue(filesystem.isdir(dst))
+    with self.assertRaises(tf.errors.AlreadyExistsError):
+      filesystem.rename(dst, self.root)
+
+  def testRenameDirectoryOntoNonEmptyDirectory(self):
+    src = os.path.join(self.root, "src_dir")
+    dst = os.path.join(self.root, "dst_dir")
+    filesystem.makedirs(src)
+    filesystem.makedirs(dst)
+    self._write(os.path.join(src, "file"), b"new")
+    self._write(os.path.join(dst, "file"), b"old")
+
+    with self.assertRaises(tf.errors.AlreadyExistsError):
+      filesystem.rename(src, dst)
+    self.assertEqual(filesystem.read_file_to_string(
+        os.path.join(dst, "file"), binary_mode=True), b"old")
+    self.assertTrue(filesystem.exists(src))
+
+  def testNonLocalPathsUseGFile(self):
+    path = "ram://filesystem_test/dir/file"
+    filesystem.makedirs("ram://filesystem_test/dir")
+    with filesystem.open_file(path, "wb") as f:
+      f.write(b"data")
+    self.assertTrue(filesystem.exists(path))
+    self.assertEqual(filesystem.stat(path).length, 4)
+    self.assertEqual(
+        filesystem.read_file_to_string(path, binary_mode=True), b"data")
+    filesystem.remove(path)
+    self.assertFalse(filesystem.exists(path))
+
+
+if __name__ == "__main__":
+  tf.test.main()
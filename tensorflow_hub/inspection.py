@@ -0,0 +1,285 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Inspects the signatures and variables of a model without loading it.
+
+Usage as a command line tool:
+
+  python -m tensorflow_hub.inspection [--json] <handle>
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import urllib.error
+
+from absl import logging
+import tensorflow as tf
+from tensorflow_hub import archive_index
+from tensorflow_hub import module_v2
+from tensorflow_hub import registry
+from tensorflow_hub import saved_model_lib
+from tensorflow_hub import tensor_info
+from tensorflow_hub import tf_utils
+
+_VARIABLES_INDEX = "variables/variables.index"
+_CHECKPOINT_GRAPH_KEY = "_CHECKPOINTABLE_OBJECT_GRAPH"
+# Prefix of internal signatures like "__saved_model_init_op", which are not
+# meant to be called.
+_INTERNAL_SIGNATURE_PREFIX = "__saved_model_"
+# The files needed to inspect a model, relative to the model directory.
+_INSPECTED_FILES = (
+    tf.saved_model.SAVED_MODEL_FILENAME_PB,
+    module_v2._MODULE_PROTO_FILENAME_PB,  # pylint: disable=protected-access
+    _VARIABLES_INDEX,
+)
+
+
+class VariableInfo(object):
+  """Describes a variable stored in the checkpoint of a model.
+
+  Attributes:
+    dtype: The tf.DType of the variable.
+    shape: The tf.TensorShape of the variable.
+    num_bytes: The size of the variable's value, or None for strings.
+  """
+
+  def __init__(self, dtype, shape):
+    self.dtype = dtype
+    self.shape = tf.TensorShape(shape)
+    if dtype == tf.string:
+      self.num_bytes = None
+    else:
+      self.num_bytes = self.shape.num_elements() * dtype.size
+
+  def to_dict(self):
+    return {
+        "dtype": self.dtype.name,
+        "shape": self.shape.as_list(),
+        "num_bytes": self.num_bytes,
+    }
+
+
+class ModelInfo(object):
+  """Signatures and variables of a model, as returned by inspect().
+
+  Attributes:
+    handle: The inspected handle.
+    is_hub_module_v1: Whether the model is in the legacy TF1 Hub format.
+    meta_graphs: A list of (tags, signatures) pairs, one per MetaGraph, where
+      tags is a sorted list of strings and signatures maps signature names to
+      dicts with "inputs" and "outputs", each mapping tensor names to
+      objects with `dtype` and `get_shape()` (see
+      tensor_info.parse_tensor_info_map()).
+    variables: A dict from checkpoint keys to VariableInfo.
+  """
+
+  def __init__(self, handle, is_hub_module_v1, meta_graphs, variables):
+    self.handle = handle
+    self.is_hub_module_v1 = is_hub_module_v1
+    self.meta_graphs = meta_graphs
+    self.variables = variables
+
+  def get_signatures(self, tags=None):
+    """Returns the signatures of the MetaGraph with the given tags.
+
+    Args:
+      tags: Optional set of tags. If unset, the model must have exactly one
+        MetaGraph.
+
+    Raises:
+      KeyError: if there is no MetaGraph matching `tags`.
+    """
+    if tags is None:
+      if len(self.meta_graphs) != 1:
+        raise KeyError("Model has %d MetaGraphs, tags must be specified." %
+                       len(self.meta_graphs))
+      return self.meta_graphs[0][1]
+    for graph_tags, signatures in self.meta_graphs:
+      if set(graph_tags) == set(tags):
+        return signatures
+    raise KeyError("Model has no MetaGraph with tags %r (available: %r)." %
+                   (sorted(tags), [t for t, _ in self.meta_graphs]))
+
+  @property
+  def total_variable_bytes(self):
+    """Total size of all non-string variables in bytes."""
+    return sum(v.num_bytes or 0 for v in self.variables.values())
+
+  def to_dict(self):
+    """Returns a JSON-serializable representation."""
+
+    def tensor_map_to_dict(tensor_map):
+      return {
+          name: {
+              "dtype": info.dtype.name,
+              "shape": (info.get_shape().as_list()
+                        if info.get_shape().rank is not None else None),
+              "is_sparse": info.is_sparse,
+          } for name, info in tensor_map.items()
+      }
+
+    return {
+        "handle": self.handle,
+        "is_hub_module_v1": self.is_hub_module_v1,
+        "meta_graphs": [{
+            "tags": tags,
+            "signatures": {
+                name: {
+                    "inputs": tensor_map_to_dict(sig["inputs"]),
+                    "outputs": tensor_map_to_dict(sig["outputs"]),
+                } for name, sig in signatures.items()
+            },
+        } for tags, signatures in self.meta_graphs],
+        "variables": {
+            name: info.to_dict() for name, info in self.variables.items()
+        },
+        "total_variable_bytes": self.total_variable_bytes,
+    }
+
+
+def _fetch_from_archive(reader, index, dst_dir):
+  """Copies the inspected files that exist in an indexed archive."""
+  for name in _INSPECTED_FILES:
+    if name in index:
+      archive_index.extract_members(reader, index, dst_dir, names=[name])
+
+
+def _parse_model_dir(handle, model_dir):
+  """Builds a ModelInfo from the inspected files in `model_dir`."""
+  saved_model = saved_model_lib._parse_saved_model(model_dir)  # pylint: disable=protected-access
+  meta_graphs = []
+  for meta_graph in saved_model.meta_graphs:
+    signatures = {
+        name: {
+            "inputs": tensor_info.parse_tensor_info_map(signature.inputs),
+            "outputs": tensor_info.parse_tensor_info_map(signature.outputs),
+        }
+        for name, signature in meta_graph.signature_def.items()
+        if not name.startswith(_INTERNAL_SIGNATURE_PREFIX)
+    }
+    meta_graphs.append((sorted(meta_graph.meta_info_def.tags), signatures))
+
+  variables = {}
+  index_path = os.path.join(model_dir, _VARIABLES_INDEX)
+  if tf.io.gfile.exists(index_path):
+    # The checkpoint reader only needs the index to list shapes and dtypes.
+    reader = tf.train.load_checkpoint(
+        saved_model_lib.get_variables_path(model_dir))
+    dtypes = reader.get_variable_to_dtype_map()
+    for name, shape in sorted(reader.get_variable_to_shape_map().items()):
+      if name != _CHECKPOINT_GRAPH_KEY:
+        variables[name] = VariableInfo(dtypes[name], shape)
+
+  is_hub_module_v1 = tf.io.gfile.exists(
+      module_v2._get_module_proto_path(model_dir))  # pylint: disable=protected-access
+  return ModelInfo(handle, is_hub_module_v1, meta_graphs, variables)
+
+
+def _inspect_archive(handle, impl):
+  """Returns a ModelInfo read from the archive index of `handle`, or None.
+
+  None is returned if the archive has no index or cannot be reached, e.g.
+  when offline, so that the caller can fall back to resolving the handle.
+  """
+  reader = impl.archive_reader(handle)
+  tmp_dir = tempfile.mkdtemp(prefix="tfhub_inspect")
+  try:
+    index = reader.read_index()
+    if index is None:
+      logging.info("%s has no archive index; resolving it fully.", handle)
+      return None
+    _fetch_from_archive(reader, index, tmp_dir)
+    return _parse_model_dir(handle, tmp_dir)
+  except (urllib.error.URLError, OSError) as e:
+    logging.warning("Failed to read the archive index of %s (%s); resolving "
+                    "it fully.", handle, e)
+    return None
+  finally:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def inspect(handle):
+  """Returns the signatures and variables of a model without loading it.
+
+  Only `saved_model.pb`, `tfhub_module.pb` and `variables/variables.index`
+  are read. Models in directories (local or e.g. on GCS) are read in place,
+  as are archives that are already in the cache. Other archives published
+  with a sidecar index (see archive_index.write_seekable_archive()) are read
+  with ranged requests. Archives without an index, or whose index cannot be
+  read, are downloaded and extracted like for hub.resolve().
+
+  Args:
+    handle: (string) the Module handle to inspect; see hub.resolve().
+
+  Returns:
+    A ModelInfo.
+  """
+  if not isinstance(handle, str):
+    raise ValueError("Expected a string, got %s" % handle)
+  impl = registry.resolver.get_implementation(handle)
+  if hasattr(impl, "cached_module_dir"):
+    model_dir = impl.cached_module_dir(handle)
+    if model_dir is not None:
+      return _parse_model_dir(handle, model_dir)
+  if hasattr(impl, "archive_reader"):
+    info = _inspect_archive(handle, impl)
+    if info is not None:
+      return info
+  return _parse_model_dir(handle, module_v2.resolve(handle))
+
+
+def _format_model_info(info):
+  """Returns a human-readable description of a ModelInfo."""
+  lines = ["Model: %s" % info.handle]
+  if info.is_hub_module_v1:
+    lines.append("Format: TF1 Hub format")
+  for tags, signatures in info.meta_graphs:
+    lines.append("MetaGraph with tags %r:" % tags)
+    for name, signature in sorted(signatures.items()):
+      lines.append("  Signature %r:" % name)
+      for kind in ("inputs", "outputs"):
+        for key, value in sorted(signature[kind].items()):
+          lines.append("    %s %s: %s %s" % (kind[:-1], key, value.dtype.name,
+                                             value.get_shape()))
+  lines.append("Variables:")
+  for name, variable in info.variables.items():
+    lines.append("  %s: %s %s (%s)" % (
+        name, variable.dtype.name, variable.shape,
+        tf_utils.bytes_to_readable_str(variable.num_bytes, True)))
+  lines.append("Total variable size: %s" % tf_utils.bytes_to_readable_str(
+      info.total_variable_bytes, True))
+  return "\n".join(lines)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+      description="Prints signatures and variables of a TF Hub model.")
+  parser.add_argument("handle", help="Handle of the model, see hub.resolve().")
+  parser.add_argument("--json", action="store_true",
+                      help="Print the result as JSON.")
+  args = parser.parse_args(argv)
+  info = inspect(args.handle)
+  if args.json:
+    print(json.dumps(info.to_dict(), indent=2, sort_keys=True))
+  else:
+    print(_format_model_info(info))
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,161 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.inspection."""
+
+import contextlib
+import io
+import json
+import os
+import urllib.error
+from unittest import mock
+
+import tensorflow as tf
+import tensorflow_hub as hub
+from tensorflow_hub import archive_index
+from tensorflow_hub import compressed_module_resolver
+from tensorflow_hub import inspection
+from tensorflow_hub import test_utils
+
+
+def _save_dense_model(path):
+
+  class DenseModel(tf.Module):
+
+    def __init__(self):
+      super().__init__()
+      self.kernel = tf.Variable(tf.ones([3, 2]))
+      self.bias = tf.Variable(tf.zeros([2], dtype=tf.float64))
+
+    @tf.function(input_signature=[tf.TensorSpec([None, 3], tf.float32)])
+    def __call__(self, x):
+      return tf.matmul(x, self.kernel)
+
+  model = DenseModel()
+  tf.saved_model.save(model, path,
+                      signatures={"serving_default": model.__call__})
+
+
+class InspectTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_dense_model(self.model_dir)
+
+  def _assert_dense_model_info(self, info):
+    self.assertFalse(info.is_hub_module_v1)
+    signature = info.get_signatures(["serve"])["serving_default"]
+    self.assertEqual(signature["inputs"]["x"].dtype, tf.float32)
+    self.assertEqual(signature["inputs"]["x"].get_shape().as_list(),
+                     [None, 3])
+    self.assertEqual(signature["outputs"]["output_0"].get_shape().as_list(),
+                     [None, 2])
+    self.assertEqual(info.variables["kernel/.ATTRIBUTES/VARIABLE_VALUE"]
+                     .num_bytes, 3 * 2 * 4)
+    self.assertEqual(info.variables["bias/.ATTRIBUTES/VARIABLE_VALUE"].dtype,
+                     tf.float64)
+    self.assertEqual(info.total_variable_bytes, 3 * 2 * 4 + 2 * 8)
+
+  def testInspectDirectory(self):
+    info = hub.inspect(self.model_dir)
+    self.assertEqual(info.handle, self.model_dir)
+    self._assert_dense_model_info(info)
+
+  def _serve_temp_dir(self):
+    """Returns the port of an HTTP server for the temp dir (the cwd)."""
+    self.addCleanup(os.chdir, os.getcwd())
+    os.chdir(self.get_temp_dir())
+    return test_utils.start_http_server()
+
+  def testInspectIndexedArchiveWithoutDownload(self):
+    port = self._serve_temp_dir()
+    archive_index.write_seekable_archive(self.model_dir, "model.tar.gz")
+    handle = "http://localhost:%d/model.tar.gz" % port
+
+    with mock.patch.object(
+        compressed_module_resolver.HttpCompressedFileResolver, "__call__",
+        side_effect=AssertionError("Must not download.")):
+      info = hub.inspect(handle)
+    self._assert_dense_model_info(info)
+
+  def testInspectArchiveWithoutIndexDownloadsIt(self):
+    port = self._serve_temp_dir()
+    archive_index.write_seekable_archive(self.model_dir, "model.tar.gz")
+    tf.io.gfile.remove(archive_index.index_filename("model.tar.gz"))
+    handle = "http://localhost:%d/model.tar.gz" % port
+
+    with mock.patch.dict(
+        os.environ,
+        {"TFHUB_CACHE_DIR": os.path.join(self.get_temp_dir(), "cache")}):
+      info = hub.inspect(handle)
+    self._assert_dense_model_info(info)
+
+  def testInspectCachedArchiveOffline(self):
+    port = self._serve_temp_dir()
+    archive_index.write_seekable_archive(self.model_dir, "model.tar.gz")
+    handle = "http://localhost:%d/model.tar.gz" % port
+
+    with mock.patch.dict(
+        os.environ,
+        {"TFHUB_CACHE_DIR": os.path.join(self.get_temp_dir(), "cache")}):
+      hub.resolve(handle)
+      offline = urllib.error.URLError("Network is unreachable")
+      with mock.patch.object(
+          archive_index.HttpRangeReader, "_open", side_effect=offline):
+        info = hub.inspect(handle)
+    self._assert_dense_model_info(info)
+
+  def testInspectUnreachableIndexResolvesArchive(self):
+    port = self._serve_temp_dir()
+    archive_index.write_seekable_archive(self.model_dir, "model.tar.gz")
+    handle = "http://localhost:%d/model.tar.gz" % port
+
+    with mock.patch.dict(
+        os.environ,
+        {"TFHUB_CACHE_DIR": os.path.join(self.get_temp_dir(), "cache")}):
+      with mock.patch.object(
+          archive_index.HttpRangeReader, "_open",
+          side_effect=urllib.error.URLError("Connection reset")):
+        info = hub.inspect(handle)
+    self._assert_dense_model_info(info)
+
+  def testInspectHubModuleV1(self):
+    with tf.io.gfile.GFile(os.path.join(self.model_dir, "tfhub_module.pb"),
+                           "wb") as f:
+      f.write(b"")
+    self.assertTrue(inspection.inspect(self.model_dir).is_hub_module_v1)
+
+  def testGetSignaturesWithUnknownTags(self):
+    info = hub.inspect(self.model_dir)
+    with self.assertRaisesRegex(KeyError, "no MetaGraph with tags"):
+      info.get_signatures(["train"])
+
+  def testMain(self):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      inspection.main(["--json", self.model_dir])
+    result = json.loads(output.getvalue())
+    self.assertEqual(result["total_variable_bytes"], 40)
+    self.assertEqual(result["meta_graphs"][0]["tags"], ["serve"])
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      inspection.main([self.model_dir])
+    self.assertIn("Signature 'serving_default'", output.getvalue())
+    self.assertIn("Total variable size: 40B", output.getvalue())
+
+
+if __name__ == "__main__":
+  tf.test.main()
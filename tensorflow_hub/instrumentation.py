@@ -0,0 +1,268 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Counts the calls of hub.KerasLayers and loaded models, when enabled.
+
+Once enable() is called, every call of a hub.KerasLayer, and of the objects
+returned by later hub.load() calls, is recorded under the key (handle,
+signature): eager calls with their batch size and latency, and calls while
+building a graph (like tracing a tf.function) as traces. snapshot() returns
+the totals. While disabled, calls only check a global flag.
+
+Each thread records into its own counters, so recording takes no locks;
+snapshot() adds up the counters of all threads. When a thread ends, its
+counters are merged into global totals.
+"""
+
+import bisect
+import collections
+import threading
+import time
+import weakref
+
+import tensorflow as tf
+
+# Upper bounds of the histogram buckets. A last bucket counts bigger values.
+LATENCY_BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500,
+                      1000, 2000, 5000)
+BATCH_SIZE_BUCKETS = tuple(2**i for i in range(13))
+
+CallStats = collections.namedtuple("CallStats", [
+    # The number of eager calls, and of calls while building a graph.
+    "num_calls",
+    "num_traces",
+    # The sum of the batch sizes of eager calls (the leading dimension of
+    # their first input).
+    "num_rows",
+    # Eager calls per second between the first and the last call.
+    "calls_per_sec",
+    "mean_latency_ms",
+    # Lists of (upper bound, count) pairs. The upper bound of the last
+    # bucket is inf.
+    "latency_histogram_ms",
+    "batch_size_histogram",
+])
+
+_enabled = False
+# Guards _thread_counters, _totals and the dicts in _thread_counters.
+_registry_lock = threading.Lock()
+# The counters of each running thread, as dicts from keys to _Counters.
+_thread_counters = []
+# The counters of the threads that ended, as a dict from keys to _Counters.
+_totals = {}
+_local = threading.local()
+
+
+class _Counters(object):
+  """The counters of one key in one thread."""
+
+  def __init__(self):
+    self.num_calls = 0
+    self.num_traces = 0
+    self.num_rows = 0
+    self.latency_sec = 0.
+    self.first_call = None
+    self.last_call = None
+    self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+  def add(self, other):
+    """Adds the counts of another _Counters to these."""
+    self.num_calls += other.num_calls
+    self.num_traces += other.num_traces
+    self.num_rows += other.num_rows
+    self.latency_sec += other.latency_sec
+    if other.first_call is not None:
+      self.first_call = min(self.first_call or other.first_call,
+                            other.first_call)
+      self.last_call = max(self.last_call or other.last_call,
+                           other.last_call)
+    for i, count in enumerate(other.latency_counts):
+      self.latency_counts[i] += count
+    for i, count in enumerate(other.batch_size_counts):
+      self.batch_size_counts[i] += count
+
+
+def _copy(counters):
+  result = _Counters()
+  result.add(counters)
+  return result
+
+
+class _ThreadCounters(object):
+  """Holds the counters of a thread in its thread-local storage."""
+
+  def __init__(self):
+    self.counters = {}
+
+
+def enable():
+  """Starts recording calls."""
+  global _enabled
+  _enabled = True
+
+
+def disable():
+  """Stops recording calls. The recorded counts are kept."""
+  global _enabled
+  _enabled = False
+
+
+def is_enabled():
+  return _enabled
+
+
+def reset():
+  """Drops the recorded counts."""
+  with _registry_lock:
+    _totals.clear()
+    for counters in _thread_counters:
+      counters.clear()
+
+
+def _merge_into_totals(counters):
+  """Moves the counters of a thread that ended into _totals."""
+  with _registry_lock:
+    _thread_counters[:] = [c for c in _thread_counters if c is not counters]
+    for key, key_counters in counters.items():
+      _totals.setdefault(key, _Counters()).add(key_counters)
+
+
+def _counters(key):
+  """Returns the counters of `key` for the current thread."""
+  holder = getattr(_local, "holder", None)
+  if holder is None:
+    holder = _local.holder = _ThreadCounters()
+    with _registry_lock:
+      _thread_counters.append(holder.counters)
+    # The thread-local holder is collected when the thread ends.
+    weakref.finalize(holder, _merge_into_totals, holder.counters)
+  counters = holder.counters
+  result = counters.get(key)
+  if result is None:
+    result = counters[key] = _Counters()
+  return result
+
+
+def _batch_size(inputs):
+  for x in tf.nest.flatten(inputs):
+    shape = getattr(x, "shape", None)
+    if shape is not None and len(shape) and shape[0] is not None:
+      return int(shape[0])
+  return None
+
+
+def record_call(key, fn, inputs):
+  """Returns fn(), recorded as a call with `inputs` under `key`.
+
+  Args:
+    key: A (handle, signature) pair.
+    fn: A callable with no arguments that runs the call.
+    inputs: The inputs of the call, to read its batch size from.
+  """
+  counters = _counters(key)
+  if not tf.executing_eagerly():
+    counters.num_traces += 1
+    return fn()
+  start = time.perf_counter()
+  result = fn()
+  latency_sec = time.perf_counter() - start
+  now = time.time()
+  counters.num_calls += 1
+  counters.latency_sec += latency_sec
+  counters.latency_counts[
+      bisect.bisect_left(LATENCY_BUCKETS_MS, latency_sec * 1000.)] += 1
+  batch_size = _batch_size(inputs)
+  if batch_size is not None:
+    counters.num_rows += batch_size
+    counters.batch_size_counts[
+        bisect.bisect_left(BATCH_SIZE_BUCKETS, batch_size)] += 1
+  if counters.first_call is None:
+    counters.first_call = now
+  counters.last_call = now
+  return result
+
+
+class InstrumentedCallable(object):
+  """Records the calls of a callable, see instrument()."""
+
+  def __init__(self, fn, key):
+    self._fn = fn
+    self._key = key
+
+  @property
+  def input_signature(self):
+    """The input signature of the wrapped function, if known."""
+    return getattr(self._fn, "input_signature", None)
+
+  @property
+  def concrete_functions(self):
+    """The concrete functions of the wrapped function, if known."""
+    return getattr(self._fn, "concrete_functions", None)
+
+  def __call__(self, *args, **kwargs):
+    if not _enabled:
+      return self._fn(*args, **kwargs)
+    return record_call(self._key, lambda: self._fn(*args, **kwargs),
+                       (args, kwargs))
+
+
+def instrument(fn, handle, signature=None):
+  """Returns a callable that records the calls of `fn` under a key."""
+  return InstrumentedCallable(fn, (handle, signature))
+
+
+def _histogram(bounds, counts):
+  return list(zip(list(bounds) + [float("inf")], counts))
+
+
+def snapshot():
+  """Returns the recorded calls as a dict from keys to CallStats.
+
+  The keys are (handle, signature) pairs; the signature is None for calls
+  of the loaded object itself.
+  """
+  with _registry_lock:
+    thread_counters = [list(counters.items())
+                       for counters in _thread_counters]
+    # The totals still change when threads end, so they are copied.
+    thread_counters.append([(key, _copy(counters))
+                            for key, counters in _totals.items()])
+  totals = {}
+  for items in thread_counters:
+    for key, counters in items:
+      totals.setdefault(key, []).append(counters)
+  result = {}
+  for key, all_counters in totals.items():
+    num_calls = sum(c.num_calls for c in all_counters)
+    first_calls = [c.first_call for c in all_counters if c.first_call]
+    last_calls = [c.last_call for c in all_counters if c.last_call]
+    duration = max(last_calls) - min(first_calls) if first_calls else 0.
+    latency_sec = sum(c.latency_sec for c in all_counters)
+    result[key] = CallStats(
+        num_calls=num_calls,
+        num_traces=sum(c.num_traces for c in all_counters),
+        num_rows=sum(c.num_rows for c in all_counters),
+        calls_per_sec=num_calls / duration if duration > 0 else None,
+        mean_latency_ms=(1000. * latency_sec / num_calls if num_calls
+                         else None),
+        latency_histogram_ms=_histogram(
+            LATENCY_BUCKETS_MS,
+            [sum(counts) for counts in
+             zip(*[c.latency_counts for c in all_counters])]),
+        batch_size_histogram=_histogram(
+            BATCH_SIZE_BUCKETS,
+            [sum(counts) for counts in
+             zip(*[c.batch_size_counts for c in all_counters])]))
+  return result
@@ -0,0 +1,136 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.instrumentation."""
+
+import gc
+import os
+import threading
+
+import tensorflow as tf
+from tensorflow_hub import instrumentation
+from tensorflow_hub import module_v2
+
+
+class InstrumentationTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    instrumentation.reset()
+    instrumentation.enable()
+
+  def tearDown(self):
+    instrumentation.disable()
+    instrumentation.reset()
+    super().tearDown()
+
+  def testEagerCalls(self):
+    fn = instrumentation.instrument(lambda x: x + 1, "model", "serving")
+    for batch_size in [1, 3, 3, 5000]:
+      fn(tf.zeros([batch_size, 2]))
+    stats = instrumentation.snapshot()[("model", "serving")]
+    self.assertEqual(stats.num_calls, 4)
+    self.assertEqual(stats.num_traces, 0)
+    self.assertEqual(stats.num_rows, 5007)
+    self.assertGreater(stats.mean_latency_ms, 0.)
+    self.assertEqual(sum(count for _, count in stats.latency_histogram_ms), 4)
+    histogram = dict(stats.batch_size_histogram)
+    self.assertEqual(histogram[1], 1)
+    self.assertEqual(histogram[4], 2)
+    self.assertEqual(histogram[float("inf")], 1)
+    self.assertEqual(sum(histogram.values()), 4)
+
+  def testTraces(self):
+    fn = instrumentation.instrument(lambda x: x * 2, "model")
+    traced = tf.function(fn)
+    self.assertAllEqual(traced(tf.ones([2])), [2., 2.])
+    self.assertAllEqual(traced(tf.ones([2])), [2., 2.])
+    self.assertAllEqual(traced(tf.ones([3])), [2., 2., 2.])
+    stats = instrumentation.snapshot()[("model", None)]
+    self.assertEqual(stats.num_traces, 2)
+    self.assertEqual(stats.num_calls, 0)
+    self.assertIsNone(stats.mean_latency_ms)
+
+  def testDisabled(self):
+    fn = instrumentation.instrument(lambda x: x, "model")
+    instrumentation.disable()
+    fn(tf.ones([2]))
+    self.assertEmpty(instrumentation.snapshot())
+    instrumentation.enable()
+    fn(tf.ones([2]))
+    self.assertEqual(instrumentation.snapshot()[("model", None)].num_calls, 1)
+
+  def testThreads(self):
+    fn = instrumentation.instrument(lambda x: x, "model")
+    def run():
+      for _ in range(50):
+        fn(tf.ones([2]))
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    stats = instrumentation.snapshot()[("model", None)]
+    self.assertEqual(stats.num_calls, 200)
+    self.assertEqual(stats.num_rows, 400)
+
+  def testCountsOfEndedThreadsAreMerged(self):
+    fn = instrumentation.instrument(lambda x: x, "model")
+    fn(tf.ones([1]))
+    num_live = len(instrumentation._thread_counters)
+    def run():
+      for _ in range(10):
+        fn(tf.ones([2]))
+    for _ in range(5):
+      thread = threading.Thread(target=run)
+      thread.start()
+      thread.join()
+    gc.collect()
+    self.assertLen(instrumentation._thread_counters, num_live)
+    stats = instrumentation.snapshot()[("model", None)]
+    self.assertEqual(stats.num_calls, 51)
+    self.assertEqual(stats.num_rows, 101)
+    self.assertEqual(sum(count for _, count in stats.batch_size_histogram),
+                     51)
+    instrumentation.reset()
+    self.assertEmpty(instrumentation.snapshot())
+
+  def testLoad(self):
+    export_dir = os.path.join(self.get_temp_dir(), "model")
+    obj = tf.train.Checkpoint()
+    obj.__call__ = tf.function(lambda x: x + 1,
+                               input_signature=[tf.TensorSpec([None])])
+    tf.saved_model.save(obj, export_dir)
+    m = module_v2.load(export_dir, warmup=[4])
+    self.assertAllEqual(m(tf.constant([1., 2.])), [2., 3.])
+    stats = instrumentation.snapshot()[(export_dir, None)]
+    self.assertEqual(stats.num_calls, 1)  # Not the warmup.
+    self.assertEqual(stats.num_rows, 2)
+
+  def testResaveInstrumentedObject(self):
+    export_dir = os.path.join(self.get_temp_dir(), "model")
+    obj = tf.train.Checkpoint()
+    obj.__call__ = tf.function(lambda x: x + 1,
+                               input_signature=[tf.TensorSpec([None])])
+    tf.saved_model.save(obj, export_dir)
+    m = module_v2.load(export_dir, jit_compile=True)
+    self.assertIsInstance(m.__call__, instrumentation.InstrumentedCallable)
+    resaved_dir = os.path.join(self.get_temp_dir(), "resaved")
+    tf.saved_model.save(m, resaved_dir)
+    resaved = tf.saved_model.load(resaved_dir)
+    self.assertAllEqual(resaved(tf.constant([1., 2.])), [2., 3.])
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -0,0 +1,174 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Calls loaded models through XLA-compiled functions.
+
+XLA compiles a function for fully known input shapes, and compiling takes
+long enough that it must not happen for every new batch size. Therefore
+eager calls are padded along the leading (batch) dimension of their inputs
+to the next of a few bucket sizes, by default the powers of two, and the
+compiled function of that bucket runs on the padded inputs. The outputs are
+sliced back to the batch size of the call.
+
+If XLA cannot compile the model, for example because it uses string ops,
+a warning is logged and all calls run the model as is.
+"""
+
+import time
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+
+
+class BucketStats(object):
+  """Statistics of the compiled function for one bucket of input shapes.
+
+  Attributes:
+    batch_size: The padded batch size of the bucket, or None if the inputs
+      have no batch dimension.
+    input_shapes: The nest of the padded input shapes.
+    compile_time_sec: The duration of the first call, which traces and
+      compiles the function.
+    num_calls: The number of calls that used the bucket.
+  """
+
+  def __init__(self, batch_size, input_shapes, compile_time_sec):
+    self.batch_size = batch_size
+    self.input_shapes = input_shapes
+    self.compile_time_sec = compile_time_sec
+    self.num_calls = 1
+
+  def __repr__(self):
+    return ("BucketStats(batch_size=%s, input_shapes=%s, "
+            "compile_time_sec=%.3f, num_calls=%d)" % (
+                self.batch_size, self.input_shapes, self.compile_time_sec,
+                self.num_calls))
+
+
+def _bucket_size(batch_size, bucket_sizes):
+  """Returns the smallest bucket that fits `batch_size`."""
+  if bucket_sizes is None:
+    return 1 << max(batch_size - 1, 0).bit_length()
+  for size in bucket_sizes:
+    if size >= batch_size:
+      return size
+  return batch_size  # Bigger than all buckets: runs with its own shape.
+
+
+def _pad(x, size):
+  """Pads `x` with zeros (or empty strings) along axis 0 to `size` rows."""
+  if x.shape[0] == size:
+    return x
+  paddings = [[0, size - x.shape[0]]] + [[0, 0]] * (x.shape.rank - 1)
+  return tf.pad(x, paddings)
+
+
+class JitCompiledCallable(object):
+  """Calls a callable through XLA-compiled functions, see jit_compile()."""
+
+  def __init__(self, fn, bucket_sizes=None):
+    self._fn = fn
+    self._bucket_sizes = sorted(bucket_sizes) if bucket_sizes else None
+    self._compiled_fn = tf.function(fn, jit_compile=True)
+    self._buckets = {}
+    self.fallback_reason = None
+
+  @property
+  def input_signature(self):
+    """The input signature of the wrapped function, if known."""
+    return getattr(self._fn, "input_signature", None)
+
+  @property
+  def concrete_functions(self):
+    """The concrete functions of the wrapped function, if known."""
+    return getattr(self._fn, "concrete_functions", None)
+
+  @property
+  def stats(self):
+    """A list of BucketStats, one per bucket that has been compiled."""
+    return list(self._buckets.values())
+
+  def __call__(self, *args, **kwargs):
+    if not tf.executing_eagerly() or self.fallback_reason is not None:
+      # Graphs are compiled as a whole, if at all, by their caller.
+      return self._fn(*args, **kwargs)
+    structure = (args, kwargs)
+    flat = [tf.convert_to_tensor(x) if isinstance(x, np.ndarray) else x
+            for x in tf.nest.flatten(structure)]
+    tensors = [x for x in flat if isinstance(x, tf.Tensor)]
+    batch_size = bucket = None
+    if tensors and all(x.shape.rank for x in tensors):
+      batch_size = tensors[0].shape[0]
+      if all(x.shape[0] == batch_size for x in tensors):
+        bucket = _bucket_size(batch_size, self._bucket_sizes)
+    if bucket is not None:
+      flat = [_pad(x, bucket) if isinstance(x, tf.Tensor) else x
+              for x in flat]
+    padded_args, padded_kwargs = tf.nest.pack_sequence_as(structure, flat)
+    key = tuple((tuple(x.shape), x.dtype) if isinstance(x, tf.Tensor)
+                else (type(x), x) for x in flat)
+
+    stats = self._buckets.get(key)
+    if stats is not None:
+      stats.num_calls += 1
+      result = self._compiled_fn(*padded_args, **padded_kwargs)
+    else:
+      start = time.time()
+      try:
+        result = self._compiled_fn(*padded_args, **padded_kwargs)
+      except (tf.errors.InvalidArgumentError,
+              tf.errors.UnimplementedError) as e:
+        # Errors that are not about compiling come back from the plain call.
+        result = self._fn(*args, **kwargs)
+        self.fallback_reason = str(e).split("\n")[0]
+        logging.warning("Not compiling %s with XLA: %s", self._fn,
+                        self.fallback_reason)
+        return result
+      self._buckets[key] = BucketStats(
+          bucket, tf.nest.map_structure(
+              lambda x: x.shape.as_list() if isinstance(x, tf.Tensor)
+              else None,
+              (padded_args, padded_kwargs)),
+          time.time() - start)
+    if bucket is None or bucket == batch_size:
+      return result
+    return tf.nest.map_structure(
+        lambda y: y[:batch_size] if y.shape.rank and y.shape[0] == bucket
+        else y, result)
+
+
+def jit_compile(fn, bucket_sizes=None):
+  """Wraps a callable to run it through XLA-compiled functions.
+
+  See the module docstring for how calls are bucketed. Calls with inputs
+  that do not all have the same batch size are compiled for their exact
+  shapes. Outputs are sliced if their leading dimension is the padded batch
+  size. Padded rows must not affect the other rows of the outputs, which is
+  the case for models in inference mode (but not, e.g., for batch
+  normalization in training mode).
+
+  Args:
+    fn: A callable taking tensors with a leading batch dimension, like a
+      function of a loaded model.
+    bucket_sizes: Optional. A list of the batch sizes to pad to. Bigger
+      batches are compiled for their own size. Defaults to the powers of
+      two.
+
+  Returns:
+    A JitCompiledCallable, whose `stats` are the BucketStats of the compiled
+    buckets and whose `fallback_reason` is set if XLA could not compile
+    `fn`.
+  """
+  return JitCompiledCallable(fn, bucket_sizes)
@@ -0,0 +1,67 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.jit_compilation."""
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import jit_compilation
+
+
+class JitCompilationTest(tf.test.TestCase):
+
+  def testBuckets(self):
+    traced_shapes = []
+    def fn(x, scale=1.):
+      traced_shapes.append(x.shape.as_list())
+      return {"y": tf.nn.relu(x) * scale, "sum": tf.reduce_sum(x)}
+    compiled = jit_compilation.jit_compile(fn)
+    for batch_size in [3, 4, 1, 3]:
+      x = np.arange(batch_size * 2, dtype=np.float32).reshape([-1, 2])
+      result = compiled(x)
+      self.assertAllEqual(result["y"], x)
+      self.assertEqual(result["sum"], x.sum())
+    self.assertAllEqual(compiled(tf.ones([2, 2]), scale=2.)["y"],
+                        2 * tf.ones([2, 2]))
+    self.assertEqual(traced_shapes, [[4, 2], [1, 2], [2, 2]])
+    stats = compiled.stats
+    self.assertEqual([s.batch_size for s in stats], [4, 1, 2])
+    self.assertEqual([s.num_calls for s in stats], [3, 1, 1])
+    self.assertEqual(stats[0].input_shapes, (([4, 2],), {}))
+    self.assertIsNone(compiled.fallback_reason)
+
+  def testBucketSizes(self):
+    compiled = jit_compilation.jit_compile(lambda x: x + 1,
+                                           bucket_sizes=[8, 2])
+    for batch_size in [1, 3, 10]:
+      self.assertAllEqual(compiled(tf.zeros([batch_size])),
+                          tf.ones([batch_size]))
+    self.assertEqual([s.batch_size for s in compiled.stats], [2, 8, 10])
+
+  def testFallback(self):
+    compiled = jit_compilation.jit_compile(tf.strings.length)
+    self.assertAllEqual(compiled(tf.constant(["a", "bc"])), [1, 2])
+    self.assertIn("unsupported operations", compiled.fallback_reason)
+    self.assertAllEqual(compiled(tf.constant(["abc"])), [3])
+    self.assertEmpty(compiled.stats)
+
+  def testErrorsOfTheCallAreRaised(self):
+    compiled = jit_compilation.jit_compile(lambda x: tf.matmul(x, x))
+    with self.assertRaisesRegex(ValueError, "MatMul"):
+      compiled(tf.ones([2, 3]))
+    self.assertIsNone(compiled.fallback_reason)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -14,13 +14,25 @@
 # ==============================================================================
 """A Keras Layer for using TF Hub modules in TF2 format."""
 
+import collections
+from concurrent import futures
 import functools
+import hashlib
 import json
+import threading
 
 from absl import logging
+import numpy as np
 import tensorflow as tf
 
+from tensorflow_hub import instrumentation
+from tensorflow_hub import jit_compilation
 from tensorflow_hub import module_v2
+from tensorflow_hub import output_cache as output_cache_lib
+from tensorflow_hub import quantization
+from tensorflow_hub import tf_utils
+from tensorflow_hub import trace_cache
+from tensorflow_hub import warmup as warmup_lib
 
 # pylint: disable=g-import-not-at-top
 # Use Keras 2.
@@ -35,11 +47,16 @@ from tensorflow.python.framework import smart_cond
 from tensorflow.python.util import tf_inspect
 
 try:
+  from tensorflow.python.trackable import base as trackable_base
   from tensorflow.python.trackable import data_structures
 except ImportError:
+  from tensorflow.python.training.tracking import base as trackable_base
   from tensorflow.python.training.tracking import data_structures
 # pylint: enable=g-direct-tensorflow-import,g-import-not-at-top
 
+# The number of concrete functions kept by a layer with compile_eager_call.
+_MAX_COMPILED_CALLS = 32
+
 
 class KerasLayer(keras.layers.Layer):
   """Wraps a SavedModel (or a legacy TF1 Hub format) as a Keras Layer.
@@ -97,10 +114,16 @@ class KerasLayer(keras.layers.Layer):
   Using keras.mixed_precision etc. has no effect on the saved model
   that gets loaded by a hub.KerasLayer.
 
+  Note: After hub.enable_instrumentation(), the calls of this layer are
+  counted for hub.instrumentation_snapshot() under the key (handle,
+  signature), with the latency and batch size of eager calls.
+
   Attributes:
     handle: A callable object (subject to the conventions above), or a Python
       string to load a saved model via hub.load(). A string is required to save
-      the Keras config of this Layer.
+      the Keras config of this Layer. Also accepts a future returned by
+      hub.load_async(), which is waited for only when the layer is built, like
+      with `lazy=True`.
     trainable: Optional. A boolean controlling whether this layer is trainable.
       Must not be set to True when using a signature (raises ValueError),
       including the use of legacy TF1 Hub format.
@@ -128,6 +151,101 @@ class KerasLayer(keras.layers.Layer):
     load_options: Optional, `tf.saved_model.LoadOptions` object that specifies
       options for loading when a Python string is provided as `handle`. This
       argument can only be used from TensorFlow 2.3 onwards.
+    share_loaded_object: Optional. If True, layers created with the same string
+      `handle`, tags and load options share a single loaded object, including
+      its variables (see `hub.load()`). This saves memory and load time when
+      several models use the same frozen module. Leave it False to give a
+      trainable layer its own copy of the variables.
+    mmap_variables: Optional. If True, the variable values of the SavedModel
+      are memory-mapped from a cache file shared by all processes on the host
+      (see `hub.load()`). Meant for layers with trainable=False.
+    prune_unused_signatures: Optional. If True, and `handle` is a string for
+      a TF1 SavedModel (like the TF1 Hub format), the model is loaded from a
+      cached copy pruned to the used signature (see `hub.load()`), which
+      saves memory and load time for models with many signatures.
+    convert_to_tf2: Optional. If True, and `handle` is a string for a TF1
+      SavedModel, it is loaded from a cached conversion to a TF2 SavedModel
+      (see `hub.load()`), which loads faster after the first time.
+    lazy: Optional. If True, the string `handle` is resolved and loaded only
+      when the layer is built, that is, when it is first called (including
+      symbolically, when building a functional Keras model), or when
+      `resolved_object` is accessed. Until then, the layer has no weights.
+      Errors in the arguments that depend on the loaded object are raised
+      at that time as well. This keeps the startup cost of creating many
+      optional layers low.
+    warmup: Optional. True to replay the warmup requests of TensorFlow
+      Serving stored in the module of the string `handle` (see `hub.load()`),
+      or a list of warmup specs to call this layer with: batch sizes (for
+      callables with a known input signature), tf.TensorSpecs, or sample
+      inputs (see tensorflow_hub/warmup.py). This runs once the callable
+      object is loaded (for `lazy=True`, when the layer is built), so that
+      the first real call does not pay for instantiating and optimizing the
+      loaded functions; `is_warm` then becomes True. Requires eager mode.
+      Only a warmup that is JSON-serializable is stored in the config.
+    traced_call_signatures: Optional. A list of input signatures, each a
+      tf.TensorSpec or a nest of them matching the inputs of this layer. If
+      set, the call of this layer (with `training=False`) is traced for each
+      signature and saved together with the loaded model in the TF-Hub cache
+      directory, keyed by a hash of the module, the arguments of this layer
+      that affect the call, the signatures and the TensorFlow version. Later
+      constructions with the same key (also in other processes) load these
+      traced functions instead of loading the module and tracing again. The
+      layer then only accepts inputs matching one of the signatures, and
+      cannot be trained. Requires a string `handle`, `trainable=False` and
+      eager mode. Not stored in the config.
+    compile_eager_call: Optional. If True, calls of this layer in eager mode
+      run a concrete function that is traced once per input signature
+      (with any batch size), training mode and trainability. Like
+      tf.function(reduce_retracing=True), inputs with other shapes are traced
+      for shapes general enough for both, if the model accepts them, and only
+      the most recently used functions are kept. The checks and
+      the handling of arguments, signatures, `output_key` and `output_shape`
+      then run only when tracing, not on every call, which cuts the per-call
+      overhead for small models. Calls while building a graph (like in a
+      tf.function or a functional Keras model) are unaffected.
+    output_cache: Optional. A `hub.OutputCache` to memoize the outputs of
+      this layer for repeated input rows, like the texts given to a text
+      embedding. In eager mode, while the layer is not trainable, each call
+      looks up every row of its inputs by a hash of the row and the module,
+      runs the model only on the rows not found, and merges the results back
+      in order. Requires a string `handle`, `trainable=False`, and an output
+      that is a single tensor with a leading batch dimension. The cache can
+      be shared by several layers. Not stored in the config.
+    quantize: Optional. "int8" or "bfloat16" to keep the large float32
+      variables of the loaded model in compact storage once it is loaded:
+      int8 values with a scale per row or per channel, or bfloat16 values.
+      Their float32 values are freed, and calls run a rewritten graph of the
+      model that dequantizes only the values each op reads, like the
+      gathered rows of an embedding table (see
+      tensorflow_hub/quantization.py). So calls take longer, but the model
+      takes about a quarter or half of the memory. Requires a string
+      `handle` and `trainable=False`, and cannot be combined with
+      `share_loaded_object` or `mmap_variables`. Afterwards, get_weights()
+      and saving or checkpointing the layer raise errors.
+      `quantization_report` tells the memory saved.
+    quantize_sample: Optional. Sample inputs to run through the layer with
+      and without quantization, to report the difference of the outputs in
+      `quantization_report`. Not stored in the config.
+    jit_compile: Optional. If True, calls of this layer in eager mode run
+      through XLA-compiled functions, with the batch dimension of the inputs
+      padded to the next power of two, so that few shapes need compiling
+      (see tensorflow_hub/jit_compilation.py). If XLA cannot compile the
+      model, it runs as is. `jit_compile_stats` has the statistics of the
+      compiled buckets. Calls while building a graph are unaffected; use
+      the `jit_compile` options of tf.function or Model.compile() there.
+    max_batch_size: Optional. If set, calls of this layer in eager mode with
+      a bigger batch (the leading dimension of the input tensors, which must
+      be the same for all of them) run the model on consecutive chunks of at
+      most this many rows and concatenate the outputs, which must all have
+      the batch dimension. This bounds the memory of the model's
+      intermediate results regardless of the size of the inputs. `stream()`
+      returns the outputs of the chunks one by one instead. Calls while
+      building a graph are unaffected; batch the inputs with tf.data or
+      Model.predict(batch_size=...) there.
+    max_batch_parallelism: Optional. The number of chunks of a call with
+      `max_batch_size` that run at the same time, on a thread pool. Defaults
+      to 1, which runs them one after another. The memory used then grows
+      with this number.
     **kwargs: Forwarded to Keras' base Layer constructor.
   """
 
@@ -143,6 +261,20 @@ class KerasLayer(keras.layers.Layer):
       output_key=None,
       output_shape=None,
       load_options=None,
+      share_loaded_object=False,
+      mmap_variables=False,
+      prune_unused_signatures=False,
+      convert_to_tf2=False,
+      lazy=False,
+      warmup=None,
+      traced_call_signatures=None,
+      compile_eager_call=False,
+      output_cache=None,
+      quantize=None,
+      quantize_sample=None,
+      jit_compile=False,
+      max_batch_size=None,
+      max_batch_parallelism=1,
       **kwargs):
     # Note: for compatibility with keras-model serialization this layer is
     # json-serializable. If you add or change arguments here, please also update
@@ -162,7 +294,97 @@ class KerasLayer(keras.layers.Layer):
           _convert_nest_to_shapes(output_shape))
 
     self._load_options = load_options
-    self._func = load_module(handle, tags, self._load_options)
+    self._share_loaded_object = share_loaded_object
+    self._mmap_variables = mmap_variables
+    self._prune_unused_signatures = prune_unused_signatures
+    self._convert_to_tf2 = convert_to_tf2
+    self._lazy = lazy
+    self._warmup = data_structures.NoDependency(warmup)
+    self._is_warm = False
+    if traced_call_signatures:
+      if not isinstance(handle, str):
+        raise ValueError("traced_call_signatures requires a string handle.")
+      if trainable:
+        raise ValueError("traced_call_signatures requires trainable=False.")
+    self._traced_call_signatures = data_structures.NoDependency(
+        traced_call_signatures)
+    self._traced_calls = None
+    self._compile_eager_call = compile_eager_call
+    self._compiled_calls = data_structures.NoDependency(
+        collections.OrderedDict())
+    if output_cache is not None:
+      if not isinstance(handle, str):
+        raise ValueError("output_cache requires a string handle.")
+      if trainable:
+        raise ValueError("output_cache requires trainable=False.")
+    self._output_cache = data_structures.NoDependency(output_cache)
+    self._output_cache_namespace = None
+    if quantize is not None:
+      if quantize not in quantization.MODES:
+        raise ValueError("quantize must be one of %s, got %r."
+                         % (quantization.MODES, quantize))
+      if not isinstance(handle, str):
+        raise ValueError("quantize requires a string handle.")
+      if trainable:
+        raise ValueError("quantize requires trainable=False.")
+      if share_loaded_object or mmap_variables:
+        raise ValueError("quantize cannot be combined with "
+                         "share_loaded_object or mmap_variables.")
+    self._quantize = quantize
+    self._quantize_sample = data_structures.NoDependency(quantize_sample)
+    self._quantized_variables = None
+    self._jit_compile = jit_compile
+    self._jit_calls = data_structures.NoDependency({})
+    if max_batch_size is not None and max_batch_size < 1:
+      raise ValueError("max_batch_size must be positive, got %r."
+                       % max_batch_size)
+    if max_batch_parallelism < 1:
+      raise ValueError("max_batch_parallelism must be positive, got %r."
+                       % max_batch_parallelism)
+    self._max_batch_size = max_batch_size
+    self._max_batch_parallelism = max_batch_parallelism
+    self._tags = tags
+    if lazy or isinstance(handle, futures.Future):
+      if not isinstance(handle, (str, futures.Future)):
+        raise ValueError("lazy=True requires a string handle.")
+      self._func = None
+      self._is_loaded = False
+      self._load_lock = threading.Lock()
+      super().__init__(trainable=trainable, **kwargs)
+    else:
+      self._load_func()
+      self._setup_layer(trainable, **kwargs)
+      self._is_loaded = True
+      self._save_traced_calls()
+      self._quantize_variables()
+      self._run_warmup()
+
+  def _load_func(self):
+    """Loads the callable object and checks the arguments that depend on it."""
+    if self._traced_call_signatures:
+      self._module_path = module_v2.resolve(self._handle)
+      self._traced_calls_path = trace_cache.cache_path(
+          self._module_path, self._call_config(),
+          self._traced_call_signatures)
+      self._traced_calls = trace_cache.load(self._traced_calls_path,
+                                            self._module_path)
+      if self._traced_calls is not None:
+        # The traced calls replace the loaded object and the logic around it.
+        self._func = self._traced_calls
+        self._is_hub_module_v1 = False
+        self._callable = None
+        self._has_training_argument = False
+        return
+    prune_to_signature = None
+    if self._prune_unused_signatures:
+      # TF1 Hub format modules are called through "default" if unset.
+      prune_to_signature = self._signature or "default"
+    self._func = load_module(self._handle, self._tags, self._load_options,
+                             share_loaded_object=self._share_loaded_object,
+                             mmap_variables=self._mmap_variables,
+                             prune_to_signature=prune_to_signature,
+                             convert_to_tf2=self._convert_to_tf2,
+                             warmup=self._warmup is True)
     self._is_hub_module_v1 = getattr(self._func, "_is_hub_module_v1", False)
 
     # Update with the defaults when using legacy TF1 Hub format.
@@ -181,24 +403,158 @@ class KerasLayer(keras.layers.Layer):
 
     self._callable = self._get_callable()
     self._has_training_argument = func_has_training_argument(self._callable)
-    self._setup_layer(trainable, **kwargs)
 
   def _setup_layer(self, trainable=False, **kwargs):
     """Constructs keras layer with relevant weights and losses."""
     # Initialize an empty layer, then add_weight() etc. as needed.
     super().__init__(trainable=trainable, **kwargs)
+    self._add_weights_and_losses()
+
+  def _ensure_loaded(self):
+    """Loads the callable object of a lazy layer, once."""
+    if self._is_loaded:
+      return
+    with self._load_lock:
+      if not self._is_loaded:
+        # Like Keras' own weight creation in build(), this must not end up in
+        # a tf.function that might be traced more than once.
+        with tf.init_scope():
+          self._load_func()
+          self._add_weights_and_losses()
+        self._is_loaded = True
+        self._save_traced_calls()
+        self._quantize_variables()
+        self._run_warmup()
+
+  def _call_config(self):
+    """Returns the arguments of this layer that affect its call."""
+    output_shape = None
+    if hasattr(self, "_output_shape"):
+      output_shape = _convert_nest_from_shapes(self._output_shape)
+    return {
+        "tags": None if self._tags is None else sorted(
+            [self._tags] if isinstance(self._tags, str) else self._tags),
+        "signature": self._signature,
+        "signature_outputs_as_dict": self._signature_outputs_as_dict,
+        "output_key": self._output_key,
+        "arguments": self._arguments,
+        "output_shape": output_shape,
+    }
+
+  def _save_traced_calls(self):
+    """Traces and caches the calls of this layer, if requested and missing."""
+    if not self._traced_call_signatures or self._traced_calls is not None:
+      return
+    with tf.init_scope():
+      if not tf.executing_eagerly():
+        raise ValueError("hub.KerasLayer(..., traced_call_signatures=) "
+                         "requires eager mode.")
+      trace_cache.save(self._traced_calls_path, self._func,
+                       lambda inputs: self.call(inputs, training=False),
+                       self._traced_call_signatures, self._module_path)
+
+  def _quantize_variables(self):
+    """Quantizes the weights of this layer, if requested."""
+    if not self._quantize:
+      return
+    with tf.init_scope():
+      if not tf.executing_eagerly():
+        raise ValueError("hub.KerasLayer(..., quantize=) requires eager mode.")
+      quantized, _ = quantization.quantize(
+          self.weights, self._quantize,
+          lambda inputs: self._run_model(inputs, training=False),
+          self._quantize_sample)
+      self._quantized_variables = data_structures.NoDependency(quantized)
+      # The sample is not needed anymore.
+      self._quantize_sample = None
+
+  @property
+  def quantization_report(self):
+    """A QuantizationReport if quantize was set and the model is loaded.
+
+    It has the number of quantized variables, the bytes of their float32
+    values and of their compact copies, the bytes saved, and the max and
+    mean absolute difference of the outputs for `quantize_sample` (None
+    without a sample). Variables that got their float32 values back, see
+    tensorflow_hub/quantization.py, are not counted.
+    """
+    if self._quantized_variables is None:
+      return None
+    return self._quantized_variables.report
+
+  def _check_not_quantized(self, what):
+    if self._quantized_variables is not None:
+      raise ValueError(
+          "%s is unsupported for a hub.KerasLayer with quantize=%r: the "
+          "float32 values of its quantized weights are freed." %
+          (what, self._quantize))
+
+  def get_weights(self):
+    self._check_not_quantized("get_weights()")
+    return super().get_weights()
+
+  def save_own_variables(self, store):
+    self._check_not_quantized("Saving the weights")
+    super().save_own_variables(store)
+
+  def _trackable_children(self, save_type="checkpoint", **kwargs):
+    # Covers tf.train.Checkpoint, Model.save_weights() and SavedModels.
+    self._check_not_quantized("Saving or checkpointing")
+    return super()._trackable_children(save_type, **kwargs)
 
+  def _run_warmup(self):
+    """Runs the warmup specs passed to the constructor, if any."""
+    if self._warmup and self._warmup is not True:
+      with tf.init_scope():
+        if not tf.executing_eagerly():
+          raise ValueError("hub.KerasLayer(..., warmup=) requires eager mode.")
+        # Calling self.call() directly covers the same path as serving
+        # without re-entering Keras' __call__() and build().
+        if self._traced_calls is not None:
+          signature = self._traced_call_signatures[0]
+        else:
+          signature = warmup_lib.input_signature(self._callable)
+        warmup_lib.warm_up(lambda inputs: self.call(inputs, training=False),
+                           self._warmup, signature)
+    self._is_warm = bool(self._warmup)
+
+  @property
+  def is_warm(self):
+    """Whether the warmup passed to the constructor has run."""
+    return self._is_warm
+
+  def build(self, input_shape):
+    self._ensure_loaded()
+    super().build(input_shape)
+
+  def _add_weights_and_losses(self):
+    """Adds the weights and losses of the callable object to this layer."""
     # Add trainable and non-trainable weights from the callable.
     if hasattr(self._func, "trainable_variables"):
-      for v in self._func.trainable_variables:
-        self._add_existing_weight(v, trainable=True)
-      trainable_variables = {id(v) for v in self._func.trainable_variables}
+      trainable_weights = list(self._func.trainable_variables)
     else:
-      trainable_variables = set()
-    if hasattr(self._func, "variables"):
-      for v in self._func.variables:
-        if id(v) not in trainable_variables:
-          self._add_existing_weight(v, trainable=False)
+      trainable_weights = []
+    trainable_ids = {id(v) for v in trainable_weights}
+    non_trainable_weights = [
+        v for v in getattr(self._func, "variables", ())
+        if id(v) not in trainable_ids]
+    with tf.init_scope():
+      executing_eagerly = tf.executing_eagerly()
+    if (executing_eagerly and
+        isinstance(self._func, trackable_base.Trackable)):
+      # The callable object already tracks its variables for checkpoints,
+      # so they only need to be listed as weights. This is what add_weight()
+      # amounts to in eager mode, minus a checkpoint dependency and a getter
+      # per variable, which are slow for models with many variables.
+      self._trainable_weights.extend(trainable_weights)
+      self._non_trainable_weights.extend(non_trainable_weights)
+    else:
+      # In graph mode, add_weight() also tracks the variables for Keras'
+      # session to initialize them.
+      for v in trainable_weights:
+        self._add_existing_weight(v, trainable=True)
+      for v in non_trainable_weights:
+        self._add_existing_weight(v, trainable=False)
 
     # Forward the callable's regularization losses (if any).
     if hasattr(self._func, "regularization_losses"):
@@ -221,6 +577,224 @@ class KerasLayer(keras.layers.Layer):
     return lambda: loss() if self.trainable else 0.
 
   def call(self, inputs, training=None):
+    if instrumentation.is_enabled():
+      return instrumentation.record_call(
+          self._instrumentation_key(),
+          lambda: self._call(inputs, training), inputs)
+    return self._call(inputs, training)
+
+  def _instrumentation_key(self):
+    handle = self._handle
+    if not isinstance(handle, str):
+      handle = "<%s>" % type(handle).__name__
+    return (handle, self._signature)
+
+  def _call(self, inputs, training):
+    """Implements call(), without instrumentation."""
+    if self._max_batch_size and tf.executing_eagerly():
+      batch_size = _batch_size(inputs)
+      if batch_size is not None and batch_size > self._max_batch_size:
+        outputs = list(self._iter_chunk_outputs(
+            inputs, batch_size, self._call_unchunked, training))
+        return _concat_outputs(outputs)
+    return self._call_unchunked(inputs, training)
+
+  def _iter_chunk_outputs(self, inputs, batch_size, call_fn, training):
+    """Yields call_fn(chunk, training) for the chunks of `inputs`."""
+    starts = range(0, batch_size, self._max_batch_size or batch_size)
+    def chunk(start):
+      return tf.nest.map_structure(
+          lambda x: x[start:start + self._max_batch_size]
+          if _has_batch_dimension(x) else x, inputs)
+    if self._max_batch_parallelism == 1:
+      for start in starts:
+        yield call_fn(chunk(start), training)
+      return
+    # At most max_batch_parallelism chunks are submitted but not yielded yet.
+    with futures.ThreadPoolExecutor(self._max_batch_parallelism) as executor:
+      pending = collections.deque()
+      for start in starts:
+        if len(pending) == self._max_batch_parallelism:
+          yield pending.popleft().result()
+        pending.append(executor.submit(call_fn, chunk(start), training))
+      while pending:
+        yield pending.popleft().result()
+
+  def stream(self, inputs, training=None):
+    """Yields the outputs of this layer for consecutive chunks of `inputs`.
+
+    Like calling this layer with `max_batch_size`, but the outputs of each
+    chunk are yielded as they become available, instead of concatenated.
+    The inputs are sliced before they are converted to tensors, so a large
+    numpy array is never copied as a whole. Requires eager mode.
+
+    Args:
+      inputs: The inputs of this layer, whose tensors (or arrays) all have
+        the same batch size.
+      training: Optional. The `training` argument of the calls.
+
+    Yields:
+      The outputs of the chunks of at most `max_batch_size` rows, or the
+      outputs of all `inputs` at once if `max_batch_size` is not set.
+
+    Raises:
+      ValueError: if not in eager mode or the batch sizes of the inputs
+        differ.
+    """
+    if not tf.executing_eagerly():
+      raise ValueError("hub.KerasLayer.stream() requires eager mode.")
+    batch_size = _batch_size(inputs)
+    if batch_size is None:
+      yield self(inputs, training=training)
+      return
+    for outputs in self._iter_chunk_outputs(
+        inputs, batch_size,
+        lambda chunk, training: self(chunk, training=training), training):
+      yield outputs
+
+  def _call_unchunked(self, inputs, training):
+    """Implements call() for one chunk of the inputs."""
+    if (self._output_cache is not None and not self.trainable and
+        tf.executing_eagerly()):
+      return self._call_with_output_cache(inputs, training)
+    return self._call_model(inputs, training)
+
+  def _call_model(self, inputs, training):
+    """Runs the model on `inputs`, see call()."""
+    if self._quantized_variables is not None:
+      if self.trainable:
+        raise ValueError(
+            "Setting hub.KerasLayer.trainable = True is unsupported when "
+            "using quantize.")
+      return self._quantized_variables.call(inputs)
+    return self._run_model(inputs, training)
+
+  def _run_model(self, inputs, training):
+    if self._traced_calls is not None:
+      return self._call_traced(inputs)
+    if self._jit_compile and tf.executing_eagerly():
+      return self._call_jit(inputs, training)
+    if self._compile_eager_call and tf.executing_eagerly():
+      return self._call_compiled(inputs, training)
+    return self._call_uncompiled(inputs, training)
+
+  def _call_with_output_cache(self, inputs, training):
+    """Runs the model only on the rows of `inputs` not in the output cache."""
+    if self._output_cache_namespace is None:
+      sha1 = hashlib.sha1(
+          json.dumps(self._call_config(), sort_keys=True).encode("utf8"))
+      tf_utils.update_hash_with_saved_model(
+          sha1, module_v2.resolve(self._handle))
+      self._output_cache_namespace = sha1.hexdigest()
+    namespace = self._output_cache_namespace
+    flat_inputs = [tf.convert_to_tensor(x) for x in tf.nest.flatten(inputs)]
+    keys = output_cache_lib.row_keys(namespace,
+                                     [x.numpy() for x in flat_inputs])
+    if not keys:
+      return self._call_model(inputs, training)
+    values = self._output_cache.lookup(namespace, keys)
+    misses = [i for i, value in enumerate(values) if value is None]
+    if misses:
+      miss_inputs = tf.nest.pack_sequence_as(
+          inputs, [tf.gather(x, misses) for x in flat_inputs])
+      outputs = self._call_model(miss_inputs, training)
+      if not isinstance(outputs, tf.Tensor):
+        raise ValueError("hub.KerasLayer(..., output_cache=) requires a "
+                         "single output tensor, got %s." % (outputs,))
+      # Copies the rows, so that cached rows do not keep the whole batch
+      # in memory.
+      rows = [np.array(row) for row in outputs.numpy()]
+      if len(misses) == len(values):
+        self._output_cache.insert(namespace, keys, rows)
+        return outputs
+      self._output_cache.insert(namespace, [keys[i] for i in misses], rows)
+      for i, row in zip(misses, rows):
+        values[i] = row
+    return tf.constant(np.stack(values))
+
+  def _call_compiled(self, inputs, training):
+    """Calls a concrete function of _call_uncompiled() for `inputs`."""
+    trainable = self.trainable
+    if trainable and training is None:
+      training = keras.backend.learning_phase()
+    # Resolving `training` to a Python bool here (as call() does for a layer
+    # that is not trainable) traces the branches separately.
+    training = bool(training) if trainable else False
+    inputs = tf.nest.map_structure(
+        lambda x: x if tf.is_tensor(x) else tf.convert_to_tensor(x), inputs)
+    specs = tf.nest.map_structure(tf_utils.relaxed_batch_spec, inputs)
+    key = (training, trainable, tf_utils.spec_key(specs))
+    entry = self._compiled_calls.get(key)
+    if entry is None:
+      entry = (self._find_compiled_call(training, trainable, specs) or
+               self._compile_call(training, trainable, specs))
+      self._compiled_calls[key] = entry
+      # Inputs with ever new shapes must not keep all their functions alive.
+      if len(self._compiled_calls) > _MAX_COMPILED_CALLS:
+        self._compiled_calls.popitem(last=False)
+    else:
+      self._compiled_calls.move_to_end(key)
+    # Calling the concrete function directly skips the dispatch of
+    # tf.function, which costs more than the rest of the call for small
+    # models.
+    return entry.function(inputs)
+
+  def _find_compiled_call(self, training, trainable, specs):
+    """Returns a compiled call whose input specs accept `specs`, or None."""
+    for (other_training, other_trainable, _), entry in reversed(
+        self._compiled_calls.items()):
+      if (other_training == training and other_trainable == trainable and
+          _specs_compatible(entry.specs, specs)):
+        return entry
+    return None
+
+  def _compile_call(self, training, trainable, specs):
+    """Traces _call_uncompiled() for `specs` and returns a _CompiledCall.
+
+    Like tf.function(reduce_retracing=True), inputs that differ from those of
+    an earlier call in more than the batch size are traced for the most
+    specific specs that accept both, if the model can be called with them.
+    """
+    # Autograph is not needed: all Python control flow in the traced code
+    # depends on Python values only.
+    function = tf.function(lambda x: self._call_uncompiled(x, training),
+                           autograph=False)
+    for (other_training, other_trainable, _), entry in reversed(
+        self._compiled_calls.items()):
+      if other_training != training or other_trainable != trainable:
+        continue
+      general_specs = _common_supertype(entry.specs, specs)
+      if general_specs is None:
+        continue
+      try:
+        return _CompiledCall(general_specs,
+                             function.get_concrete_function(general_specs))
+      except (TypeError, ValueError):
+        # E.g., the model only accepts the original shapes.
+        break
+    return _CompiledCall(specs, function.get_concrete_function(specs))
+
+  def _call_jit(self, inputs, training):
+    """Calls _call_uncompiled() through XLA-compiled functions."""
+    trainable = self.trainable
+    if trainable and training is None:
+      training = keras.backend.learning_phase()
+    training = bool(training) if trainable else False
+    key = (training, trainable)
+    jit_call = self._jit_calls.get(key)
+    if jit_call is None:
+      jit_call = jit_compilation.jit_compile(
+          lambda x: self._call_uncompiled(x, training))
+      self._jit_calls[key] = jit_call
+    return jit_call(inputs)
+
+  @property
+  def jit_compile_stats(self):
+    """A list of jit_compilation.BucketStats of the XLA-compiled calls."""
+    return [stats for jit_call in self._jit_calls.values()
+            for stats in jit_call.stats]
+
+  def _call_uncompiled(self, inputs, training):
     # These checks happen here and not in __init__, because self.trainable is
     # a mutable public attribute.
     self._check_trainability()
@@ -265,6 +839,19 @@ class KerasLayer(keras.layers.Layer):
     result = self._apply_output_shape_if_set(inputs, result)
     return result
 
+  def _call_traced(self, inputs):
+    """Calls the cached traced function that matches `inputs`."""
+    if self.trainable:
+      raise ValueError(
+          "Setting hub.KerasLayer.trainable = True is unsupported when "
+          "using traced_call_signatures.")
+    call = trace_cache.find_call(self._traced_calls, inputs)
+    if call is None:
+      raise ValueError(
+          "hub.KerasLayer inputs %s match none of the traced_call_signatures "
+          "%s." % (inputs, self._traced_call_signatures))
+    return call(inputs)
+
   def _check_trainability(self):
     """Raises or logs errors for unuspported uses of trainable=True."""
     if not self.trainable: return  # Nothing to do.
@@ -335,14 +922,16 @@ class KerasLayer(keras.layers.Layer):
   def get_config(self):
     """Returns a serializable dict of keras layer configuration parameters."""
     config = super().get_config()
-    if not isinstance(self._handle, str):
+    # Futures from hub.load_async() know the handle they are loading.
+    handle = getattr(self._handle, "handle", self._handle)
+    if not isinstance(handle, str):
       # Need to raise this type in order for tf.saved_model.save() to fall back
       # to not using config, instead of crashing.
       raise NotImplementedError(
           "Can only generate a valid config for `hub.KerasLayer(handle, ...)`"
           "that uses a string `handle`.\n\n"
           "Got `type(handle)`: {}".format(type(self._handle)))
-    config["handle"] = self._handle
+    config["handle"] = handle
 
     if hasattr(self, "_output_shape"):
       output_shape = _convert_nest_from_shapes(self._output_shape)
@@ -371,6 +960,32 @@ class KerasLayer(keras.layers.Layer):
       config["output_key"] = self._output_key
     if self._signature_outputs_as_dict:
       config["signature_outputs_as_dict"] = self._signature_outputs_as_dict
+    if self._share_loaded_object:
+      config["share_loaded_object"] = self._share_loaded_object
+    if self._mmap_variables:
+      config["mmap_variables"] = self._mmap_variables
+    if self._prune_unused_signatures:
+      config["prune_unused_signatures"] = self._prune_unused_signatures
+    if self._convert_to_tf2:
+      config["convert_to_tf2"] = self._convert_to_tf2
+    if self._lazy:
+      config["lazy"] = self._lazy
+    if self._compile_eager_call:
+      config["compile_eager_call"] = self._compile_eager_call
+    if self._quantize:
+      config["quantize"] = self._quantize
+    if self._jit_compile:
+      config["jit_compile"] = self._jit_compile
+    if self._max_batch_size:
+      config["max_batch_size"] = self._max_batch_size
+    if self._max_batch_parallelism != 1:
+      config["max_batch_parallelism"] = self._max_batch_parallelism
+    if self._warmup:
+      try:
+        json.dumps(self._warmup)
+        config["warmup"] = self._warmup
+      except TypeError:
+        pass  # Tensors and TensorSpecs are not restored from the config.
 
     # self._load_options is not stored in the config. Instead, the load
     # options passed at the time when this layer gets reloaded from its config
@@ -378,12 +993,17 @@ class KerasLayer(keras.layers.Layer):
     # load option available at this time (July 2020) is
     # `experimental_io_device`, which relates to the loading environment,
     # and not to the interpretation of the loaded SavedModel.
+    #
+    # self._traced_call_signatures is not stored in the config either, because
+    # TensorSpecs are not JSON-serializable. Nor is self._output_cache, which
+    # holds state shared with other layers.
 
     return config
 
   @property
   def resolved_object(self):
-    """Returns the callable object to which `handle` resolved in `__init__`."""
+    """Returns the callable object to which `handle` resolved."""
+    self._ensure_loaded()
     return self._func
 
   def compute_output_shape(self, input_shape):
@@ -408,6 +1028,59 @@ class KerasLayer(keras.layers.Layer):
     return super(KerasLayer, self).compute_output_shape(input_shape)
 
 
+_CompiledCall = collections.namedtuple("_CompiledCall", ["specs", "function"])
+
+
+def _specs_compatible(specs, other_specs):
+  """Returns whether inputs with `other_specs` can be passed for `specs`."""
+  try:
+    tf.nest.assert_same_structure(specs, other_specs)
+  except (TypeError, ValueError):
+    return False
+  return all(spec.is_compatible_with(other) for spec, other in
+             zip(tf.nest.flatten(specs), tf.nest.flatten(other_specs)))
+
+
+def _common_supertype(specs, other_specs):
+  """Returns the most specific specs that accept both, or None."""
+  try:
+    tf.nest.assert_same_structure(specs, other_specs)
+  except (TypeError, ValueError):
+    return None
+  supertypes = [spec.most_specific_common_supertype([other]) for spec, other
+                in zip(tf.nest.flatten(specs), tf.nest.flatten(other_specs))]
+  if any(supertype is None for supertype in supertypes):
+    return None
+  return tf.nest.pack_sequence_as(specs, supertypes)
+
+
+def _has_batch_dimension(x):
+  shape = getattr(x, "shape", None)
+  return shape is not None and len(shape) > 0
+
+
+def _batch_size(inputs):
+  """Returns the common batch size of the tensors in `inputs`, or None."""
+  batch_sizes = set(x.shape[0] for x in tf.nest.flatten(inputs)
+                    if _has_batch_dimension(x))
+  if not batch_sizes:
+    return None
+  if len(batch_sizes) > 1:
+    raise ValueError("max_batch_size requires inputs with the same batch "
+                     "size, got %s." % sorted(batch_sizes))
+  return batch_sizes.pop()
+
+
+def _concat_outputs(outputs):
+  """Concatenates the outputs of consecutive chunks along the batch."""
+  def concat(*values):
+    if not all(_has_batch_dimension(x) for x in values):
+      raise ValueError("max_batch_size requires outputs with a batch "
+                       "dimension.")
+    return tf.concat(values, axis=0)
+  return tf.nest.map_structure(concat, *outputs)
+
+
 def _convert_nest_to_shapes(x):
   """In a nest, converts raw tuples/lists of int or None to tf.TensorShape."""
   # A dict is certainly a container and not a shape. We need to handle
@@ -435,7 +1108,14 @@ def _convert_nest_from_shapes(x):
   return tf.nest.map_structure(_shape_as_tuple, x)
 
 
-def load_module(handle, tags=None, load_options=None):
+def load_module(handle,
+                tags=None,
+                load_options=None,
+                share_loaded_object=False,
+                mmap_variables=False,
+                prune_to_signature=None,
+                convert_to_tf2=False,
+                warmup=False):
   if callable(handle):
     if tags is not None:
       raise ValueError("Passing a callable handle is mutually exclusive "
@@ -443,7 +1123,22 @@ def load_module(handle, tags=None, load_options=None):
     if load_options is not None:
       raise ValueError("Passing a callable handle is mutually exclusive "
                        "with setting load_options.")
+    if (share_loaded_object or mmap_variables or prune_to_signature or
+        convert_to_tf2 or warmup):
+      raise ValueError("Passing a callable handle is mutually exclusive "
+                       "with setting share_loaded_object, mmap_variables, "
+                       "prune_unused_signatures, convert_to_tf2 or "
+                       "warmup=True.")
     return handle
+  elif isinstance(handle, futures.Future):
+    if (tags is not None or load_options is not None or share_loaded_object or
+        mmap_variables or prune_to_signature or convert_to_tf2 or warmup):
+      raise ValueError("Passing a future from hub.load_async() is mutually "
+                       "exclusive with setting tags, load_options, "
+                       "share_loaded_object, mmap_variables, "
+                       "prune_unused_signatures, convert_to_tf2 or "
+                       "warmup=True; pass them to hub.load_async() instead.")
+    return handle.result()
   else:
     try:
       # pylint: disable=g-import-not-at-top
@@ -463,7 +1158,12 @@ def load_module(handle, tags=None, load_options=None):
           set_load_options = load_options or load_context.get_load_options()
         except ImportError:  # Expected before TF2.4.
           set_load_options = load_options
-    return module_v2.load(handle, tags=tags, options=set_load_options)
+    return module_v2.load(handle, tags=tags, options=set_load_options,
+                          share_loaded_object=share_loaded_object,
+                          mmap_variables=mmap_variables,
+                          prune_to_signature=prune_to_signature,
+                          convert_to_tf2=convert_to_tf2,
+                          warmup=warmup or None)
 
 
 def func_has_training_argument(func):
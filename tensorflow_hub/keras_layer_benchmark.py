@@ -0,0 +1,124 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks the per-call overhead of hub.KerasLayer in eager mode.
+
+Also benchmarks constructing a hub.KerasLayer over the number of variables,
+comparing how it registers them as weights in bulk with calling
+add_weight() per variable.
+
+Run with `python -m tensorflow_hub.keras_layer_benchmark`.
+"""
+
+import os
+import tempfile
+import time
+
+import tensorflow as tf
+import tensorflow_hub as hub
+from tensorflow_hub import keras_layer
+
+_ITERS = 1000
+_ROUNDS = 5
+_WARMUP_ITERS = 10
+_NUM_VARIABLES = (100, 1000, 10000)
+
+
+def _save_small_model(export_dir):
+  """Saves a model with little compute, so the call overhead dominates."""
+  obj = tf.train.Checkpoint()
+  obj.w = tf.Variable(tf.ones([8, 8]))
+  obj.__call__ = tf.function(
+      lambda x, training=False: tf.matmul(x, obj.w),
+      input_signature=[tf.TensorSpec([None, 8]),
+                       tf.TensorSpec([], tf.bool)])
+  obj.variables = [obj.w]
+  tf.saved_model.save(obj, export_dir)
+
+
+class _ManyVariables(tf.Module):
+  """A callable object with many small variables, like per-bucket tables."""
+
+  def __init__(self, num_variables):
+    super().__init__()
+    self.tables = [tf.Variable(tf.zeros([4]), name="table_%d" % i)
+                   for i in range(num_variables)]
+
+  def __call__(self, x):
+    return x + self.tables[0]
+
+
+def _add_weights_one_by_one(obj):
+  """Registers the variables of `obj` like hub.KerasLayer used to."""
+  layer = keras_layer.keras.layers.Layer()
+  for v in obj.trainable_variables:
+    layer.add_weight(name=v.name, shape=v.shape, dtype=v.dtype,
+                     trainable=True, experimental_autocast=False,
+                     getter=lambda *_, v=v, **__: v)
+  return layer
+
+
+class KerasLayerBenchmark(tf.test.Benchmark):
+  """Compares calls of the loaded object with calls of the layer."""
+
+  def _run(self, name, fn, inputs):
+    for _ in range(_WARMUP_ITERS):
+      fn(inputs)
+    # The fastest round is the least disturbed by other load on the machine.
+    wall_time = float("inf")
+    for _ in range(_ROUNDS):
+      start = time.perf_counter()
+      for _ in range(_ITERS):
+        fn(inputs)
+      wall_time = min(wall_time, (time.perf_counter() - start) / _ITERS)
+    self.report_benchmark(name=name, iters=_ITERS, wall_time=wall_time,
+                          extras={"us_per_call": wall_time * 1e6})
+
+  def benchmark_call_overhead(self):
+    export_dir = os.path.join(tempfile.mkdtemp(), "model")
+    _save_small_model(export_dir)
+    inputs = tf.ones([1, 8])
+    obj = hub.load(export_dir)
+    self._run("raw_callable", obj, inputs)
+    self._run("keras_layer", hub.KerasLayer(export_dir), inputs)
+    self._run("keras_layer_call", hub.KerasLayer(export_dir).call, inputs)
+    self._run("keras_layer_compiled",
+              hub.KerasLayer(export_dir, compile_eager_call=True), inputs)
+    self._run("keras_layer_compiled_call",
+              hub.KerasLayer(export_dir, compile_eager_call=True).call,
+              inputs)
+
+  def _run_construction(self, name, num_variables, fn):
+    wall_time = float("inf")
+    for _ in range(_ROUNDS):
+      start = time.perf_counter()
+      fn()
+      wall_time = min(wall_time, time.perf_counter() - start)
+    self.report_benchmark(
+        name="%s_%d_variables" % (name, num_variables), iters=1,
+        wall_time=wall_time,
+        extras={"us_per_variable": wall_time * 1e6 / num_variables})
+
+  def benchmark_construction(self):
+    for num_variables in _NUM_VARIABLES:
+      obj = _ManyVariables(num_variables)
+      self._run_construction("keras_layer_construction", num_variables,
+                             lambda: hub.KerasLayer(obj, trainable=True))
+      self._run_construction("add_weight_per_variable", num_variables,
+                             lambda: _add_weights_one_by_one(obj))
+
+
+if __name__ == "__main__":
+  KerasLayerBenchmark().benchmark_call_overhead()
+  KerasLayerBenchmark().benchmark_construction()
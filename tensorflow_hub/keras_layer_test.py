@@ -16,11 +16,14 @@
 
 import json
 import os
+from unittest import mock
 
 from absl.testing import parameterized
 import numpy as np
 import tensorflow as tf
 import tensorflow_hub as hub
+from tensorflow_hub import keras_layer
+from tensorflow_hub import module_v2
 
 # pylint: disable=g-import-not-at-top
 # Use Keras 2.
@@ -133,6 +136,17 @@ def _save_2d_text_embedding(export_dir, save_from_keras=False):
   tf.saved_model.save(obj, export_dir)
 
 
+def _save_dense_model(export_dir):
+  """Writes SavedModel to compute y = x*w, with w of shape [64, 32]."""
+  obj = tf.train.Checkpoint()
+  obj.kernel = tf.Variable(
+      np.random.RandomState(0).normal(size=[64, 32]).astype(np.float32))
+  obj.__call__ = tf.function(lambda x: tf.matmul(x, obj.kernel),
+                             input_signature=[tf.TensorSpec([None, 64])])
+  obj.variables = [obj.kernel]
+  tf.saved_model.save(obj, export_dir)
+
+
 def _tensors_names_set(tensor_sequence):
   """Converts tensor sequence to a set of tensor references."""
   # Tensor name stands as a proxy for the uniqueness of the tensors.
@@ -809,6 +823,287 @@ class KerasLayerTest(tf.test.TestCase, parameterized.TestCase):
       layer([[10.]])
       layer([[10.]])
 
+  def test_keras_layer_share_loaded_object(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    layer1 = hub.KerasLayer(export_dir, share_loaded_object=True)
+    layer2 = hub.KerasLayer(export_dir, share_loaded_object=True)
+    layer3 = hub.KerasLayer(export_dir, trainable=True)
+    self.assertIs(layer1.resolved_object, layer2.resolved_object)
+    self.assertIsNot(layer1.resolved_object, layer3.resolved_object)
+    self.assertEqual(layer1(np.array([[10.]], dtype=np.float32)), [[6.]])
+
+    config = layer1.get_config()
+    self.assertTrue(config["share_loaded_object"])
+    new_layer = hub.KerasLayer.from_config(_json_cycle(config))
+    self.assertIs(new_layer.resolved_object, layer1.resolved_object)
+
+  def test_keras_layer_mmap_variables(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    layer = hub.KerasLayer(export_dir, mmap_variables=True)
+    self.assertEqual(layer(np.array([[10.]], dtype=np.float32)), [[6.]])
+    self.assertTrue(tf.io.gfile.exists(export_dir + ".variables.mmap"))
+    config = layer.get_config()
+    self.assertTrue(config["mmap_variables"])
+
+  def test_keras_layer_lazy(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    with mock.patch.object(module_v2, "load",
+                           side_effect=module_v2.load) as load:
+      layer = hub.KerasLayer(export_dir, trainable=True, lazy=True)
+      self.assertEqual(load.call_count, 0)
+      self.assertEmpty(layer.weights)
+      inp = tf_keras_v2.layers.Input(shape=(1,), dtype=tf.float32)
+      model = tf_keras_v2.Model(inp, layer(inp))
+      self.assertEqual(load.call_count, 1)
+    self.assertAllEqual(model(np.array([[10.]], dtype=np.float32)), [[6.]])
+    self.assertLen(model.trainable_weights, 1)
+    self.assertLen(model.non_trainable_weights, 2)
+    self.assertTrue(layer.get_config()["lazy"])
+
+  def test_keras_layer_lazy_fails_on_build(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    layer = hub.KerasLayer(export_dir, signature="unknown", output_key="y",
+                           lazy=True)
+    with self.assertRaisesRegex(ValueError, "Unknown signature"):
+      layer(np.array([[10.]], dtype=np.float32))
+
+  def test_keras_layer_from_load_async(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    loads = hub.load_async([export_dir])
+    layer = hub.KerasLayer(loads[export_dir])
+    self.assertEqual(layer(np.array([[10.]], dtype=np.float32)), [[6.]])
+    self.assertTrue(loads.ready())
+    self.assertEqual(layer.get_config()["handle"], export_dir)
+
+  def test_keras_layer_warmup(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    with mock.patch.object(hub.KerasLayer, "call", autospec=True,
+                           side_effect=hub.KerasLayer.call) as call:
+      layer = hub.KerasLayer(export_dir, warmup=[1, 8])
+    self.assertTrue(layer.is_warm)
+    self.assertEqual([args[1].shape for args, _ in call.call_args_list],
+                     [[1, 1], [8, 1]])
+    self.assertEqual(layer.get_config()["warmup"], [1, 8])
+    self.assertFalse(hub.KerasLayer(export_dir).is_warm)
+
+  def test_keras_layer_lazy_warmup(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    layer = hub.KerasLayer(
+        export_dir, lazy=True,
+        warmup=[tf.TensorSpec([2, 1]), np.array([[10.]], dtype=np.float32)])
+    self.assertFalse(layer.is_warm)
+    inp = tf_keras_v2.layers.Input(shape=(1,), dtype=tf.float32)
+    model = tf_keras_v2.Model(inp, layer(inp))
+    self.assertTrue(layer.is_warm)
+    self.assertNotIn("warmup", layer.get_config())
+    self.assertAllEqual(model(np.array([[10.]], dtype=np.float32)), [[6.]])
+
+  def test_keras_layer_traced_call_signatures(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    signatures = [tf.TensorSpec([None, 1])]
+    with mock.patch.dict(os.environ, {"TFHUB_CACHE_DIR": cache_dir}):
+      layer = hub.KerasLayer(export_dir, traced_call_signatures=signatures)
+      self.assertAllEqual(layer(np.array([[10.]], dtype=np.float32)), [[6.]])
+      with mock.patch.object(module_v2, "load",
+                             side_effect=AssertionError("loaded again")):
+        layer = hub.KerasLayer(export_dir, traced_call_signatures=signatures,
+                               warmup=[2])
+    self.assertTrue(layer.is_warm)
+    self.assertLen(layer.non_trainable_weights, 3)
+    inp = tf_keras_v2.layers.Input(shape=(1,), dtype=tf.float32)
+    model = tf_keras_v2.Model(inp, layer(inp))
+    self.assertAllEqual(model(np.array([[10.]], dtype=np.float32)), [[6.]])
+    with self.assertRaisesRegex(ValueError, "match none"):
+      layer(np.array([10.], dtype=np.float32))
+    layer.trainable = True
+    with self.assertRaisesRegex(ValueError, "traced_call_signatures"):
+      layer(np.array([[10.]], dtype=np.float32))
+
+  def test_keras_layer_compile_eager_call(self):
+    export_dir = os.path.join(self.get_temp_dir(), "half-plus-one")
+    _save_half_plus_one_model(export_dir)
+    layer = hub.KerasLayer(export_dir, trainable=True, output_shape=[1],
+                           compile_eager_call=True)
+    for batch_size in [1, 2, 3, 4]:
+      self.assertAllEqual(layer(np.full([batch_size, 1], 10., np.float32)),
+                          [[6.]] * batch_size)
+    # Traces once for any batch size.
+    self.assertLen(layer._compiled_calls, 1)
+    with tf.GradientTape() as tape:
+      loss = layer(np.array([[10.]], dtype=np.float32), training=True)
+    self.assertAllEqual(tape.gradient(loss, layer.trainable_weights), [[[10.]]])
+    layer.trainable = False
+    self.assertAllEqual(layer(np.array([[10.]], dtype=np.float32)), [[6.]])
+    self.assertLen(layer._compiled_calls, 3)
+    self.assertTrue(layer.get_config()["compile_eager_call"])
+
+  def test_keras_layer_compile_eager_call_generalizes_shapes(self):
+
+    class Total(tf.Module):
+
+      @tf.function
+      def __call__(self, x):
+        if isinstance(x, dict):
+          return {k: tf.reduce_sum(v, axis=-1) for k, v in x.items()}
+        if isinstance(x, tf.SparseTensor):
+          x = tf.sparse.to_dense(x)
+        return tf.reduce_sum(x, axis=-1)
+
+    layer = hub.KerasLayer(Total(), compile_eager_call=True)
+    for length in range(1, 5):
+      self.assertAllEqual(layer(tf.ones([2, length])), [length] * 2)
+    # The second length is traced for inputs of any length, which the
+    # following ones reuse.
+    self.assertLen(
+        {entry.function for entry in layer._compiled_calls.values()}, 2)
+    self.assertAllEqual(layer({"a": tf.ones([1, 2]), "b": tf.ones([1, 3])}),
+                        {"a": [2.], "b": [3.]})
+    ragged = tf.ragged.constant([[1., 2.], [3.]])
+    self.assertAllEqual(layer(ragged), [3., 3.])
+    sparse = tf.sparse.from_dense([[1., 0.], [0., 2.]])
+    self.assertAllEqual(layer(sparse), [1., 2.])
+    for rank in range(3, 3 + keras_layer._MAX_COMPILED_CALLS):
+      layer(tf.ones([1] * rank))
+    self.assertLen(layer._compiled_calls, keras_layer._MAX_COMPILED_CALLS)
+
+  def test_keras_layer_output_cache(self):
+    export_dir = os.path.join(self.get_temp_dir(), "text-embedding")
+    _save_2d_text_embedding(export_dir)
+    cache = hub.OutputCache()
+    layer = hub.KerasLayer(export_dir, output_cache=cache)
+    model_inputs = []
+    call_model = layer._call_model
+    def _recording_call_model(inputs, training):
+      model_inputs.append(inputs.numpy().tolist())
+      return call_model(inputs, training)
+    layer.__dict__["_call_model"] = _recording_call_model
+    self.assertAllClose(layer(tf.constant([["a"], ["bcd"]])),
+                        [[0.1, 0.3], [0.3, 0.9]])
+    self.assertAllClose(layer(tf.constant([["bcd"], ["ef"], ["a"]])),
+                        [[0.3, 0.9], [0.2, 0.6], [0.1, 0.3]])
+    self.assertEqual(model_inputs, [[[b"a"], [b"bcd"]], [[b"ef"]]])
+    self.assertEqual((cache.hits, cache.misses), (2, 3))
+    # Other layers of the same model share the cached outputs.
+    other_layer = hub.KerasLayer(export_dir, output_cache=cache)
+    self.assertAllClose(other_layer(tf.constant([["ef"]])), [[0.2, 0.6]])
+    self.assertEqual(cache.hits, 3)
+    with self.assertRaisesRegex(ValueError, "trainable=False"):
+      hub.KerasLayer(export_dir, trainable=True, output_cache=cache)
+
+  def test_keras_layer_quantize(self):
+    export_dir = os.path.join(self.get_temp_dir(), "dense")
+    _save_dense_model(export_dir)
+    inputs = np.random.RandomState(1).normal(size=[4, 64]).astype(np.float32)
+    expected = hub.KerasLayer(export_dir)(inputs)
+    layer = hub.KerasLayer(export_dir, quantize="int8", quantize_sample=inputs)
+    report = layer.quantization_report
+    self.assertEqual(report.num_variables, 1)
+    self.assertGreater(report.saved_bytes, 64 * 32 * 2)
+    self.assertLess(report.max_abs_error, 0.2)
+    self.assertAllClose(layer(inputs), expected, atol=0.2)
+    inp = tf_keras_v2.layers.Input(shape=(64,), dtype=tf.float32)
+    model = tf_keras_v2.Model(inp, layer(inp))
+    self.assertAllClose(model.predict(inputs, verbose=0), expected, atol=0.2)
+    self.assertEqual(layer.get_config()["quantize"], "int8")
+    with self.assertRaisesRegex(ValueError, "freed"):
+      layer.get_weights()
+    with self.assertRaisesRegex(ValueError, "freed"):
+      tf.train.Checkpoint(model=model).save(
+          os.path.join(self.get_temp_dir(), "ckpt"))
+    with self.assertRaisesRegex(ValueError, "freed"):
+      model.save_weights(os.path.join(self.get_temp_dir(), "weights"))
+    with self.assertRaisesRegex(ValueError, "trainable=False"):
+      hub.KerasLayer(export_dir, trainable=True, quantize="int8")
+    with self.assertRaisesRegex(ValueError, "must be one of"):
+      hub.KerasLayer(export_dir, quantize="int4")
+
+  def test_keras_layer_jit_compile(self):
+    export_dir = os.path.join(self.get_temp_dir(), "dense")
+    _save_dense_model(export_dir)
+    inputs = np.random.RandomState(1).normal(size=[4, 64]).astype(np.float32)
+    expected = hub.KerasLayer(export_dir)(inputs)
+    layer = hub.KerasLayer(export_dir, jit_compile=True)
+    self.assertAllClose(layer(inputs[:3]), expected[:3], atol=1e-5)
+    self.assertAllClose(layer(inputs), expected, atol=1e-5)
+    stats = layer.jit_compile_stats
+    self.assertLen(stats, 1)
+    self.assertEqual((stats[0].batch_size, stats[0].num_calls), (4, 2))
+    self.assertTrue(layer.get_config()["jit_compile"])
+
+  def test_keras_layer_instrumentation(self):
+    export_dir = os.path.join(self.get_temp_dir(), "dense")
+    _save_dense_model(export_dir)
+    layer = hub.KerasLayer(export_dir)
+    model = tf_keras_v2.Sequential([tf_keras_v2.Input([64]), layer])
+    hub.enable_instrumentation()
+    try:
+      layer(np.zeros([3, 64], np.float32))
+      model.predict(np.zeros([5, 64], np.float32), verbose=0)
+      stats = hub.instrumentation_snapshot()[(export_dir, None)]
+    finally:
+      hub.disable_instrumentation()
+    self.assertEqual(stats.num_calls, 1)
+    self.assertEqual(stats.num_rows, 3)
+    self.assertGreaterEqual(stats.num_traces, 1)
+
+  @parameterized.parameters(1, 3)
+  def test_keras_layer_max_batch_size(self, max_batch_parallelism):
+    export_dir = os.path.join(self.get_temp_dir(), "dense")
+    _save_dense_model(export_dir)
+    inputs = np.random.RandomState(1).normal(size=[10, 64]).astype(np.float32)
+    expected = hub.KerasLayer(export_dir)(inputs)
+    layer = hub.KerasLayer(export_dir, max_batch_size=4,
+                           max_batch_parallelism=max_batch_parallelism)
+    batch_sizes = []
+    call_model = layer._call_model
+    def record_batch_size(x, training):
+      batch_sizes.append(x.shape[0])
+      return call_model(x, training)
+    layer.__dict__["_call_model"] = record_batch_size
+    self.assertAllClose(layer(inputs), expected, atol=1e-5)
+    self.assertCountEqual(batch_sizes, [4, 4, 2])
+    streamed = list(layer.stream(inputs))
+    self.assertEqual([x.shape[0] for x in streamed], [4, 4, 2])
+    self.assertAllClose(tf.concat(streamed, 0), expected, atol=1e-5)
+    self.assertEqual(layer.get_config()["max_batch_size"], 4)
+    with self.assertRaisesRegex(ValueError, "must be positive"):
+      hub.KerasLayer(export_dir, max_batch_size=0)
+
+  def test_keras_layer_max_batch_size_with_dicts(self):
+    layer = hub.KerasLayer(lambda x: {"sum": x["a"] + x["b"]},
+                           max_batch_size=2)
+    outputs = layer({"a": tf.range(5), "b": tf.ones([5], tf.int32)})
+    self.assertAllEqual(outputs["sum"], [1, 2, 3, 4, 5])
+    with self.assertRaisesRegex(ValueError, "same batch size"):
+      layer({"a": tf.range(5), "b": tf.ones([4], tf.int32)})
+
+  def test_keras_layer_weights_are_checkpointed(self):
+    export_dir = os.path.join(self.get_temp_dir(), "dense")
+    _save_dense_model(export_dir)
+    layer = hub.KerasLayer(export_dir)
+    self.assertEmpty(layer.trainable_weights)
+    self.assertLen(layer.non_trainable_weights, 1)
+    layer.weights[0].assign(tf.ones([64, 32]))
+    checkpoint_path = tf.train.Checkpoint(layer=layer).save(
+        os.path.join(self.get_temp_dir(), "ckpt"))
+    restored = hub.KerasLayer(export_dir)
+    tf.train.Checkpoint(layer=restored).restore(
+        checkpoint_path).assert_existing_objects_matched()
+    self.assertAllEqual(restored.weights[0], tf.ones([64, 32]))
+
+  def test_keras_layer_fails_if_callable_with_share_loaded_object(self):
+    with self.assertRaisesRegex(ValueError, "share_loaded_object"):
+      hub.KerasLayer(lambda x: x, share_loaded_object=True)
+
 
 if __name__ == "__main__":
   # In TF 1.15.x, we need to enable V2-like behavior, notably eager execution.
@@ -0,0 +1,104 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Proxies for models that are loaded on first use."""
+
+import threading
+
+from tensorflow_hub import inspection
+
+# Attributes of LazyModel itself, which must never be forwarded to the model.
+_OWN_ATTRIBUTES = frozenset(
+    ["_handle", "_tags", "_load_fn", "_lock", "_obj", "_model_info"])
+
+
+class LazyModel(object):
+  """A model that is resolved and loaded when it is first used.
+
+  Returned by hub.load(..., lazy=True). Calling the proxy or accessing any
+  attribute of the loaded object (like `variables` or `signatures`) loads
+  the model, once, even if several threads do that at the same time. Its
+  signatures can be examined before that with `signature_specs`, which only
+  reads the model's metadata.
+  """
+
+  def __init__(self, handle, tags, load_fn):
+    """Creates a proxy.
+
+    Args:
+      handle: The handle of the model, as passed to hub.load().
+      tags: The tags passed to hub.load().
+      load_fn: A function without arguments that loads the model.
+    """
+    self._handle = handle
+    self._tags = tags
+    self._load_fn = load_fn
+    self._lock = threading.Lock()
+    self._obj = None
+    self._model_info = None
+
+  @property
+  def handle(self):
+    return self._handle
+
+  @property
+  def is_loaded(self):
+    """Whether the model has been loaded already."""
+    return self._obj is not None
+
+  @property
+  def model_info(self):
+    """The hub.inspect() result for the model, which does not load it.
+
+    Like hub.inspect(), this reads a model that is already in the cache
+    without any network access, and falls back to resolving the handle if
+    the model's archive index cannot be read.
+    """
+    if self._model_info is None:
+      model_info = inspection.inspect(self._handle)
+      with self._lock:
+        if self._model_info is None:
+          self._model_info = model_info
+    return self._model_info
+
+  @property
+  def signature_specs(self):
+    """The signatures of the model, without loading it.
+
+    Returns:
+      A dict from signature names to dicts with "inputs" and "outputs", as
+      in hub.inspect().
+    """
+    tags = self._tags
+    if tags is None and self.model_info.is_hub_module_v1:
+      tags = []  # Like hub.load().
+    return self.model_info.get_signatures(tags)
+
+  def get(self):
+    """Loads the model, if not done yet, and returns the loaded object."""
+    if self._obj is None:
+      with self._lock:
+        if self._obj is None:
+          self._obj = self._load_fn()
+    return self._obj
+
+  def __call__(self, *args, **kwargs):
+    return self.get()(*args, **kwargs)
+
+  def __getattr__(self, name):
+    # Only called for attributes that LazyModel does not have itself.
+    if name in _OWN_ATTRIBUTES or (name.startswith("__") and
+                                   name.endswith("__")):
+      raise AttributeError(name)
+    return getattr(self.get(), name)
@@ -0,0 +1,110 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.lazy_model."""
+
+from concurrent import futures
+import os
+import urllib.error
+from unittest import mock
+
+import tensorflow as tf
+from tensorflow_hub import archive_index
+from tensorflow_hub import lazy_model
+from tensorflow_hub import module_v2
+from tensorflow_hub import test_utils
+
+
+def _save_plus_one_model(path):
+  obj = tf.Module()
+  obj.b = tf.Variable(1.0)
+
+  @tf.function(input_signature=[tf.TensorSpec([None], tf.float32)])
+  def call(x):
+    return x + obj.b
+
+  obj.__call__ = call
+  tf.saved_model.save(obj, path, signatures={"plus_one": call})
+
+
+class LazyModelTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_plus_one_model(self.model_dir)
+
+  def _patch_load(self):
+    return mock.patch.object(module_v2, "_load_saved_model",
+                             side_effect=module_v2._load_saved_model)
+
+  def testSignatureSpecsDoNotLoad(self):
+    with self._patch_load() as load:
+      obj = module_v2.load(self.model_dir, lazy=True)
+      self.assertIsInstance(obj, lazy_model.LazyModel)
+      specs = obj.signature_specs
+    load.assert_not_called()
+    self.assertFalse(obj.is_loaded)
+    self.assertEqual(specs["plus_one"]["inputs"]["x"].dtype, tf.float32)
+
+  def testSignatureSpecsOfCachedArchiveOffline(self):
+    self.addCleanup(os.chdir, os.getcwd())
+    os.chdir(self.get_temp_dir())
+    port = test_utils.start_http_server()
+    archive_index.write_seekable_archive(self.model_dir, "model.tar.gz")
+    handle = "http://localhost:%d/model.tar.gz" % port
+
+    with mock.patch.dict(
+        os.environ,
+        {"TFHUB_CACHE_DIR": os.path.join(self.get_temp_dir(), "cache")}):
+      module_v2.resolve(handle)
+      offline = urllib.error.URLError("Network is unreachable")
+      with self._patch_load() as load, mock.patch.object(
+          archive_index.HttpRangeReader, "_open", side_effect=offline):
+        obj = module_v2.load(handle, lazy=True)
+        specs = obj.signature_specs
+    load.assert_not_called()
+    self.assertEqual(specs["plus_one"]["inputs"]["x"].dtype, tf.float32)
+
+  def testLoadsOnFirstCall(self):
+    with self._patch_load() as load:
+      obj = module_v2.load(self.model_dir, lazy=True)
+      self.assertAllEqual(obj(tf.constant([1.0])), [2.0])
+      self.assertAllEqual(obj.signatures["plus_one"](x=tf.constant([2.0])),
+                          {"output_0": [3.0]})
+      self.assertEqual(obj.b.numpy(), 1.0)
+    self.assertEqual(load.call_count, 1)
+    self.assertTrue(obj.is_loaded)
+
+  def testLoadsOnceFromManyThreads(self):
+    with self._patch_load() as load:
+      obj = module_v2.load(self.model_dir, lazy=True)
+      with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: obj.get(), range(16)))
+    self.assertEqual(load.call_count, 1)
+    for result in results:
+      self.assertIs(result, results[0])
+
+  def testMissingAttribute(self):
+    obj = module_v2.load(self.model_dir, lazy=True)
+    with self.assertRaises(AttributeError):
+      obj.no_such_attribute  # pylint: disable=pointless-statement
+
+  def testFailsWithReport(self):
+    with self.assertRaisesRegex(ValueError, "return_report"):
+      module_v2.load(self.model_dir, lazy=True, return_report=True)
+
+
+if __name__ == "__main__":
+  tf.test.main()
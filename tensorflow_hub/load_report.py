@@ -0,0 +1,209 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Breaks down the time spent in hub.load() into phases.
+
+The phases of resolving and loading a model are marked with phase(). Each
+phase is annotated with tf.profiler.experimental.Trace, so it shows up in
+TensorBoard traces next to the TensorFlow ops it runs. While a report is
+being recorded in the current thread (see recording()), the phases are also
+timed, and bytes passed to add_bytes() are attributed to the innermost one.
+
+Reports are returned by hub.load(..., return_report=True) and passed to the
+callbacks registered with add_listener().
+"""
+
+import contextlib
+import sys
+import threading
+import time
+
+from absl import logging
+from tensorflow_hub import filesystem
+
+_TRACE_PREFIX = "tfhub/"
+
+_local = threading.local()
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+class Phase(object):
+  """A timed phase of a LoadReport.
+
+  Attributes:
+    name: Name of the phase. Nested phases are named "<outer>/<inner>".
+    start_sec: Start time, relative to the start of the report.
+    duration_sec: Wall time spent in the phase, including nested phases.
+    num_bytes: Number of bytes transferred in the phase (e.g., downloaded,
+      extracted or read), excluding nested phases.
+  """
+
+  def __init__(self, name, start_sec, duration_sec=0.0, num_bytes=0):
+    self.name = name
+    self.start_sec = start_sec
+    self.duration_sec = duration_sec
+    self.num_bytes = num_bytes
+
+  def to_dict(self):
+    return {
+        "name": self.name,
+        "start_sec": self.start_sec,
+        "duration_sec": self.duration_sec,
+        "num_bytes": self.num_bytes,
+    }
+
+
+class LoadReport(object):
+  """Timings and byte counts of resolving and loading one handle.
+
+  Attributes:
+    handle: The loaded handle.
+    phases: List of Phase objects, in the order in which they started.
+    start_time: The time.time() when the load started.
+    total_sec: Wall time of the whole load.
+  """
+
+  def __init__(self, handle):
+    self.handle = handle
+    self.phases = []
+    self.total_sec = 0.0
+    self.start_time = time.time()
+
+  def get(self, name):
+    """Returns the phases with the given name."""
+    return [phase for phase in self.phases if phase.name == name]
+
+  def to_dict(self):
+    """Returns a JSON-serializable representation."""
+    return {
+        "handle": self.handle,
+        "total_sec": self.total_sec,
+        "phases": [phase.to_dict() for phase in self.phases],
+    }
+
+  def __str__(self):
+    lines = ["Loaded %s in %.3f s" % (self.handle, self.total_sec)]
+    for phase in self.phases:
+      line = "  %-40s %9.3f s" % (phase.name, phase.duration_sec)
+      if phase.num_bytes:
+        line += "  %s" % filesystem.bytes_to_readable_str(phase.num_bytes, True)
+      lines.append(line)
+    return "\n".join(lines)
+
+
+def add_listener(callback):
+  """Registers `callback` to be called with the LoadReport of every load."""
+  with _listeners_lock:
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+  """Unregisters a callback registered with add_listener()."""
+  with _listeners_lock:
+    _listeners.remove(callback)
+
+
+def _state():
+  if not hasattr(_local, "report"):
+    _local.report = None
+    _local.phase_stack = []
+  return _local
+
+
+def is_recording():
+  """Returns whether a report is being recorded in the current thread."""
+  return _state().report is not None
+
+
+@contextlib.contextmanager
+def recording(handle, enabled=False):
+  """Records a LoadReport for the current thread, if enabled or listened to.
+
+  Args:
+    handle: The handle being loaded.
+    enabled: Whether to record even if there are no listeners.
+
+  Yields:
+    The LoadReport being recorded, or None if nothing is recorded.
+  """
+  with _listeners_lock:
+    listeners = list(_listeners)
+  state = _state()
+  if not (enabled or listeners) or state.report is not None:
+    yield None
+    return
+  report = LoadReport(handle)
+  state.report, state.phase_stack = report, []
+  try:
+    with _trace("load"):
+      yield report
+  finally:
+    report.total_sec = time.time() - report.start_time
+    state.report, state.phase_stack = None, []
+  for listener in listeners:
+    try:
+      listener(report)
+    except Exception:  # pylint: disable=broad-except
+      logging.exception("LoadReport listener %r failed.", listener)
+
+
+def _trace(name):
+  # Resolving models does not import TensorFlow; without it, there is no
+  # profiler to annotate.
+  tf = sys.modules.get("tensorflow")
+  profiler = getattr(tf, "profiler", None)
+  trace = getattr(getattr(profiler, "experimental", None), "Trace", None)
+  if trace is None:  # Before TF2.2.
+    return contextlib.nullcontext()
+  return trace(_TRACE_PREFIX + name)
+
+
+@contextlib.contextmanager
+def phase(name):
+  """Marks a phase of loading a model; see the module docstring."""
+  state = _state()
+  with _trace(name):
+    if state.report is None:
+      yield
+      return
+    start_time = time.time()
+    if state.phase_stack:
+      name = state.phase_stack[-1].name + "/" + name
+    current = Phase(name, start_time - state.report.start_time)
+    state.report.phases.append(current)
+    state.phase_stack.append(current)
+    try:
+      yield
+    finally:
+      state.phase_stack.pop()
+      current.duration_sec = time.time() - start_time
+
+
+def add_bytes(num_bytes):
+  """Attributes `num_bytes` to the innermost phase being recorded, if any."""
+  state = _state()
+  if state.phase_stack:
+    state.phase_stack[-1].num_bytes += num_bytes
+
+
+def record(name, duration_sec, num_bytes=0):
+  """Records a phase that ran concurrently, e.g. on another thread."""
+  state = _state()
+  if state.report is None:
+    return
+  prefix = state.phase_stack[-1].name + "/" if state.phase_stack else ""
+  start_sec = time.time() - duration_sec - state.report.start_time
+  state.report.phases.append(
+      Phase(prefix + name, start_sec, duration_sec, num_bytes))
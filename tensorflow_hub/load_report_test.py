@@ -0,0 +1,113 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.load_report."""
+
+import os
+import tarfile
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import load_report
+from tensorflow_hub import module_v2
+
+
+def _save_model(path):
+  obj = tf.Module()
+  obj.w = tf.Variable(np.ones(1000, dtype=np.float32))
+
+  @tf.function(input_signature=[])
+  def call():
+    return tf.reduce_sum(obj.w)
+
+  obj.__call__ = call
+  tf.saved_model.save(obj, path)
+
+
+def _dir_size(path):
+  return sum(os.path.getsize(os.path.join(root, name))
+             for root, _, names in os.walk(path) for name in names)
+
+
+class LoadReportTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_model(self.model_dir)
+
+  def testPhasesAreOnlyRecordedWhenEnabled(self):
+    with load_report.recording("handle") as report:
+      self.assertIsNone(report)
+      self.assertFalse(load_report.is_recording())
+      with load_report.phase("outer"):
+        load_report.add_bytes(1)
+
+    with load_report.recording("handle", enabled=True) as report:
+      with load_report.phase("outer"):
+        load_report.add_bytes(1)
+        with load_report.phase("inner"):
+          load_report.add_bytes(2)
+        load_report.record("concurrent", 0.5, 3)
+    self.assertEqual([p.name for p in report.phases],
+                     ["outer", "outer/inner", "outer/concurrent"])
+    self.assertEqual([p.num_bytes for p in report.phases], [1, 2, 3])
+    self.assertGreaterEqual(report.total_sec,
+                            report.get("outer")[0].duration_sec)
+    self.assertIn("outer/inner", str(report))
+
+  def testLoadReturnsReport(self):
+    obj, report = module_v2.load(
+        self.model_dir, prefetch_variables=True, return_report=True)
+    self.assertEqual(obj(), 1000.0)
+    self.assertEqual(report.handle, self.model_dir)
+    names = [p.name for p in report.phases]
+    self.assertEqual(names[:2], ["resolve", "load_saved_model"])
+    self.assertIn("load_saved_model/prefetch_variables", names)
+    self.assertEqual(report.get("load_saved_model")[0].num_bytes,
+                     _dir_size(os.path.join(self.model_dir, "variables")))
+    self.assertEqual(report.to_dict()["phases"][0]["name"], "resolve")
+
+  def testReportsExtractedBytes(self):
+    archive = os.path.join(self.get_temp_dir(), "model.tar")
+    with tarfile.open(archive, "w") as tar:
+      tar.add(self.model_dir, arcname=".")
+    cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    with mock.patch.dict(os.environ, {"TFHUB_CACHE_DIR": cache_dir}):
+      _, report = module_v2.load(archive, return_report=True)
+    download = report.get("resolve/download")
+    self.assertLen(download, 1)
+    self.assertEqual(download[0].num_bytes, _dir_size(self.model_dir))
+
+  def testListenersReceiveReports(self):
+    reports = []
+
+    def failing_listener(unused_report):
+      raise RuntimeError("ignored")
+
+    load_report.add_listener(failing_listener)
+    load_report.add_listener(reports.append)
+    try:
+      module_v2.load(self.model_dir)
+    finally:
+      load_report.remove_listener(failing_listener)
+      load_report.remove_listener(reports.append)
+    module_v2.load(self.model_dir)
+    self.assertLen(reports, 1)
+    self.assertEqual(reports[0].handle, self.model_dir)
+
+
+if __name__ == "__main__":
+  tf.test.main()
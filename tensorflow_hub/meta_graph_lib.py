@@ -80,6 +80,30 @@ def mark_backward(output_tensor):
   return used_node_names
 
 
+def mark_backward_from_ops(ops):
+  """Like mark_backward(), but starts from ops, which may have no outputs.
+
+  Unlike mark_backward(), this follows control inputs transitively, as
+  needed for ops like grouped initializers.
+
+  Args:
+    ops: An iterable of Operations from which we start the propagation.
+  Returns:
+    used_node_names: A set of strings, stores the name of nodes we've marked as
+      visited.
+  """
+  used_node_names = set()
+  ops = list(ops)
+  while ops:
+    op = ops.pop()
+    if op.name in used_node_names:
+      continue
+    used_node_names.add(op.name)
+    ops.extend(tensor.op for tensor in op.inputs)
+    ops.extend(op.control_inputs)
+  return used_node_names
+
+
 def prune_unused_nodes(meta_graph, signature_def):
   """Function to prune unused ops given a signature def.
 
@@ -14,13 +14,33 @@
 # ==============================================================================
 """TensorFlow Hub Module API for Tensorflow 2.0."""
 
+import contextlib
+import functools
 import os
+import threading
+import weakref
+
+from absl import logging
 import tensorflow as tf
 
+from tensorflow_hub import filesystem
+from tensorflow_hub import instrumentation
+from tensorflow_hub import jit_compilation
+from tensorflow_hub import load_report
 from tensorflow_hub import registry
+from tensorflow_hub import signature_pruning
+from tensorflow_hub import tf2_conversion
+from tensorflow_hub import variable_cache
+from tensorflow_hub import variable_prefetch
+from tensorflow_hub import warmup as warmup_lib
 
 _MODULE_PROTO_FILENAME_PB = "tfhub_module.pb"
 
+# Objects returned by load(..., share_loaded_object=True), keyed by
+# _loaded_object_key(). Entries disappear once the object is not used anymore.
+_loaded_objects = weakref.WeakValueDictionary()
+_loaded_objects_lock = threading.Lock()
+
 
 def _get_module_proto_path(module_dir):
   return os.path.join(
@@ -52,10 +72,113 @@ def resolve(handle):
   Returns:
     A string representing the Module path.
   """
-  return registry.resolver(handle)
+  with load_report.phase("resolve"):
+    return registry.resolver(handle)
+
+
+def _options_key(options):
+  """Returns a hashable representation of a tf.saved_model.LoadOptions."""
+  if not options:
+    return None
+  names = getattr(type(options), "__slots__", None) or vars(options)
+  return tuple(
+      (name, repr(getattr(options, name, None))) for name in sorted(names))
+
+
+def _saved_model_fingerprint(module_path):
+  """Returns the fingerprint of a SavedModel, or None if it has none."""
+  read_fingerprint = getattr(
+      getattr(tf.saved_model, "experimental", None), "read_fingerprint", None)
+  if read_fingerprint is None:  # Before TF2.12.
+    return None
+  try:
+    return read_fingerprint(module_path).saved_model_checksum
+  except (tf.errors.OpError, ValueError, FileNotFoundError):
+    return None  # E.g., models saved before TF2.12 have no fingerprint.
+
+
+def _loaded_object_key(module_path, tags, options, mmap_variables):
+  tags_key = None if tags is None else frozenset(
+      [tags] if isinstance(tags, str) else tags)
+  return (tf.compat.as_str(module_path), tags_key, _options_key(options),
+          _saved_model_fingerprint(module_path), mmap_variables)
+
+
+def _load_saved_model(module_path, tags, options, prefetch_variables=False):
+  """Loads a SavedModel, optionally prefetching its checkpoint concurrently."""
+  skips_checkpoint = getattr(options, "experimental_skip_checkpoint", False)
+  if prefetch_variables and not skips_checkpoint:
+    prefetcher = variable_prefetch.VariablePrefetcher(module_path)
+  else:
+    prefetcher = contextlib.nullcontext()
+  # Parsing the SavedModel, restoring the variables and rebuilding the
+  # functions all happen in this one call.
+  with load_report.phase("load_saved_model"), prefetcher:
+    if load_report.is_recording() and not skips_checkpoint:
+      variables_dir = os.path.join(tf.compat.as_str(module_path), "variables")
+      if filesystem.isdir(variables_dir):
+        load_report.add_bytes(filesystem.dir_size(variables_dir))
+    if options:
+      # tf.compat.v1.saved_model.load_v2() is TF2 tf.saved_model.load()
+      # before TF2.
+      obj = tf.compat.v1.saved_model.load_v2(
+          module_path, tags=tags, options=options)
+    else:
+      obj = tf.compat.v1.saved_model.load_v2(module_path, tags=tags)
+    if isinstance(prefetcher, variable_prefetch.VariablePrefetcher):
+      load_report.record("prefetch_variables", prefetcher.duration_sec,
+                         prefetcher.bytes_read)
+  return obj
+
+
+def _skip_checkpoint_options(options):
+  """Returns a copy of `options` that skips restoring the checkpoint."""
+  if not hasattr(tf.saved_model.LoadOptions(), "experimental_skip_checkpoint"):
+    return options  # Before TF2.9; restoring is just wasted work then.
+  new_options = tf.saved_model.LoadOptions()
+  if options is not None:
+    for name in type(options).__slots__:
+      setattr(new_options, name, getattr(options, name))
+  new_options.experimental_skip_checkpoint = True
+  return new_options
 
 
-def load(handle, tags=None, options=None):
+def _load_with_mmap_variables(module_path, tags, options, prefetch_variables):
+  """Loads a SavedModel whose variables use the shared variable cache."""
+  with load_report.phase("read_variable_cache"):
+    fingerprint = _saved_model_fingerprint(module_path)
+    manifest = variable_cache.read_manifest(module_path, fingerprint)
+  if manifest is not None:
+    # Values that are not in the cache still need to be restored.
+    obj = _load_saved_model(
+        module_path, tags,
+        _skip_checkpoint_options(options) if manifest.complete else options,
+        prefetch_variables)
+    with load_report.phase("map_variables"):
+      if variable_cache.map_variables(obj, module_path, manifest):
+        return obj
+  obj = _load_saved_model(module_path, tags, options, prefetch_variables)
+  with load_report.phase("write_variable_cache"):
+    manifest = variable_cache.write_cache(obj, module_path, fingerprint)
+    load_report.add_bytes(
+        filesystem.stat(variable_cache.cache_path(module_path)).length)
+  with load_report.phase("map_variables"):
+    variable_cache.map_variables(obj, module_path, manifest)
+  return obj
+
+
+def load(handle,
+         tags=None,
+         options=None,
+         share_loaded_object=False,
+         mmap_variables=False,
+         prefetch_variables=False,
+         return_report=False,
+         lazy=False,
+         prune_to_signature=None,
+         convert_to_tf2=False,
+         warmup=None,
+         jit_compile=False):
   """Resolves a handle and loads the resulting module.
 
   This is the preferred API to load a Hub module in low-level TensorFlow 2.
@@ -87,9 +210,73 @@ def load(handle, tags=None, options=None):
     options: Optional, `tf.saved_model.LoadOptions` object that specifies
       options for loading. This argument can only be used from TensorFlow 2.3
       onwards.
+    share_loaded_object: If True, and an object loaded from the same resolved
+      path with the same tags and options (and, if available, the same
+      SavedModel fingerprint) with share_loaded_object=True is still in use,
+      that object is returned instead of loading the model again. Its
+      variables are then shared by all users, so leave this False to get an
+      independent copy, e.g., for fine-tuning. Sharing only applies in eager
+      mode, because loaded objects belong to the graph they were loaded into.
+    mmap_variables: If True, the values of the variables are memory-mapped
+      from a cache file next to the resolved module directory (created on
+      first use), instead of being read into memory owned by this process.
+      All processes using the model on a host, including workers forked after
+      loading, then share one copy of the values. Meant for frozen models:
+      training still works, but the trained values are private copies again.
+      Requires eager mode and a TensorFlow version that supports DLPack.
+    prefetch_variables: If True, the checkpoint files of a model on the local
+      filesystem are read in large chunks on a thread pool while the model
+      is being loaded, so that restoring the variables mostly reads from the
+      page cache. This speeds up loading from cold network-attached disks.
+    return_report: If True, also returns a hub.LoadReport with the time spent
+      in each phase of resolving and loading the model, and the bytes
+      downloaded, extracted or read in it. The phases are also annotated for
+      the TensorFlow profiler. Reports of all loads can be received with
+      hub.add_load_listener().
+    lazy: If True, returns a proxy right away and resolves and loads the
+      model only when the proxy is first called or an attribute of the loaded
+      object (like `variables`) is accessed. The signatures of the model are
+      available before that as the proxy's `signature_specs`, read from its
+      metadata only. This keeps the startup cost of registering many optional
+      models low. Cannot be combined with `return_report`.
+    prune_to_signature: Optional name of a signature. If set, and the model
+      is a TF1 SavedModel (like the TF1 Hub format), it is loaded from a copy
+      that keeps only what this signature needs, including only the
+      variables it uses. The copy is cached next to the resolved module
+      directory. The loaded object then has only this signature. TF2
+      SavedModels are loaded unchanged.
+    convert_to_tf2: If True, and the model is a TF1 SavedModel (like the TF1
+      Hub format), it is converted to a TF2 SavedModel with the same
+      signatures on first use, which is stored in the TF-Hub cache directory
+      under a hash of the model and `tags`. This and later loads with
+      `convert_to_tf2=True` load the converted model, which is faster than
+      re-importing the TF1 graph. Converting requires eager mode.
+    warmup: Optional. True to replay the warmup requests of TensorFlow
+      Serving stored in the module (at assets.extra/tf_serving_warmup_requests)
+      on its signatures, or a list of warmup specs to call the loaded object
+      with (or, if it is not callable or in the TF1 Hub format, its default
+      signature): batch sizes, tf.TensorSpecs or sample inputs (see
+      tensorflow_hub/warmup.py). The first call of each of the model's
+      functions instantiates and optimizes it, which then happens before this
+      function returns instead of on the first request. Requires eager mode.
+    jit_compile: If True, eager calls of the loaded object run through
+      XLA-compiled functions, with the batch dimension of the inputs padded
+      to the next power of two so that few shapes need compiling (see
+      tensorflow_hub/jit_compilation.py). If XLA cannot compile the model,
+      it runs as is. The compile statistics per bucket of input shapes are
+      the `stats` of the object's `__call__`. Re-saving the object saves
+      its original `__call__`. Requires a callable object and cannot be
+      combined with `share_loaded_object`.
+
+  If hub.enable_instrumentation() has been called, the calls of the loaded
+  object are recorded for hub.instrumentation_snapshot() under the key
+  (handle, None). The object's `__call__` is replaced for that; re-saving
+  the object saves its original `__call__`.
 
   Returns:
-    A trackable object (see tf.saved_model.load() documentation for details).
+    A trackable object (see tf.saved_model.load() documentation for details),
+    or a tuple of that object and a hub.LoadReport if `return_report` is True,
+    or a proxy for the object if `lazy` is True.
 
   Raises:
     NotImplementedError: If the code is running against incompatible (1.x)
@@ -97,10 +284,105 @@ def load(handle, tags=None, options=None):
   """
   if not isinstance(handle, str):
     raise ValueError("Expected a string, got %s" % handle)
+  if lazy:
+    if return_report:
+      raise ValueError("lazy=True cannot be combined with return_report=True.")
+    # Imported here, because lazy_model depends on this module.
+    from tensorflow_hub import lazy_model  # pylint: disable=g-import-not-at-top
+    return lazy_model.LazyModel(handle, tags, functools.partial(
+        load, handle, tags=tags, options=options,
+        share_loaded_object=share_loaded_object,
+        mmap_variables=mmap_variables, prefetch_variables=prefetch_variables,
+        prune_to_signature=prune_to_signature, convert_to_tf2=convert_to_tf2,
+        warmup=warmup, jit_compile=jit_compile))
+  if jit_compile and share_loaded_object:
+    raise ValueError(
+        "jit_compile=True cannot be combined with share_loaded_object=True.")
+  with load_report.recording(handle, enabled=return_report) as report:
+    obj = _load(handle, tags, options, share_loaded_object, mmap_variables,
+                prefetch_variables, prune_to_signature, convert_to_tf2,
+                warmup, jit_compile)
+  if return_report:
+    return obj, report
+  return obj
+
+
+def _wrap_call(obj, wrap_fn):
+  """Replaces `obj.__call__` with `wrap_fn(obj.__call__)`.
+
+  tf.saved_model.save() only saves the tf.functions among the attributes of
+  an object, so the wrapper would drop `__call__` from a re-saved object.
+  Therefore the function it wraps is still saved as `__call__`.
+
+  Args:
+    obj: A loaded object with a `__call__` attribute.
+    wrap_fn: A function that takes and returns a callable.
+  """
+  call = obj.__call__
+  trackable_children = obj._trackable_children  # pylint: disable=protected-access
+
+  def saved_trackable_children(save_type="checkpoint", **kwargs):
+    children = trackable_children(save_type, **kwargs)
+    if save_type == "savedmodel":
+      # If the object was wrapped before, its inner wrapping added it.
+      children.setdefault("__call__", call)
+    return children
+
+  obj._trackable_children = saved_trackable_children  # pylint: disable=protected-access
+  obj.__call__ = wrap_fn(call)
+
+
+def _load(handle, tags, options, share_loaded_object, mmap_variables,
+          prefetch_variables, prune_to_signature, convert_to_tf2, warmup,
+          jit_compile):
+  """Implements load() for a string handle."""
   module_path = resolve(handle)
+  obj = _load_resolved(module_path, tags, options, share_loaded_object,
+                       mmap_variables, prefetch_variables, prune_to_signature,
+                       convert_to_tf2)
+  if jit_compile:
+    if not callable(obj) or getattr(obj, "_is_hub_module_v1", False):
+      raise ValueError("jit_compile=True requires a callable object, but %s "
+                       "is not." % handle)
+    # Loaded objects are called through their __call__ attribute. The warmup
+    # below then compiles the buckets it uses.
+    if not isinstance(obj.__call__, jit_compilation.JitCompiledCallable):
+      _wrap_call(obj, jit_compilation.jit_compile)
+  if warmup:
+    with load_report.phase("warmup"):
+      # Warmup requests are read from the original module, which pruned or
+      # converted copies may lack.
+      warmup_lib.warm_up_loaded_object(obj, module_path, warmup)
+  if (instrumentation.is_enabled() and callable(obj) and
+      not getattr(obj, "_is_hub_module_v1", False) and
+      not isinstance(obj.__call__, instrumentation.InstrumentedCallable)):
+    # After the warmup, which is not a call by the program.
+    _wrap_call(obj, lambda call: instrumentation.instrument(call, handle))
+  return obj
+
+
+def _load_resolved(module_path, tags, options, share_loaded_object,
+                   mmap_variables, prefetch_variables, prune_to_signature,
+                   convert_to_tf2):
+  """Loads a resolved module, see load()."""
   is_hub_module_v1 = tf.io.gfile.exists(_get_module_proto_path(module_path))
   if tags is None and is_hub_module_v1:
     tags = []
+  if prune_to_signature is not None:
+    with load_report.phase("prune_signatures"):
+      pruned_path = signature_pruning.pruned_module_path(
+          module_path, tags, prune_to_signature)
+    if pruned_path is None:
+      logging.info("Not pruning %s, which is not a TF1 SavedModel.",
+                   module_path)
+    else:
+      module_path = pruned_path
+  if convert_to_tf2:
+    with load_report.phase("convert_to_tf2"):
+      converted_path = tf2_conversion.converted_module_path(module_path, tags)
+    if converted_path is not None:
+      # TF2 SavedModels have a single MetaGraph, selected without tags.
+      module_path, tags = converted_path, None
 
   saved_model_path = os.path.join(
       tf.compat.as_bytes(module_path),
@@ -119,10 +401,31 @@ def load(handle, tags=None, options=None):
     if not hasattr(getattr(tf, "saved_model", None), "LoadOptions"):
       raise NotImplementedError("options are not supported for TF < 2.3.x,"
                                 " Current version: %s" % tf.__version__)
-    # tf.compat.v1.saved_model.load_v2() is TF2 tf.saved_model.load() before TF2
-    obj = tf.compat.v1.saved_model.load_v2(
-        module_path, tags=tags, options=options)
+  if mmap_variables:
+    if not tf.executing_eagerly():
+      raise ValueError("mmap_variables=True requires eager mode.")
+    if not variable_cache.is_supported():
+      raise NotImplementedError(
+          "mmap_variables=True needs DLPack support in TensorFlow and numpy.")
+
+  share_loaded_object = share_loaded_object and tf.executing_eagerly()
+  if share_loaded_object:
+    key = _loaded_object_key(module_path, tags, options, mmap_variables)
+    with _loaded_objects_lock:
+      obj = _loaded_objects.get(key)
+    if obj is not None:
+      load_report.record("shared_object", 0.0)
+      return obj
+
+  if mmap_variables:
+    obj = _load_with_mmap_variables(module_path, tags, options,
+                                    prefetch_variables)
   else:
-    obj = tf.compat.v1.saved_model.load_v2(module_path, tags=tags)
+    obj = _load_saved_model(module_path, tags, options, prefetch_variables)
   obj._is_hub_module_v1 = is_hub_module_v1  # pylint: disable=protected-access
+
+  if share_loaded_object:
+    with _loaded_objects_lock:
+      # If another thread loaded the same model meanwhile, use its object.
+      obj = _loaded_objects.setdefault(key, obj)
   return obj
@@ -14,7 +14,10 @@
 # ==============================================================================
 """Tests for tensorflow_hub.module_v2."""
 
+import gc
 import os
+import weakref
+
 from absl.testing import parameterized
 import tensorflow as tf
 from tensorflow_hub import module_v2
@@ -55,6 +58,51 @@ class ModuleV2Test(tf.test.TestCase, parameterized.TestCase):
     with self.assertRaisesRegex(ValueError, 'Expected a string, got.*'):
       module_v2.load(0)
 
+  def test_load_shared_object(self):
+    export_dir = os.path.join(self.get_temp_dir(), 'saved_model_v2_mini')
+    _save_plus_one_saved_model_v2(export_dir)
+    m1 = module_v2.load(export_dir, share_loaded_object=True)
+    m2 = module_v2.load(export_dir, share_loaded_object=True)
+    self.assertIs(m1, m2)
+    self.assertIsNot(m1, module_v2.load(export_dir))
+    self.assertIsNot(m1, module_v2.load(export_dir, tags=['serve'],
+                                        share_loaded_object=True))
+    options = tf.saved_model.LoadOptions(experimental_io_device='/job:localhost')
+    self.assertIsNot(m1, module_v2.load(export_dir, options=options,
+                                        share_loaded_object=True))
+
+  def test_shared_object_is_released(self):
+    export_dir = os.path.join(self.get_temp_dir(), 'saved_model_v2_mini')
+    _save_plus_one_saved_model_v2(export_dir)
+    m = module_v2.load(export_dir, share_loaded_object=True)
+    m_ref = weakref.ref(m)
+    del m
+    gc.collect()
+    self.assertIsNone(m_ref())
+    self.assertEmpty(module_v2._loaded_objects)
+
+
+  def test_load_jit_compile(self):
+    export_dir = os.path.join(self.get_temp_dir(), 'saved_model_v2_mini')
+    _save_plus_one_saved_model_v2(export_dir)
+    m = module_v2.load(export_dir, jit_compile=True, warmup=[tf.ones([4])])
+    self.assertAllEqual(m(tf.constant([1., 2., 3.])), [2., 3., 4.])
+    stats = m.__call__.stats
+    self.assertLen(stats, 1)
+    self.assertEqual(stats[0].batch_size, 4)
+    self.assertEqual(stats[0].num_calls, 2)
+    with self.assertRaisesRegex(ValueError, 'share_loaded_object'):
+      module_v2.load(export_dir, jit_compile=True, share_loaded_object=True)
+
+  def test_resave_jit_compiled_object(self):
+    export_dir = os.path.join(self.get_temp_dir(), 'saved_model_v2_mini')
+    _save_plus_one_saved_model_v2(export_dir)
+    m = module_v2.load(export_dir, jit_compile=True)
+    resaved_dir = os.path.join(self.get_temp_dir(), 'resaved')
+    tf.saved_model.save(m, resaved_dir)
+    resaved = module_v2.load(resaved_dir)
+    self.assertAllEqual(resaved(tf.constant([1., 2.])), [2., 3.])
+
 
 if __name__ == '__main__':
   # In TF 1.15.x, we need to enable V2-like behavior, notably eager execution.
@@ -0,0 +1,222 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Caches the outputs of frozen models for repeated input rows."""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+
+from absl import logging
+import numpy as np
+
+_MAX_BYTES = 64 << 20
+# Approximate memory used by an entry in addition to its value.
+_ENTRY_OVERHEAD_BYTES = 200
+
+# The size of the keys returned by row_keys().
+_KEY_BYTES = hashlib.sha1().digest_size
+
+_SPEC_FILE = "spec.json"
+_KEYS_FILE = "keys"
+_VALUES_FILE = "values"
+
+
+def row_keys(namespace, flat_inputs):
+  """Returns a hash for each row of a batch of inputs.
+
+  Args:
+    namespace: A string that identifies the model and how it is called.
+    flat_inputs: A list of numpy arrays with the same leading batch
+      dimension.
+
+  Returns:
+    A list with a bytes key for each row.
+  """
+  batch_size = len(flat_inputs[0]) if flat_inputs else 0
+  hashes = [hashlib.sha1(namespace.encode("utf8")) for _ in range(batch_size)]
+  for x in flat_inputs:
+    header = json.dumps([x.dtype.str, x.shape[1:]]).encode("utf8")
+    if x.dtype == object:  # Strings.
+      for h, row in zip(hashes, x):
+        h.update(header)
+        for item in np.ravel(row):
+          h.update(len(item).to_bytes(8, "little"))
+          h.update(item)
+    else:
+      x = np.ascontiguousarray(x)
+      for h, row in zip(hashes, x):
+        h.update(header)
+        h.update(row.tobytes())
+  return [h.digest() for h in hashes]
+
+
+class _DiskTier(object):
+  """Stores the rows of one namespace in memory-mapped files.
+
+  The values of all rows of a namespace have the same dtype and shape, so
+  they are stored as fixed-size records in a values file, in the order of
+  the keys in a keys file, which are the fixed-size hashes returned by
+  row_keys(). Writes append to both files; they are meant for
+  a single writing process, like an offline batch job. Memory-mapping needs
+  a local directory.
+  """
+
+  def __init__(self, path):
+    self._path = path
+    self._spec = None
+    self._rows = {}
+    self._mapped = None
+    spec_path = os.path.join(path, _SPEC_FILE)
+    if os.path.exists(spec_path):
+      with open(spec_path) as f:
+        self._spec = json.load(f)
+      keys = b""
+      if os.path.exists(os.path.join(path, _KEYS_FILE)):
+        with open(os.path.join(path, _KEYS_FILE), "rb") as f:
+          keys = f.read()
+      num_rows = min(len(keys) // _KEY_BYTES, self._file_rows())
+      for row in range(num_rows):
+        self._rows[keys[row * _KEY_BYTES:(row + 1) * _KEY_BYTES]] = row
+
+  def _record_size(self):
+    dtype, shape = self._spec
+    return np.dtype(dtype).itemsize * int(np.prod(shape))
+
+  def _file_rows(self):
+    values_path = os.path.join(self._path, _VALUES_FILE)
+    if not os.path.exists(values_path):
+      return 0
+    return os.path.getsize(values_path) // max(self._record_size(), 1)
+
+  def get(self, key):
+    row = self._rows.get(key)
+    if row is None:
+      return None
+    if self._mapped is None or row >= len(self._mapped):
+      dtype, shape = self._spec
+      self._mapped = np.memmap(os.path.join(self._path, _VALUES_FILE),
+                               dtype=dtype, mode="r",
+                               shape=tuple([self._file_rows()] + shape))
+    return np.array(self._mapped[row])
+
+  def put(self, keys, values):
+    """Appends rows, unless their dtype or shape differs from earlier ones."""
+    if values[0].dtype == object:
+      return  # Strings have no fixed size.
+    spec = [values[0].dtype.str, list(values[0].shape)]
+    if self._spec is None:
+      os.makedirs(self._path, exist_ok=True)
+      with open(os.path.join(self._path, _SPEC_FILE), "w") as f:
+        json.dump(spec, f)
+      self._spec = spec
+    elif spec != self._spec:
+      logging.warning("Not storing outputs of %s in %s, which has %s.",
+                      spec, self._path, self._spec)
+      return
+    new = [(k, v) for k, v in zip(keys, values) if k not in self._rows]
+    if not new:
+      return
+    first_row = self._file_rows()
+    # Values are written before keys, so that a key never points past the
+    # end of the values if the process dies in between.
+    with open(os.path.join(self._path, _VALUES_FILE), "ab") as f:
+      for _, value in new:
+        f.write(np.ascontiguousarray(value).tobytes())
+    with open(os.path.join(self._path, _KEYS_FILE), "ab") as f:
+      f.write(b"".join(k for k, _ in new))
+    for i, (key, _) in enumerate(new):
+      self._rows[key] = first_row + i
+
+
+class OutputCache(object):
+  """Caches the output rows of frozen models, see hub.KerasLayer.
+
+  The cache is keyed by a hash of each input row and of the model, so it can
+  be shared by several layers. It keeps up to `max_bytes` of output rows in
+  memory, evicting the least recently used ones. If `disk_dir` is set, all
+  rows are also stored below that directory, in memory-mapped files that
+  outlive the process; rows found there are copied to memory when used.
+  The disk tier is meant for offline batch jobs and supports only one
+  writing process at a time.
+
+  Attributes:
+    hits: The number of rows found in the cache.
+    misses: The number of rows not found in the cache.
+  """
+
+  def __init__(self, max_bytes=_MAX_BYTES, disk_dir=None):
+    self._max_bytes = max_bytes
+    self._disk_dir = disk_dir
+    self._entries = collections.OrderedDict()
+    self._bytes = 0
+    self._disk_tiers = {}
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+
+  @property
+  def num_bytes(self):
+    """The approximate memory used by the in-memory entries."""
+    return self._bytes
+
+  def _disk_tier(self, namespace):
+    if self._disk_dir is None:
+      return None
+    if namespace not in self._disk_tiers:
+      self._disk_tiers[namespace] = _DiskTier(
+          os.path.join(self._disk_dir, namespace))
+    return self._disk_tiers[namespace]
+
+  def _put_in_memory(self, key, value):
+    if key in self._entries:
+      self._entries.move_to_end(key)
+      return
+    self._entries[key] = value
+    self._bytes += value.nbytes + _ENTRY_OVERHEAD_BYTES
+    while self._bytes > self._max_bytes and self._entries:
+      _, evicted = self._entries.popitem(last=False)
+      self._bytes -= evicted.nbytes + _ENTRY_OVERHEAD_BYTES
+
+  def lookup(self, namespace, keys):
+    """Returns the cached value for each key, or None for misses."""
+    with self._lock:
+      disk_tier = self._disk_tier(namespace)
+      values = []
+      for key in keys:
+        value = self._entries.get(key)
+        if value is not None:
+          self._entries.move_to_end(key)
+        elif disk_tier is not None:
+          value = disk_tier.get(key)
+          if value is not None:
+            self._put_in_memory(key, value)
+        values.append(value)
+      num_hits = sum(v is not None for v in values)
+      self.hits += num_hits
+      self.misses += len(values) - num_hits
+      return values
+
+  def insert(self, namespace, keys, values):
+    """Caches a value for each key."""
+    if not keys:
+      return
+    with self._lock:
+      for key, value in zip(keys, values):
+        self._put_in_memory(key, value)
+      disk_tier = self._disk_tier(namespace)
+      if disk_tier is not None:
+        disk_tier.put(keys, values)
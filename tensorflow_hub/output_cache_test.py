@@ -0,0 +1,77 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.output_cache."""
+
+import os
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import output_cache
+
+
+class OutputCacheTest(tf.test.TestCase):
+
+  def testRowKeys(self):
+    texts = np.array([b"a", b"b", b"a"], dtype=object)
+    ids = np.array([[1, 2], [1, 2], [1, 3]])
+    keys = output_cache.row_keys("model", [texts, ids])
+    self.assertLen(set(keys), 3)
+    self.assertEqual(output_cache.row_keys("model", [texts]),
+                     output_cache.row_keys("model", [texts]))
+    self.assertEqual(output_cache.row_keys("model", [texts])[0],
+                     output_cache.row_keys("model", [texts])[2])
+    self.assertNotEqual(output_cache.row_keys("model", [texts]),
+                        output_cache.row_keys("other", [texts]))
+
+  def testLookupAndEviction(self):
+    row = np.ones([100], np.float32)
+    entry_bytes = row.nbytes + output_cache._ENTRY_OVERHEAD_BYTES
+    cache = output_cache.OutputCache(max_bytes=2 * entry_bytes)
+    cache.insert("model", [b"a", b"b"], [row, 2 * row])
+    self.assertEqual(cache.num_bytes, 2 * entry_bytes)
+    a, b, c = cache.lookup("model", [b"a", b"b", b"c"])
+    self.assertAllEqual(a, row)
+    self.assertAllEqual(b, 2 * row)
+    self.assertIsNone(c)
+    self.assertEqual((cache.hits, cache.misses), (2, 1))
+    # Evicts the least recently used row, which is "a" after a lookup of "b".
+    cache.lookup("model", [b"b"])
+    cache.insert("model", [b"c"], [3 * row])
+    self.assertEqual(cache.num_bytes, 2 * entry_bytes)
+    a, b, c = cache.lookup("model", [b"a", b"b", b"c"])
+    self.assertIsNone(a)
+    self.assertAllEqual(c, 3 * row)
+
+  def testDiskTier(self):
+    disk_dir = os.path.join(self.get_temp_dir(), "outputs")
+    cache = output_cache.OutputCache(disk_dir=disk_dir)
+    a, b, c, d = output_cache.row_keys(
+        "model", [np.array([b"a", b"b", b"c", b"d"], dtype=object)])
+    rows = [np.full([2, 3], i, np.float32) for i in range(3)]
+    cache.insert("model", [a, b], rows[:2])
+    cache.insert("model", [c], rows[2:])
+    # Rows of other shapes are kept in memory only.
+    cache.insert("model", [d], [np.ones([4], np.float32)])
+
+    cache = output_cache.OutputCache(max_bytes=0, disk_dir=disk_dir)
+    values = cache.lookup("model", [c, a, d, b])
+    self.assertAllEqual(values[0], rows[2])
+    self.assertAllEqual(values[1], rows[0])
+    self.assertIsNone(values[2])
+    self.assertAllEqual(values[3], rows[1])
+    self.assertEqual(cache.lookup("other", [a]), [None])
+
+if __name__ == "__main__":
+  tf.test.main()
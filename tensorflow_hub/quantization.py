@@ -0,0 +1,435 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Keeps the frozen variables of loaded models in fewer bytes.
+
+The functions of a loaded SavedModel read its variables as float32, so their
+values cannot simply be replaced by smaller ones. Instead, a compact copy of
+the value of each quantized variable is kept (int8 values with a float32
+scale per row or per channel, or bfloat16 values), its float32 value is
+freed, and the model is called through a rewritten copy of its graph,
+traced once per input signature. In that graph, a lookup of rows (like in
+an embedding table) dequantizes only the rows it gathers, and any other read
+of a variable dequantizes its compact copy right there. So a call holds the
+float32 values of only the variables it reads in full, only while it needs
+them. This trades the time to dequantize per call for memory, which suits
+processes that keep large models loaded.
+
+Only float32 variables with at least MIN_QUANTIZED_SIZE elements are
+quantized; small ones like biases keep their values. A variable that the
+graph uses in other ways, like inside of a tf.while_loop, gets its float32
+value back when such a call is first traced.
+
+Afterwards, the quantized variables hold empty values of shape [0], so
+they must not be read, saved or checkpointed.
+"""
+
+import collections
+import threading
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import tf_utils
+
+# pylint: disable=g-direct-tensorflow-import
+from tensorflow.python.framework import convert_to_constants
+# pylint: enable=g-direct-tensorflow-import
+
+MODES = ("int8", "bfloat16")
+MIN_QUANTIZED_SIZE = 1024
+# The number of input signatures for which rewritten graphs are kept.
+_MAX_FUNCTIONS = 32
+
+QuantizationReport = collections.namedtuple("QuantizationReport", [
+    # The number of quantized variables.
+    "num_variables",
+    # The bytes of their float32 values.
+    "float_bytes",
+    # The bytes of their compact copies.
+    "quantized_bytes",
+    # The difference between both.
+    "saved_bytes",
+    # The largest and the mean absolute difference between the outputs of
+    # the model on a sample batch with and without quantization, or None.
+    "max_abs_error",
+    "mean_abs_error",
+])
+
+
+def _inline_graph_def(concrete_function):
+  """Returns the GraphDef of `concrete_function` with all calls inlined."""
+  # This is not part of the public TensorFlow API.
+  inline = getattr(convert_to_constants, "_run_inline_graph_optimization",
+                   None)
+  if inline is None:
+    raise NotImplementedError(
+        "The currently used TensorFlow release is not compatible with "
+        "quantization. To be compatible, the symbol tensorflow.python."
+        "framework.convert_to_constants._run_inline_graph_optimization must "
+        "exist.")
+  return inline(concrete_function, lower_control_flow=False,
+                aggressive_inlining=True)
+
+
+def _quantize_int8(value, axis):
+  """Returns int8 values and float32 scales of `value` along `axis`."""
+  if axis is None:
+    reduce_axes = None
+  else:
+    reduce_axes = tuple(i for i in range(value.ndim) if i != axis)
+  scale = np.max(np.abs(value), axis=reduce_axes, keepdims=True) / 127.
+  scale = np.where(scale > 0, scale, 1.).astype(np.float32)
+  quantized = np.clip(np.round(value / scale), -127, 127).astype(np.int8)
+  return quantized, scale
+
+
+class _CompactValue(object):
+  """The compact copy of a variable's value, in variables of its own."""
+
+  def __init__(self, value, mode):
+    self.float_bytes = value.nbytes
+    self.scale = None
+    self.scale_per_row = False
+    if mode == "bfloat16":
+      self.values = tf.Variable(tf.cast(tf.constant(value), tf.bfloat16),
+                                trainable=False)
+      return
+    # Scales per row suit embedding tables, scales per output channel suit
+    # kernels; the axis that loses less precision is used.
+    candidates = [None] if value.ndim < 2 else [0, value.ndim - 1]
+    best = None
+    for axis in candidates:
+      quantized, scale = _quantize_int8(value, axis)
+      error = np.sum(np.square(quantized * scale - value))
+      if best is None or error < best[0]:
+        best = (error, quantized, scale, axis)
+    _, quantized, scale, axis = best
+    self.values = tf.Variable(quantized, trainable=False)
+    self.scale = tf.Variable(scale, trainable=False)
+    self.scale_per_row = axis == 0
+
+  @property
+  def nbytes(self):
+    nbytes = self.values.shape.num_elements() * self.values.dtype.size
+    if self.scale is not None:
+      nbytes += self.scale.shape.num_elements() * self.scale.dtype.size
+    return nbytes
+
+  def dequantize(self):
+    values = tf.cast(self.values, tf.float32)
+    if self.scale is not None:
+      values *= self.scale
+    return values
+
+
+def _assign(variable, value):
+  # Unlike variable.assign(), this allows changing the shape of the value.
+  tf.raw_ops.AssignVariableOp(resource=variable.handle, value=value,
+                              validate_shape=False)
+
+
+def _node_name(input_name):
+  return input_name.lstrip("^").split(":")[0]
+
+
+def _new_node(name, op, inputs, **type_attrs):
+  node = tf.compat.v1.NodeDef(name=name, op=op, input=inputs)
+  for attr, dtype in type_attrs.items():
+    node.attr[attr].type = dtype.as_datatype_enum
+  return node
+
+
+def _dequantize_nodes(node, compact, scale_name):
+  """Returns the nodes that replace a read of a quantized variable.
+
+  The read `node` (a ReadVariableOp or ResourceGather) is changed to read the
+  compact values instead. Its original name is given to the node that
+  outputs the dequantized values, so its consumers need no change.
+
+  Args:
+    node: The NodeDef of the read.
+    compact: The _CompactValue of the variable.
+    scale_name: The name of the placeholder for the resource of the scale.
+  """
+  name = node.name
+  node.name = name + "/quantized"
+  node.attr["dtype"].type = compact.values.dtype.as_datatype_enum
+  cast = _new_node(name + "/dequantize", "Cast", [node.name],
+                   SrcT=compact.values.dtype, DstT=tf.float32)
+  if compact.scale is None:
+    cast.name = name
+    return [node, cast]
+  if node.op == "ResourceGather" and compact.scale_per_row:
+    # Gathers the scales of the same rows.
+    scale = _new_node(name + "/scale", "ResourceGather",
+                      [scale_name, node.input[1]], dtype=tf.float32)
+    for attr in ("Tindices", "batch_dims", "validate_indices"):
+      if attr in node.attr:
+        scale.attr[attr].CopyFrom(node.attr[attr])
+    scales = [scale]
+  else:
+    scale = _new_node(name + "/scale", "ReadVariableOp", [scale_name],
+                      dtype=tf.float32)
+    scales = [scale]
+    if node.op == "ResourceGather":
+      # Gathered rows lack the first dimension, of size 1, of the scale.
+      squeeze = _new_node(name + "/scale/squeeze", "Squeeze", [scale.name],
+                          T=tf.float32)
+      squeeze.attr["squeeze_dims"].list.i.append(0)
+      scales.append(squeeze)
+  multiply = _new_node(name, "Mul", [cast.name, scales[-1].name],
+                       T=tf.float32)
+  return [node, cast] + scales + [multiply]
+
+
+def _find_reads(consumers, placeholder):
+  """Returns the nodes reading the resource fed to `placeholder`, or None.
+
+  Args:
+    consumers: A dict from node names to the nodes that take their outputs.
+    placeholder: The name of the placeholder for a variable's resource.
+
+  Returns:
+    A list of ReadVariableOp and ResourceGather nodes, or None if the
+    resource is also used by other nodes.
+  """
+  reads = []
+  pending = [placeholder]
+  while pending:
+    for node in consumers.get(pending.pop(), []):
+      if node.op == "Identity":
+        pending.append(node.name)
+      elif node.op == "ReadVariableOp" or (
+          node.op == "ResourceGather" and not node.attr["batch_dims"].i):
+        reads.append(node)
+      elif node.op != "VariableShape":
+        return None
+  return reads
+
+
+class _QuantizedFunction(object):
+  """A function traced for some inputs, rewritten to dequantize on reads."""
+
+  def __init__(self, fn, specs, compact_values, restore):
+    """Traces `fn` and rewrites its graph.
+
+    Args:
+      fn: A callable taking inputs with `specs`.
+      specs: A nest of tf.TypeSpecs.
+      compact_values: A dict from the ids of the handles of the quantized
+        variables to their _CompactValues.
+      restore: Called with the handle of a quantized variable that cannot be
+        rewritten, to give it its float32 value back.
+    """
+    concrete_function = tf.function(fn).get_concrete_function(specs)
+    self._structured_outputs = concrete_function.structured_outputs
+    num_inputs = len(tf.nest.flatten(specs, expand_composites=True))
+    input_names = [t.name for t in concrete_function.inputs[:num_inputs]]
+    output_names = [t.name for t in concrete_function.outputs]
+    graph_def = _inline_graph_def(concrete_function)
+    nodes = list(graph_def.node)
+    consumers = collections.defaultdict(list)
+    for node in nodes:
+      for name in node.input:
+        if not name.startswith("^"):
+          consumers[_node_name(name)].append(node)
+    feeds = {}
+    new_nodes = []
+    replacements = {}
+    for placeholder, handle in zip(concrete_function.inputs[num_inputs:],
+                                   concrete_function.captured_inputs):
+      name = placeholder.op.name
+      feeds[name] = handle
+      compact = compact_values.get(id(handle))
+      if compact is None:
+        continue
+      reads = _find_reads(consumers, name)
+      if reads is None:
+        restore(handle)
+        continue
+      feeds[name] = compact.values.handle
+      scale_name = name + "/scale"
+      if compact.scale is not None:
+        feeds[scale_name] = compact.scale.handle
+        new_nodes.append(
+            _new_node(scale_name, "Placeholder", [], dtype=tf.resource))
+      for node in reads:
+        replacements[id(node)] = _dequantize_nodes(node, compact, scale_name)
+    for node in nodes:
+      new_nodes.extend(replacements.get(id(node), [node]))
+    rewritten = tf.compat.v1.GraphDef(versions=graph_def.versions,
+                                      library=graph_def.library)
+    rewritten.node.extend(new_nodes)
+
+    def import_graph():
+      # Feeding the handles captures them in the wrapping graph.
+      input_map = {name + ":0": tf.identity(handle)
+                   for name, handle in feeds.items()}
+      return tf.graph_util.import_graph_def(
+          rewritten, input_map=input_map,
+          return_elements=input_names + output_names, name="quantized")
+
+    wrapped = tf.compat.v1.wrap_function(import_graph, [])
+    self._function = wrapped.prune(wrapped.outputs[:num_inputs],
+                                   wrapped.outputs[num_inputs:])
+
+  def __call__(self, inputs):
+    outputs = self._function(*tf.nest.flatten(inputs, expand_composites=True))
+    return tf.nest.pack_sequence_as(self._structured_outputs, outputs,
+                                    expand_composites=True)
+
+
+class QuantizedVariables(object):
+  """The quantized variables of a model, see quantize()."""
+
+  def __init__(self, variables, mode, fn, sample_inputs=None):
+    self._fn = fn
+    self._variables = []
+    self._values = []
+    self._output_errors = (None, None)
+    expected = None
+    if sample_inputs is not None:
+      expected = fn(sample_inputs)
+    for variable in variables:
+      if (variable.dtype != tf.float32 or
+          variable.shape.num_elements() < MIN_QUANTIZED_SIZE):
+        continue
+      value = variable.numpy()
+      self._variables.append(variable)
+      self._values.append(_CompactValue(value, mode))
+    self._lock = threading.Lock()
+    self._functions = collections.OrderedDict()
+    # Frees the float32 values.
+    for variable in self._variables:
+      _assign(variable, tf.zeros([0], variable.dtype))
+    if sample_inputs is not None:
+      self._output_errors = _output_errors(expected, self.call(sample_inputs))
+
+  @property
+  def num_variables(self):
+    return len(self._variables)
+
+  @property
+  def float_bytes(self):
+    return sum(v.float_bytes for v in self._values)
+
+  @property
+  def quantized_bytes(self):
+    return sum(v.nbytes for v in self._values)
+
+  @property
+  def report(self):
+    """A QuantizationReport of the variables that are still quantized.
+
+    Variables that got their float32 values back are not counted.
+    """
+    max_abs_error, mean_abs_error = self._output_errors
+    return QuantizationReport(
+        num_variables=self.num_variables,
+        float_bytes=self.float_bytes,
+        quantized_bytes=self.quantized_bytes,
+        saved_bytes=self.float_bytes - self.quantized_bytes,
+        max_abs_error=max_abs_error,
+        mean_abs_error=mean_abs_error)
+
+  def _restore(self, handle):
+    """Gives a quantized variable its (dequantized) float32 value back."""
+    for i, variable in enumerate(self._variables):
+      if variable.handle is handle:
+        logging.warning(
+            "The variable %s is used in ways that cannot read its quantized "
+            "value, so it gets its float32 value back.", variable.name)
+        _assign(variable, self._values[i].dequantize())
+        del self._variables[i]
+        del self._values[i]
+        return
+
+  def _function(self, specs):
+    """Returns the _QuantizedFunction for inputs with `specs`."""
+    key = tf_utils.spec_key(specs)
+    with self._lock:
+      function = self._functions.get(key)
+      if function is None:
+        with tf.init_scope():
+          function = _QuantizedFunction(
+              self._fn, specs,
+              {id(v.handle): c for v, c in zip(self._variables, self._values)},
+              self._restore)
+        self._functions[key] = function
+        if len(self._functions) > _MAX_FUNCTIONS:
+          self._functions.popitem(last=False)
+      else:
+        self._functions.move_to_end(key)
+      return function
+
+  def call(self, inputs):
+    """Returns the outputs of the model for `inputs`.
+
+    The model is traced once for each input signature (with any batch size),
+    also if called while building a graph.
+
+    Args:
+      inputs: A tensor or a nest of tensors.
+    """
+    if not tf.is_tensor(inputs):
+      inputs = tf.nest.map_structure(
+          lambda x: x if tf.is_tensor(x) else tf.convert_to_tensor(x),
+          inputs)
+    return self._function(tf.nest.map_structure(
+        tf_utils.relaxed_batch_spec, inputs))(inputs)
+
+
+def _output_errors(expected, actual):
+  """Returns the max and mean absolute difference of two nests of outputs."""
+  errors = [
+      np.abs(np.asarray(e, np.float64) - np.asarray(a, np.float64)).ravel()
+      for e, a in zip(tf.nest.flatten(expected), tf.nest.flatten(actual))]
+  errors = np.concatenate(errors) if errors else np.zeros([0])
+  if not errors.size:
+    return 0., 0.
+  return float(np.max(errors)), float(np.mean(errors))
+
+
+def quantize(variables, mode, call, sample_inputs=None):
+  """Quantizes the frozen variables of a model, see module docstring.
+
+  Args:
+    variables: The variables of the model. They must not be changed or
+      used by other models afterwards.
+    mode: One of MODES.
+    call: A callable that runs the model on a tensor or nest of tensors.
+    sample_inputs: Optional. Inputs to compare the outputs of `call` with
+      and without quantization.
+
+  Returns:
+    A pair of the QuantizedVariables, whose call() method must be used to
+    run the model, and a QuantizationReport. The report is a snapshot; the
+    `report` of the QuantizedVariables stays up to date if variables get
+    their float32 values back later.
+
+  Raises:
+    ValueError: if `mode` is not supported or not in eager mode.
+    NotImplementedError: if the TensorFlow release is not compatible.
+  """
+  if mode not in MODES:
+    raise ValueError("Unsupported quantization mode %r, expected one of %s."
+                     % (mode, MODES))
+  if not tf.executing_eagerly():
+    raise ValueError("Quantization requires eager mode.")
+  quantized = QuantizedVariables(variables, mode, call, sample_inputs)
+  report = quantized.report
+  logging.info("Quantized %d variables to %s: %s", quantized.num_variables,
+               mode, report)
+  return quantized, report
@@ -0,0 +1,125 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.quantization."""
+
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import quantization
+
+
+class QuantizationTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.RandomState(0)
+    # Rows of very different magnitude, like in an embedding table.
+    self.table_value = (rng.normal(size=[256, 16]) *
+                        np.logspace(-2, 1, 256)[:, None]).astype(np.float32)
+    self.table = tf.Variable(self.table_value)
+    self.bias = tf.Variable(tf.ones([16]))
+
+  def _lookup(self, ids):
+    return tf.gather(self.table, ids) + self.bias
+
+  def testInt8(self):
+    ids = tf.constant([0, 100, 255])
+    quantized, report = quantization.quantize(
+        [self.table, self.bias], "int8", self._lookup, ids)
+    self.assertEqual(report.num_variables, 1)
+    self.assertEqual(report.float_bytes, 256 * 16 * 4)
+    # One byte per value and a float32 scale per row.
+    self.assertEqual(report.quantized_bytes, 256 * 16 + 256 * 4)
+    self.assertEqual(report.saved_bytes, 256 * 16 * 3 - 256 * 4)
+    # At most half a quantization step of the largest row.
+    self.assertLessEqual(report.max_abs_error,
+                         np.abs(self.table_value[255]).max() / 254. + 1e-6)
+    self.assertLessEqual(report.mean_abs_error, report.max_abs_error)
+    # The float32 values are freed; small variables are kept.
+    self.assertEqual(self.table.read_value().shape, [0])
+    self.assertAllEqual(self.bias, tf.ones([16]))
+    # The table is only read by gathering rows.
+    graph = list(quantized._functions.values())[0]._function.graph
+    int8_reads = [op.type for op in graph.get_operations()
+                  if op.type in ("ReadVariableOp", "ResourceGather") and
+                  op.get_attr("dtype") == tf.int8]
+    self.assertEqual(int8_reads, ["ResourceGather"])
+    ids = tf.constant([[1, 2], [3, 4]])
+    row_steps = np.abs(self.table_value).max(axis=1, keepdims=True) / 127.
+    self.assertAllLessEqual(
+        np.abs(quantized.call(ids) - self.table_value[ids.numpy()] - 1.) -
+        row_steps[ids.numpy()] / 2, 1e-6)
+
+  def testInt8FullReads(self):
+    quantized, _ = quantization.quantize(
+        [self.table], "int8", lambda x: tf.matmul(x, self.table))
+    x = np.random.RandomState(1).normal(size=[3, 256]).astype(np.float32)
+    # At most half a quantization step of each row, times its factor.
+    row_steps = np.abs(self.table_value).max(axis=1) / 127.
+    self.assertAllLessEqual(
+        np.abs(quantized.call(x) - np.matmul(x, self.table_value)) -
+        np.matmul(np.abs(x), row_steps / 2.)[:, None], 1e-4)
+    # Gathers of single rows, with scales per column.
+    kernel = tf.Variable(self.table_value.T)
+    quantized, _ = quantization.quantize(
+        [kernel], "int8", lambda i: tf.gather(kernel, i))
+    self.assertAllLessEqual(
+        np.abs(quantized.call(tf.constant(3)) - self.table_value[:, 3]) -
+        row_steps / 2., 1e-6)
+
+  def testBfloat16InGraph(self):
+    quantized, report = quantization.quantize([self.table], "bfloat16",
+                                              self._lookup)
+    self.assertEqual(report.quantized_bytes, 256 * 16 * 2)
+    self.assertIsNone(report.max_abs_error)
+    lookup = tf.function(quantized.call)
+    self.assertAllClose(lookup(tf.constant([3, 200])),
+                        self.table_value[[3, 200]] + 1., rtol=0.01, atol=0.01)
+    self.assertEqual(self.table.read_value().shape, [0])
+
+  def testVariablesUsedInLoopsGetTheirValuesBack(self):
+    identity = np.eye(64, dtype=np.float32)
+    square = tf.Variable(identity)
+    def loop(x):
+      return tf.while_loop(lambda i, x: i < 2,
+                           lambda i, x: (i + 1, tf.matmul(x, square)),
+                           (0, x))[1]
+    quantized, report = quantization.quantize([square], "int8", loop)
+    self.assertEqual(report.num_variables, 1)
+    x = np.ones([1, 64], np.float32)
+    self.assertAllClose(quantized.call(x), x)
+    self.assertEqual(quantized.num_variables, 0)
+    self.assertAllClose(square, identity)
+    self.assertEqual(quantized.report.num_variables, 0)
+    self.assertEqual(quantized.report.float_bytes, 0)
+    self.assertEqual(quantized.report.quantized_bytes, 0)
+    self.assertEqual(quantized.report.saved_bytes, 0)
+
+  def testIncompatibleTensorFlowRelease(self):
+    quantized, _ = quantization.quantize([self.table], "int8", self._lookup)
+    with mock.patch.object(quantization.convert_to_constants,
+                           "_run_inline_graph_optimization", None):
+      with self.assertRaisesRegex(NotImplementedError,
+                                  "_run_inline_graph_optimization"):
+        quantized.call(tf.constant([1]))
+
+  def testUnsupportedMode(self):
+    with self.assertRaisesRegex(ValueError, "Unsupported quantization"):
+      quantization.quantize([self.table], "int4", self._lookup)
+
+
+if __name__ == "__main__":
+  tf.test.main()
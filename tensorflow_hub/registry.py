@@ -14,6 +14,9 @@
 # ==============================================================================
 """Internal. Registry holds python objects that can be injected."""
 
+import threading
+import time
+
 
 def _clear():
   """Clear resolvers and loaders."""
@@ -21,6 +24,14 @@ def _clear():
   loader.clear_implementations()
 
 
+def _handle_scheme(handle, *unused_args, **unused_kwargs):
+  """Returns the scheme of a handle ("http", "gs", ...) or "" for plain paths."""
+  if not isinstance(handle, str):
+    return None
+  scheme, sep, _ = handle.partition("://")
+  return scheme if sep else ""
+
+
 class MultiImplRegister(object):
   """Utility class to inject multiple implementations of methods.
 
@@ -28,31 +39,103 @@ class MultiImplRegister(object):
   set of arguments. The registered implementations "is_supported" methods are
   called in reverse order under which they are registered. The first to return
   true is then invoked via __call__ and the result returned.
+
+  If the register has a `dispatch_key_fn`, implementations can declare the
+  keys they are able to handle in a `dispatch_keys` attribute (None means any
+  key). The implementations to try for each key are compiled into a dispatch
+  table on first use, so only the candidates for that key are asked whether
+  they support the arguments. The table is rebuilt after implementations are
+  added or removed, or when refresh() is called.
   """
 
-  def __init__(self, name):
+  def __init__(self, name, dispatch_key_fn=None):
     self._name = name
     self._impls = []
+    self._dispatch_key_fn = dispatch_key_fn
+    self._dispatch_table = {}
+    self._stats = {}
+    # Implementations can be invoked from several threads at once.
+    self._stats_lock = threading.Lock()
 
   def clear_implementations(self):
     """Remove all implementations."""
     self._impls = []
+    self.refresh()
 
   def add_implementation(self, impl):
     """Register an implementation."""
     self._impls += [impl]
+    self.refresh()
 
-  def __call__(self, *args, **kwargs):
-    fails = []
-    for impl in reversed(self._impls):
+  def refresh(self):
+    """Drops the compiled dispatch table; it gets rebuilt on the next call."""
+    self._dispatch_table = {}
+
+  def stats(self):
+    """Returns a dict of call counts and latency per implementation type.
+
+    Keys are implementation class names, values are dicts with "calls" (the
+    number of invocations via this register) and "total_time_sec" (the total
+    wall time spent in those invocations, including failed ones).
+    """
+    with self._stats_lock:
+      return {name: dict(stats) for name, stats in self._stats.items()}
+
+  def reset_stats(self):
+    """Resets the statistics reported by stats()."""
+    with self._stats_lock:
+      self._stats = {}
+
+  def _candidates(self, key):
+    """Returns the implementations to try, in order, for a dispatch key."""
+    candidates = self._dispatch_table.get(key)
+    if candidates is None:
+      candidates = tuple(
+          impl for impl in reversed(self._impls)
+          if key is None or getattr(impl, "dispatch_keys", None) is None or
+          key in impl.dispatch_keys)
+      self._dispatch_table[key] = candidates
+    return candidates
+
+  def _invoke(self, impl, args, kwargs):
+    """Calls `impl` and records its call count and latency."""
+    start = time.time()
+    try:
+      return impl(*args, **kwargs)
+    finally:
+      elapsed = time.time() - start
+      with self._stats_lock:
+        stats = self._stats.setdefault(type(impl).__name__,
+                                       {"calls": 0, "total_time_sec": 0.0})
+        stats["calls"] += 1
+        stats["total_time_sec"] += elapsed
+
+  def _dispatch_key(self, *args, **kwargs):
+    if self._dispatch_key_fn is None:
+      return None
+    return self._dispatch_key_fn(*args, **kwargs)
+
+  def _find_implementation(self, candidates, args, kwargs):
+    for impl in candidates:
       if impl.is_supported(*args, **kwargs):
-        return impl(*args, **kwargs)
-      else:
-        fails.append(type(impl).__name__)
+        return impl
+    return None
+
+  def get_implementation(self, *args, **kwargs):
+    """Returns the implementation that would handle a call, or None."""
+    candidates = self._candidates(self._dispatch_key(*args, **kwargs))
+    return self._find_implementation(candidates, args, kwargs)
+
+  def __call__(self, *args, **kwargs):
+    candidates = self._candidates(self._dispatch_key(*args, **kwargs))
+    impl = self._find_implementation(candidates, args, kwargs)
+    if impl is not None:
+      return self._invoke(impl, args, kwargs)
+    fails = [type(impl).__name__ for impl in candidates]
     raise RuntimeError(
         "Missing implementation that supports: %s(*%r, **%r). Tried %r" %
         (self._name, args, kwargs, fails))
 
 
-resolver = MultiImplRegister("resolver")
+resolver = MultiImplRegister("resolver", dispatch_key_fn=_handle_scheme)
 loader = MultiImplRegister("loader")
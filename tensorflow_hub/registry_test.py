@@ -14,15 +14,18 @@
 # ==============================================================================
 """Tests for tensorflow_hub.registry."""
 
+import threading
+
 import tensorflow as tf
 from tensorflow_hub import registry
 
 
 class TestImpl(object):
 
-  def __init__(self, is_supported, execute):
+  def __init__(self, is_supported, execute, dispatch_keys=None):
     self._is_supported = is_supported
     self._execute = execute
+    self.dispatch_keys = dispatch_keys
 
   def is_supported(self, *args, **kwargs):
     return self._is_supported(*args, **kwargs)
@@ -71,6 +74,92 @@ class RegistryTest(tf.test.TestCase):
         r,
         1)
 
+  def testResolveOnlyAsksImplementationsForDispatchKey(self):
+    r = registry.MultiImplRegister("test", dispatch_key_fn=lambda x: x % 10)
+    r.add_implementation(TestImpl(lambda _: True, lambda _: 100))
+    r.add_implementation(TestImpl(fail_fn, fail_fn, dispatch_keys=(2,)))
+    r.add_implementation(TestImpl(lambda _: True, lambda _: 300,
+                                  dispatch_keys=(3,)))
+
+    self.assertEqual(r(1), 100)
+    self.assertEqual(r(13), 300)
+    self.assertEqual(r(23), 300)
+
+  def testDispatchTableIsRebuiltWhenAddingImplementations(self):
+    r = registry.MultiImplRegister("test", dispatch_key_fn=lambda x: x)
+    r.add_implementation(TestImpl(lambda _: True, lambda _: 100))
+    self.assertEqual(r(1), 100)
+    r.add_implementation(TestImpl(lambda _: True, lambda _: 200,
+                                  dispatch_keys=(1,)))
+    self.assertEqual(r(1), 200)
+
+  def testRefreshRecompilesDispatchTable(self):
+    r = registry.MultiImplRegister("test", dispatch_key_fn=lambda x: x)
+    impl = TestImpl(lambda _: True, lambda _: 100, dispatch_keys=(1,))
+    r.add_implementation(TestImpl(lambda _: True, lambda _: 200))
+    r.add_implementation(impl)
+    self.assertEqual(r(1), 100)
+    impl.dispatch_keys = (2,)
+    self.assertEqual(r(1), 100)
+    r.refresh()
+    self.assertEqual(r(1), 200)
+
+  def testStatsCountCallsPerImplementation(self):
+
+    class OtherImpl(TestImpl):
+      pass
+
+    r = registry.MultiImplRegister("test")
+    r.add_implementation(TestImpl(lambda x: x == 1, lambda _: 100))
+    r.add_implementation(OtherImpl(lambda x: x == 2, lambda _: 200))
+    r(1)
+    r(2)
+    r(2)
+
+    stats = r.stats()
+    self.assertEqual(stats["TestImpl"]["calls"], 1)
+    self.assertEqual(stats["OtherImpl"]["calls"], 2)
+    self.assertGreaterEqual(stats["OtherImpl"]["total_time_sec"], 0.0)
+    r.reset_stats()
+    self.assertEqual(r.stats(), {})
+
+  def testStatsCountFailedCalls(self):
+    r = registry.MultiImplRegister("test")
+    r.add_implementation(TestImpl(lambda _: True, fail_fn))
+
+    with self.assertRaises(AssertionError):
+      r(1)
+    self.assertEqual(r.stats()["TestImpl"]["calls"], 1)
+
+  def testStatsCountConcurrentCalls(self):
+    r = registry.MultiImplRegister("test")
+    r.add_implementation(TestImpl(lambda _: True, lambda _: None))
+
+    def call_many():
+      for _ in range(1000):
+        r(1)
+    threads = [threading.Thread(target=call_many) for _ in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertEqual(r.stats()["TestImpl"]["calls"], 8000)
+
+  def testGetImplementation(self):
+    r = registry.MultiImplRegister("test")
+    first = TestImpl(lambda x: x == 1, fail_fn)
+    r.add_implementation(first)
+
+    self.assertIs(r.get_implementation(1), first)
+    self.assertIsNone(r.get_implementation(2))
+
+  def testHandleScheme(self):
+    self.assertEqual(registry._handle_scheme("https://tfhub.dev/a/b/1"),
+                     "https")
+    self.assertEqual(registry._handle_scheme("gs://bucket/module"), "gs")
+    self.assertEqual(registry._handle_scheme("/tmp/module"), "")
+    self.assertIsNone(registry._handle_scheme(0))
+
 
 if __name__ == "__main__":
   tf.test.main()
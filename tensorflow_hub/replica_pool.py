@@ -0,0 +1,350 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Serves a model from several replicas with their own CPU threads.
+
+TensorFlow runs the ops of all calls in a process on the same thread pools,
+whose sizes are fixed once the runtime starts. Many small concurrent calls
+of one loaded model then compete for these threads. A ReplicaPool instead
+loads the model in several worker processes, each with its own, smaller
+thread pools and optionally pinned to its own CPUs, and sends every call to
+the replica with the fewest pending calls.
+"""
+
+import collections
+import multiprocessing
+import os
+import threading
+import time
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import module_v2
+
+# How long close() waits for each replica to exit before terminating it.
+_JOIN_TIMEOUT_SEC = 10.
+
+ReplicaStats = collections.namedtuple("ReplicaStats", [
+    # The index of the replica in the pool.
+    "replica",
+    # The process ID and the CPUs of the worker process (None if unpinned).
+    "pid",
+    "cpus",
+    # The number of calls the replica has completed.
+    "num_calls",
+    # The fraction of the time since the pool started that the replica spent
+    # running calls.
+    "utilization",
+    # The mean and max time in milliseconds that calls waited for the
+    # replica to finish earlier calls.
+    "mean_queueing_ms",
+    "max_queueing_ms",
+])
+
+
+def _to_numpy(structure):
+  return tf.nest.map_structure(
+      lambda x: x.numpy() if isinstance(x, tf.Tensor) else x, structure)
+
+
+def _replica_main(connection, handle, load_kwargs, signature, output_key,
+                  intra_op_threads, inter_op_threads, cpus):
+  """Runs in a worker process: loads the model and serves calls."""
+  try:
+    if cpus is not None:
+      os.sched_setaffinity(0, cpus)
+    # Must happen before the first op initializes the runtime.
+    if intra_op_threads:
+      tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    if inter_op_threads:
+      tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    obj = module_v2.load(handle, **load_kwargs)
+    if getattr(obj, "_is_hub_module_v1", False):
+      # Like hub.KerasLayer for the TF1 Hub format.
+      signature = signature or "default"
+      output_key = output_key or "default"
+    fn = obj.signatures[signature] if signature else obj
+  except Exception as e:  # pylint: disable=broad-except
+    connection.send(("error", _picklable_error(e)))
+    return
+  connection.send(("ready", None))
+  while True:
+    request = connection.recv()
+    if request is None:
+      return
+    args, kwargs = request
+    try:
+      result = fn(*args, **kwargs)
+      if output_key is not None:
+        result = result[output_key]
+      connection.send(("ok", _to_numpy(result)))
+    except Exception as e:  # pylint: disable=broad-except
+      connection.send(("error", _picklable_error(e)))
+
+
+def _picklable_error(error):
+  """Returns `error`, or a RuntimeError with its message if not picklable."""
+  try:
+    multiprocessing.reduction.ForkingPickler.dumps(error)
+    return error
+  except Exception:  # pylint: disable=broad-except
+    return RuntimeError("%s: %s" % (type(error).__name__, error))
+
+
+class _Replica(object):
+  """The parent's side of a worker process."""
+
+  def __init__(self, context, index, target_args, cpus):
+    self.index = index
+    self.cpus = cpus
+    self.lock = threading.Lock()
+    self.num_pending = 0
+    self.num_calls = 0
+    self.busy_sec = 0.
+    self.queueing_sec = 0.
+    self.max_queueing_sec = 0.
+    # Set when the connection to the worker process broke.
+    self.failed = False
+    self.connection, child_connection = context.Pipe()
+    self.process = context.Process(
+        target=_replica_main, args=(child_connection,) + target_args + (cpus,),
+        name="tfhub_replica_%d" % index, daemon=True)
+    self.process.start()
+    child_connection.close()
+
+  def wait_until_ready(self):
+    try:
+      status, error = self.connection.recv()
+    except EOFError:
+      raise RuntimeError("Replica %d exited while loading." % self.index)
+    if status == "error":
+      raise error
+
+  def is_alive(self):
+    return not self.failed and self.process.is_alive()
+
+  def call(self, args, kwargs, enqueue_time):
+    with self.lock:
+      start = time.time()
+      try:
+        self.connection.send((args, kwargs))
+        status, result = self.connection.recv()
+      except (EOFError, OSError):
+        self.failed = True
+        raise RuntimeError("Replica %d exited (exit code %s)." %
+                           (self.index, self.process.exitcode))
+      end = time.time()
+      self.num_calls += 1
+      self.busy_sec += end - start
+      self.queueing_sec += start - enqueue_time
+      self.max_queueing_sec = max(self.max_queueing_sec, start - enqueue_time)
+    if status == "error":
+      raise result
+    return result
+
+
+class ReplicaPool(object):
+  """Serves a model from several worker processes, see module docstring.
+
+  Example:
+
+  ```python
+  pool = hub.ReplicaPool(handle, replicas=4, cpu_affinity="auto")
+  def handle_request(text):  # Runs on many threads.
+    return pool(tf.constant([text]))[0]
+  ...
+  print(pool.stats())
+  pool.close()
+  ```
+
+  Calls can come from many threads. Each one is sent to the replica with
+  the fewest pending calls, as numpy arrays, and returns the output
+  tensors. Each replica runs one call at a time.
+
+  The worker processes are started with the "spawn" method of
+  multiprocessing, so the main module of the program must not start a pool
+  when it is imported, i.e., outside of `if __name__ == "__main__":`.
+  """
+
+  def __init__(self, handle, replicas=2, signature=None, output_key=None,
+               intra_op_threads=None, inter_op_threads=1, cpu_affinity=None,
+               share_variables=False, tags=None):
+    """Starts the replicas and waits until they have loaded the model.
+
+    Args:
+      handle: The handle of the model, see hub.load().
+      replicas: The number of worker processes.
+      signature: Optional. The name of the signature to call, like for
+        hub.KerasLayer. Signatures take their inputs as keyword arguments.
+      output_key: Optional. The name of the output to return if the called
+        function returns a dict, like for hub.KerasLayer.
+      intra_op_threads: Optional. The number of threads each replica uses
+        to run a single op. Defaults to its number of CPUs if `cpu_affinity`
+        is set, else to the CPUs of this process divided by `replicas`.
+      inter_op_threads: Optional. The number of ops each replica runs in
+        parallel. Defaults to 1, which suits small calls.
+      cpu_affinity: Optional. "auto" to split the CPUs of this process
+        evenly between the replicas (or give each one CPU, if there are
+        more replicas than CPUs), or a list with a set of CPU numbers
+        for each replica, which then only runs on them. Requires an
+        operating system with os.sched_setaffinity(), like Linux.
+      share_variables: Optional. If True, the replicas load the model with
+        `mmap_variables=True` (see hub.load()), so that they share one copy
+        of the values of its variables instead of one per replica.
+      tags: Optional. The tags of the graph variant to load, see hub.load().
+
+    Raises:
+      ValueError: if the arguments are invalid.
+      The errors of hub.load() in the replicas.
+    """
+    if replicas < 1:
+      raise ValueError("ReplicaPool needs at least one replica.")
+    available_cpus = sorted(os.sched_getaffinity(0)
+                            if hasattr(os, "sched_getaffinity")
+                            else range(os.cpu_count() or 1))
+    if cpu_affinity is not None and not hasattr(os, "sched_setaffinity"):
+      raise ValueError("cpu_affinity is not supported on this platform.")
+    if cpu_affinity == "auto":
+      if replicas <= len(available_cpus):
+        cpu_affinity = [
+            set(cpus) for cpus in np.array_split(available_cpus, replicas)]
+      else:  # Replicas have to share CPUs.
+        cpu_affinity = [{available_cpus[i % len(available_cpus)]}
+                        for i in range(replicas)]
+    if cpu_affinity is not None:
+      cpu_affinity = [set(int(cpu) for cpu in cpus) for cpus in cpu_affinity]
+      if len(cpu_affinity) != replicas or not all(cpu_affinity):
+        raise ValueError("cpu_affinity must have a non-empty set of CPUs for "
+                         "each of the %d replicas." % replicas)
+    load_kwargs = {"tags": tags}
+    if share_variables:
+      load_kwargs["mmap_variables"] = True
+    self._output_key = output_key
+    self._lock = threading.Lock()
+    self._closed = False
+    self._start_time = time.time()
+    # Forking a process that has started TensorFlow's threads is unsafe.
+    context = multiprocessing.get_context("spawn")
+    self._replicas = []
+    for index in range(replicas):
+      cpus = cpu_affinity[index] if cpu_affinity else None
+      threads = intra_op_threads or (
+          len(cpus) if cpus else max(1, len(available_cpus) // replicas))
+      target_args = (handle, load_kwargs, signature, output_key, threads,
+                     inter_op_threads)
+      self._replicas.append(_Replica(context, index, target_args, cpus))
+      if share_variables and index == 0:
+        # The first replica writes the variable cache that the others map,
+        # instead of all of them racing to write it.
+        self._wait_until_ready(self._replicas)
+    self._wait_until_ready(self._replicas[1 if share_variables else 0:])
+    logging.info("Started %d replicas of %s.", replicas, handle)
+
+  def _wait_until_ready(self, replicas):
+    try:
+      for replica in replicas:
+        replica.wait_until_ready()
+    except:
+      self.close()
+      raise
+
+  def _remove_dead_replicas(self):
+    """Stops routing calls to replicas whose process has exited."""
+    dead = [r for r in self._replicas if not r.is_alive()]
+    for replica in dead:
+      logging.warning("Replica %d exited (exit code %s); removing it from "
+                      "the pool.", replica.index, replica.process.exitcode)
+      self._replicas.remove(replica)
+      # In case only its connection broke.
+      replica.process.terminate()
+
+  def __call__(self, *args, **kwargs):
+    """Calls the model on the least busy replica and returns its outputs.
+
+    Replicas whose process has exited, e.g. because it ran out of memory,
+    are removed from the pool. The calls pending on them fail.
+
+    Raises:
+      ValueError: if the pool is closed.
+      RuntimeError: if the replica exited during the call, or all replicas
+        have exited.
+      The errors of the model.
+    """
+    enqueue_time = time.time()
+    args, kwargs = _to_numpy((args, kwargs))
+    with self._lock:
+      if self._closed:
+        raise ValueError("Calling a closed hub.ReplicaPool.")
+      self._remove_dead_replicas()
+      if not self._replicas:
+        raise RuntimeError("All replicas of the hub.ReplicaPool have exited.")
+      replica = min(self._replicas, key=lambda r: r.num_pending)
+      replica.num_pending += 1
+    try:
+      result = replica.call(args, kwargs, enqueue_time)
+    finally:
+      with self._lock:
+        replica.num_pending -= 1
+    return tf.nest.map_structure(tf.constant, result)
+
+  def stats(self):
+    """Returns a list of ReplicaStats, one per replica still in the pool."""
+    elapsed = max(time.time() - self._start_time, 1e-9)
+    stats = []
+    with self._lock:
+      replicas = list(self._replicas)
+    for r in replicas:
+      stats.append(ReplicaStats(
+          replica=r.index,
+          pid=r.process.pid,
+          cpus=sorted(r.cpus) if r.cpus else None,
+          num_calls=r.num_calls,
+          utilization=r.busy_sec / elapsed,
+          mean_queueing_ms=1000. * r.queueing_sec / max(r.num_calls, 1),
+          max_queueing_ms=1000. * r.max_queueing_sec))
+    return stats
+
+  def close(self):
+    """Stops the replicas once their current calls are done.
+
+    Replicas that do not exit within a few seconds after that are
+    terminated, and killed if that does not help either.
+    """
+    with self._lock:
+      replicas, self._replicas = self._replicas, []
+      self._closed = True
+    for replica in replicas:
+      with replica.lock:
+        try:
+          replica.connection.send(None)
+        except (BrokenPipeError, OSError):
+          pass  # The replica has exited already.
+        replica.connection.close()
+    for replica in replicas:
+      replica.process.join(_JOIN_TIMEOUT_SEC)
+      if replica.process.is_alive():
+        logging.warning("Terminating replica %d, which did not exit.",
+                        replica.index)
+        replica.process.terminate()
+        replica.process.join(_JOIN_TIMEOUT_SEC)
+      if replica.process.is_alive():
+        replica.process.kill()
+        replica.process.join()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *unused_exc_info):
+    self.close()
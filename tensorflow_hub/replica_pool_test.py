@@ -0,0 +1,105 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.replica_pool."""
+
+from concurrent import futures
+import os
+import signal
+from unittest import mock
+
+import tensorflow as tf
+from tensorflow_hub import replica_pool
+
+
+def _save_plus_one_model(export_dir):
+  obj = tf.train.Checkpoint()
+  obj.__call__ = tf.function(
+      lambda x: x + 1., input_signature=[tf.TensorSpec([None])])
+  tf.saved_model.save(obj, export_dir, signatures={
+      "serving_default": obj.__call__.get_concrete_function(),
+  })
+
+
+class ReplicaPoolTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_plus_one_model(self.model_dir)
+
+  def testCalls(self):
+    cpu_affinity = "auto" if hasattr(os, "sched_setaffinity") else None
+    with replica_pool.ReplicaPool(self.model_dir, replicas=2,
+                                  cpu_affinity=cpu_affinity) as pool:
+      with futures.ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(
+            lambda i: pool(tf.constant([float(i)])), range(20)))
+      self.assertAllEqual(results, [[i + 1.] for i in range(20)])
+      self.assertAllEqual(pool(x=tf.constant([1.])), [2.])
+      stats = pool.stats()
+      self.assertLen(stats, 2)
+      self.assertEqual(sum(s.num_calls for s in stats), 21)
+      self.assertLen(set(s.pid for s in stats), 2)
+      for s in stats:
+        self.assertBetween(s.utilization, 0., 1.)
+        self.assertGreaterEqual(s.max_queueing_ms, s.mean_queueing_ms)
+      if cpu_affinity and len(os.sched_getaffinity(0)) > 1:
+        self.assertEmpty(set(stats[0].cpus) & set(stats[1].cpus))
+      with self.assertRaisesRegex(Exception, "x"):
+        pool(tf.constant([[1.]]), tf.constant([2.]))
+    with self.assertRaisesRegex(ValueError, "closed"):
+      pool(tf.constant([1.]))
+
+  def testRemovesDeadReplicas(self):
+    with replica_pool.ReplicaPool(self.model_dir, replicas=2) as pool:
+      dead_pid = pool.stats()[0].pid
+      os.kill(dead_pid, signal.SIGKILL)
+      pool._replicas[0].process.join()
+      results = [pool(tf.constant([float(i)])) for i in range(4)]
+      self.assertAllEqual(results, [[i + 1.] for i in range(4)])
+      stats = pool.stats()
+      self.assertLen(stats, 1)
+      self.assertNotEqual(stats[0].pid, dead_pid)
+      self.assertEqual(stats[0].num_calls, 4)
+
+      os.kill(stats[0].pid, signal.SIGKILL)
+      with self.assertRaisesRegex(RuntimeError, "exited"):
+        pool(tf.constant([1.]))
+      with self.assertRaisesRegex(RuntimeError, "exited"):
+        pool(tf.constant([1.]))
+
+  def testCloseStopsUnresponsiveReplicas(self):
+    pool = replica_pool.ReplicaPool(self.model_dir, replicas=1)
+    process = pool._replicas[0].process
+    os.kill(process.pid, signal.SIGSTOP)
+    with mock.patch.object(replica_pool, "_JOIN_TIMEOUT_SEC", 0.1):
+      pool.close()
+    self.assertFalse(process.is_alive())
+
+  def testSignatureAndErrors(self):
+    with replica_pool.ReplicaPool(self.model_dir, replicas=1,
+                                  signature="serving_default",
+                                  output_key="output_0") as pool:
+      self.assertAllEqual(pool(x=tf.constant([1., 2.])), [2., 3.])
+    with self.assertRaisesRegex(ValueError, "cpu_affinity"):
+      replica_pool.ReplicaPool(self.model_dir, replicas=2,
+                               cpu_affinity=[{0}])
+    with self.assertRaises(Exception):
+      replica_pool.ReplicaPool(os.path.join(self.get_temp_dir(), "missing"),
+                               replicas=1)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -24,14 +24,15 @@ import sys
 import tarfile
 import tempfile
 import time
-import urllib
+import urllib.parse
+import urllib.request
 import uuid
 
 from absl import flags
 from absl import logging
-import tensorflow as tf
 from tensorflow_hub import file_utils
-from tensorflow_hub import tf_utils
+from tensorflow_hub import filesystem
+from tensorflow_hub import load_report
 
 
 FLAGS = flags.FLAGS
@@ -67,6 +68,11 @@ _TFHUB_MODEL_LOAD_FORMAT = "TFHUB_MODEL_LOAD_FORMAT"
 _TFHUB_DISABLE_CERT_VALIDATION = "TFHUB_DISABLE_CERT_VALIDATION"
 _TFHUB_DISABLE_CERT_VALIDATION_VALUE = "true"
 
+# Snapshot of settings that are consulted on every handle resolution. It is
+# filled lazily and only updated by refresh_settings().
+_settings_snapshot = {}
+
+
 def get_env_setting(env_var, flag_name):
   """Returns the environment variable or the specified flag."""
 
@@ -111,16 +117,40 @@ def tfhub_cache_dir(default_cache_dir=None, use_temp=False):
 
 
 def model_load_format():
-  """Returns the load mode to use."""
-  return get_env_setting(_TFHUB_MODEL_LOAD_FORMAT, "tfhub_model_load_format")
+  """Returns the load mode to use.
+
+  The value is read from TFHUB_MODEL_LOAD_FORMAT or --tfhub_model_load_format
+  on first use and then served from a snapshot, because resolvers consult it
+  for every handle. Call refresh_settings() after changing either of them.
+  """
+  if "model_load_format" not in _settings_snapshot:
+    _settings_snapshot["model_load_format"] = get_env_setting(
+        _TFHUB_MODEL_LOAD_FORMAT, "tfhub_model_load_format")
+  return _settings_snapshot["model_load_format"]
+
+
+def refresh_settings():
+  """Re-reads the environment variables and flags snapshotted by resolvers."""
+  _settings_snapshot.clear()
 
 
 def create_local_module_dir(cache_dir, module_name):
   """Creates and returns the name of directory where to cache a module."""
-  tf.compat.v1.gfile.MakeDirs(cache_dir)
+  filesystem.makedirs(cache_dir)
   return os.path.join(cache_dir, module_name)
 
 
+def _is_complete_download(module_dir):
+  """Returns whether `module_dir` holds a fully downloaded module."""
+  # Downloads are renamed into place once complete, see atomic_download().
+  return filesystem.exists(module_dir) and bool(filesystem.listdir(module_dir))
+
+
+def cached_module_dir(module_dir):
+  """Returns `module_dir` if it holds a complete download, otherwise None."""
+  return module_dir if _is_complete_download(module_dir) else None
+
+
 class DownloadManager(object):
   """Helper class responsible for TF-Hub module download and extraction."""
 
@@ -163,6 +193,7 @@ class DownloadManager(object):
       bytes_downloaded: Number of bytes downloaded.
     """
     self._total_bytes_downloaded += bytes_downloaded
+    load_report.add_bytes(bytes_downloaded)
     now = time.time()
     if (self._interactive_mode() or
         now - self._last_progress_msg_print_time > 15):
@@ -170,7 +201,7 @@ class DownloadManager(object):
       # tracking is enabled.
       self._print_download_progress_msg(
           "Downloading %s: %s" % (self._url,
-                                  tf_utils.bytes_to_readable_str(
+                                  filesystem.bytes_to_readable_str(
                                       self._total_bytes_downloaded, True)))
       self._last_progress_msg_print_time = now
 
@@ -191,7 +222,7 @@ class DownloadManager(object):
     try:
       file_utils.extract_tarfile_to_destination(
           fileobj, dst_path, log_function=self._log_progress)
-      total_size_str = tf_utils.bytes_to_readable_str(
+      total_size_str = filesystem.bytes_to_readable_str(
           self._total_bytes_downloaded, True)
       self._print_download_progress_msg(
           "Downloaded %s, Total size: %s" % (self._url, total_size_str),
@@ -225,7 +256,7 @@ def _write_module_descriptor_file(handle, module_dir):
   # The descriptor file has no semantic meaning so we allow 'overwrite' since
   # there is a chance that another process might have written the file (and
   # crashed), we just overwrite it.
-  tf_utils.atomic_write_string_to_file(readme, readme_content, overwrite=True)
+  filesystem.atomic_write_string_to_file(readme, readme_content, overwrite=True)
 
 
 def _lock_file_contents(task_uid):
@@ -235,7 +266,7 @@ def _lock_file_contents(task_uid):
 
 def _lock_filename(module_dir):
   """Returns lock file name."""
-  return tf_utils.absolute_path(module_dir) + ".lock"
+  return filesystem.absolute_path(module_dir) + ".lock"
 
 
 def _module_dir(lock_filename):
@@ -255,23 +286,18 @@ def _module_dir(lock_filename):
 
 def _task_uid_from_lock_file(lock_filename):
   """Returns task UID of the task that created a given lock file."""
-  lock = tf_utils.read_file_to_string(lock_filename)
+  lock = filesystem.read_file_to_string(lock_filename)
   return lock.split(".")[-1]
 
 
 def _temp_download_dir(module_dir, task_uid):
   """Returns the name of a temporary directory to download module to."""
-  return "{}.{}.tmp".format(tf_utils.absolute_path(module_dir), task_uid)
+  return "{}.{}.tmp".format(filesystem.absolute_path(module_dir), task_uid)
 
 
 def _dir_size(directory):
   """Returns total size (in bytes) of the given 'directory'."""
-  size = 0
-  for elem in tf.compat.v1.gfile.ListDirectory(directory):
-    elem_full_path = os.path.join(directory, elem)
-    stat = tf.compat.v1.gfile.Stat(elem_full_path)
-    size += _dir_size(elem_full_path) if stat.is_directory else stat.length
-  return size
+  return filesystem.dir_size(directory)
 
 
 def _locked_tmp_dir_size(lock_filename):
@@ -280,7 +306,7 @@ def _locked_tmp_dir_size(lock_filename):
   try:
     return _dir_size(
         _temp_download_dir(_module_dir(lock_filename), task_uid))
-  except tf.errors.NotFoundError:
+  except filesystem.error_types("NotFoundError"):
     return 0
 
 
@@ -303,18 +329,18 @@ def _wait_for_lock_to_disappear(handle, lock_file, lock_file_timeout_sec):
   locked_tmp_dir_size = 0
   locked_tmp_dir_size_check_time = time.time()
   lock_file_content = None
-  while tf.compat.v1.gfile.Exists(lock_file):
+  while filesystem.exists(lock_file):
     try:
       logging.log_every_n(
           logging.INFO,
           "Module '%s' already being downloaded by '%s'. Waiting.", 10,
-          handle, tf_utils.read_file_to_string(lock_file))
+          handle, filesystem.read_file_to_string(lock_file))
       if (time.time() - locked_tmp_dir_size_check_time >
           lock_file_timeout_sec):
         # Check whether the holder of the current lock downloaded anything
         # in its temporary directory in the last 'lock_file_timeout_sec'.
         cur_locked_tmp_dir_size = _locked_tmp_dir_size(lock_file)
-        cur_lock_file_content = tf_utils.read_file_to_string(lock_file)
+        cur_lock_file_content = filesystem.read_file_to_string(lock_file)
         if (cur_locked_tmp_dir_size == locked_tmp_dir_size and
             cur_lock_file_content == lock_file_content):
           # There is was no data downloaded in the past
@@ -322,12 +348,12 @@ def _wait_for_lock_to_disappear(handle, lock_file, lock_file_timeout_sec):
           # local download.
           logging.warning("Deleting lock file %s due to inactivity.",
                           lock_file)
-          tf.compat.v1.gfile.Remove(lock_file)
+          filesystem.remove(lock_file)
           break
         locked_tmp_dir_size = cur_locked_tmp_dir_size
         locked_tmp_dir_size_check_time = time.time()
         lock_file_content = cur_lock_file_content
-    except tf.errors.NotFoundError:
+    except filesystem.error_types("NotFoundError"):
       # Lock file or temp directory were deleted during check. Continue
       # to check whether download succeeded or we need to start our own
       # download.
@@ -357,7 +383,8 @@ def atomic_download(handle,
 
   Raises:
     ValueError: if the Module is not found.
-    tf.errors.OpError: file I/O failures raise the appropriate subtype.
+    tf.errors.OpError: file I/O failures raise the appropriate subtype (see
+      filesystem.error_types() for when TensorFlow is not imported).
   """
   lock_file = _lock_filename(module_dir)
   task_uid = uuid.uuid4().hex
@@ -365,9 +392,7 @@ def atomic_download(handle,
   tmp_dir = _temp_download_dir(module_dir, task_uid)
 
   # Function to check whether model has already been downloaded.
-  check_module_exists = lambda: (
-      tf.compat.v1.gfile.Exists(module_dir) and tf.compat.v1.gfile.
-      ListDirectory(module_dir))
+  check_module_exists = lambda: _is_complete_download(module_dir)
 
   # Check whether the model has already been downloaded before locking
   # the destination path.
@@ -380,42 +405,44 @@ def atomic_download(handle,
   try:
     while True:
       try:
-        tf_utils.atomic_write_string_to_file(lock_file, lock_contents,
+        filesystem.atomic_write_string_to_file(lock_file, lock_contents,
                                              overwrite=False)
         # Must test condition again, since another process could have created
         # the module and deleted the old lock file since last test.
         if check_module_exists():
           # Lock file will be deleted in the finally-clause.
           return module_dir
-        if tf.compat.v1.gfile.Exists(module_dir):
-          tf.compat.v1.gfile.DeleteRecursively(module_dir)
+        if filesystem.exists(module_dir):
+          filesystem.rmtree(module_dir)
         break  # Proceed to downloading the module.
       # These errors are believed to be permanent problems with the
       # module_dir that justify failing the download.
-      except (tf.errors.NotFoundError,
-              tf.errors.PermissionDeniedError,
-              tf.errors.UnauthenticatedError,
-              tf.errors.ResourceExhaustedError,
-              tf.errors.InternalError,
-              tf.errors.InvalidArgumentError,
-              tf.errors.UnimplementedError):
+      except filesystem.error_types("NotFoundError",
+                                    "PermissionDeniedError",
+                                    "UnauthenticatedError",
+                                    "ResourceExhaustedError",
+                                    "InternalError",
+                                    "InvalidArgumentError",
+                                    "UnimplementedError"):
         raise
       # All other errors are retried.
-      except tf.errors.OpError:
+      except filesystem.error_types("OpError"):
         pass
 
       # Wait for lock file to disappear.
-      _wait_for_lock_to_disappear(handle, lock_file, lock_file_timeout_sec)
+      with load_report.phase("wait_for_lock"):
+        _wait_for_lock_to_disappear(handle, lock_file, lock_file_timeout_sec)
       # At this point we either deleted a lock or a lock got removed by the
       # owner or another process. Perform one more iteration of the while-loop,
-      # we would either terminate due tf.compat.v1.gfile.Exists(module_dir) or
+      # we would either terminate due filesystem.exists(module_dir) or
       # because we would obtain a lock ourselves, or wait again for the lock to
       # disappear.
 
     # Lock file acquired.
     logging.info("Downloading TF-Hub Module '%s'.", handle)
-    tf.compat.v1.gfile.MakeDirs(tmp_dir)
-    download_fn(handle, tmp_dir)
+    filesystem.makedirs(tmp_dir)
+    with load_report.phase("download"):
+      download_fn(handle, tmp_dir)
     # Write module descriptor to capture information about which module was
     # downloaded by whom and when. The file stored at the same level as a
     # directory in order to keep the content of the 'model_dir' exactly as it
@@ -427,26 +454,26 @@ def atomic_download(handle,
     # content.
     _write_module_descriptor_file(handle, module_dir)
     try:
-      tf.compat.v1.gfile.Rename(tmp_dir, module_dir)
+      filesystem.rename(tmp_dir, module_dir)
       logging.info("Downloaded TF-Hub Module '%s'.", handle)
-    except tf.errors.AlreadyExistsError:
+    except filesystem.error_types("AlreadyExistsError"):
       logging.warning("Module already exists in %s", module_dir)
 
   finally:
     try:
       # Temp directory is owned by the current process, remove it.
-      tf.compat.v1.gfile.DeleteRecursively(tmp_dir)
-    except tf.errors.NotFoundError:
+      filesystem.rmtree(tmp_dir)
+    except filesystem.error_types("NotFoundError"):
       pass
     try:
-      contents = tf_utils.read_file_to_string(lock_file)
-    except tf.errors.NotFoundError:
+      contents = filesystem.read_file_to_string(lock_file)
+    except filesystem.error_types("NotFoundError"):
       contents = ""
     if contents == lock_contents:
       # Lock file exists and is owned by this process.
       try:
-        tf.compat.v1.gfile.Remove(lock_file)
-      except tf.errors.NotFoundError:
+        filesystem.remove(lock_file)
+      except filesystem.error_types("NotFoundError"):
         pass
 
   return module_dir
@@ -456,6 +483,10 @@ class Resolver(object):
   """Resolver base class: all resolvers inherit from this class."""
   __metaclass__ = abc.ABCMeta
 
+  # Handle schemes (e.g. "gs", or "" for plain paths) this resolver can ever
+  # support, used by the registry to skip resolvers quickly. None means any.
+  dispatch_keys = None
+
   @abc.abstractmethod
   def __call__(self, handle):
     """Resolves a handle into a Module path.
@@ -492,7 +523,7 @@ class PathResolver(Resolver):
     return True
 
   def __call__(self, handle):
-    if not tf.compat.v1.gfile.Exists(handle):
+    if not filesystem.exists(handle):
       raise IOError("%s does not exist." % handle)
     return handle
 
@@ -500,6 +531,8 @@ class PathResolver(Resolver):
 class HttpResolverBase(Resolver):
   """Base class for HTTP-based resolvers."""
 
+  dispatch_keys = ("http", "https")
+
   def __init__(self):
     self._context = ssl.create_default_context()
     self._maybe_disable_cert_validation()
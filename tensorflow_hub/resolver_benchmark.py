@@ -0,0 +1,93 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks cache hits of the resolver, and importing it without TF.
+
+A cache hit of a downloaded model checks the module directory on every
+hub.resolve(). This compares local paths, which use `os` directly, with the
+same directory accessed through tf.io.gfile (as a "file://" URL). It also
+measures importing the resolvers in a fresh process with the package's
+__init__.py bypassed, which shows that they do not import TensorFlow.
+
+Run with `python -m tensorflow_hub.resolver_benchmark`.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import tensorflow as tf
+from tensorflow_hub import filesystem
+from tensorflow_hub import resolver
+
+_ITERS = 2000
+_ROUNDS = 3
+
+_IMPORT_SCRIPT = """
+import sys, time, types
+package = types.ModuleType("tensorflow_hub")
+package.__path__ = [%r]
+sys.modules["tensorflow_hub"] = package
+start = time.perf_counter()
+from tensorflow_hub import config
+print(time.perf_counter() - start, "tensorflow" in sys.modules)
+"""
+
+
+def _fail_download(handle, unused_tmp_dir):
+  raise AssertionError("%s must be a cache hit." % handle)
+
+
+class ResolverBenchmark(tf.test.Benchmark):
+  """Measures the resolver without the cost of downloading."""
+
+  def _run(self, name, fn):
+    # The fastest round is the least disturbed by other load on the machine.
+    wall_time = float("inf")
+    for _ in range(_ROUNDS):
+      start = time.perf_counter()
+      for _ in range(_ITERS):
+        fn()
+      wall_time = min(wall_time, (time.perf_counter() - start) / _ITERS)
+    self.report_benchmark(name=name, iters=_ITERS, wall_time=wall_time,
+                          extras={"us_per_call": wall_time * 1e6})
+
+  def benchmark_cache_hit(self):
+    module_dir = os.path.join(tempfile.mkdtemp(), "module")
+    filesystem.makedirs(module_dir)
+    filesystem.atomic_write_string_to_file(
+        os.path.join(module_dir, "saved_model.pb"), "", overwrite=False)
+    for name, path in [("local_path", module_dir),
+                       ("gfile_url", "file://" + module_dir)]:
+      self._run("cache_hit_" + name, lambda path=path: resolver.atomic_download(
+          "handle", _fail_download, path))
+
+  def benchmark_import_without_tensorflow(self):
+    script = _IMPORT_SCRIPT % os.path.dirname(filesystem.__file__)
+    wall_time = float("inf")
+    for _ in range(_ROUNDS):
+      output = subprocess.run([sys.executable, "-c", script], check=True,
+                              capture_output=True, text=True).stdout.split()
+      if output[1] != "False":
+        raise AssertionError("Importing the resolvers imported TensorFlow.")
+      wall_time = min(wall_time, float(output[0]))
+    self.report_benchmark(name="import_resolvers", iters=1,
+                          wall_time=wall_time)
+
+
+if __name__ == "__main__":
+  ResolverBenchmark().benchmark_cache_hit()
+  ResolverBenchmark().benchmark_import_without_tensorflow()
@@ -29,6 +29,7 @@ import tensorflow as tf
 import tensorflow_hub as hub
 from tensorflow_hub import compressed_module_resolver
 from tensorflow_hub import config
+from tensorflow_hub import filesystem
 from tensorflow_hub import registry
 from tensorflow_hub import resolver
 from tensorflow_hub import test_utils
@@ -258,11 +259,11 @@ class CompressedResolverTest(tf.test.TestCase):
         (re.escape(socket.gethostname()), os.getpid()))
 
     # Try downloading the model again. Mock
-    # tf_utils.atomic_write_string_to_file() to throw an exception. Since the
+    # filesystem.atomic_write_string_to_file() to throw an exception. Since the
     # model is already downloaded, the function will never get called and the
     # download succeeds.
     with mock.patch.object(
-        tf_utils,
+        filesystem,
         "atomic_write_string_to_file",
         side_effect=ValueError("This error should never be raised!")):
       self.assertEqual(
@@ -375,7 +376,7 @@ class CompressedResolverTest(tf.test.TestCase):
 
   def testNotFoundGCSBucket(self):
     # When trying to use not existing GCS bucket, test that
-    # tf_util.atomic_write_string_to_file raises tf.error.NotFoundError.
+    # filesystem.atomic_write_string_to_file raises tf.error.NotFoundError.
     # Other errors that may arise from bad network connectivity are ignored by
     # resolver.atomic_download and retried infinitely.
     module_dir = ""
@@ -387,7 +388,7 @@ class CompressedResolverTest(tf.test.TestCase):
     # Simulate missing GCS bucket by raising NotFoundError in
     # atomic_write_string_to_file.
     with unittest.mock.patch(
-        "tensorflow_hub.tf_utils.atomic_write_string_to_file") as mock_:
+        "tensorflow_hub.filesystem.atomic_write_string_to_file") as mock_:
       mock_.side_effect = tf.errors.NotFoundError(None, None, "Test")
       try:
         resolver.atomic_download("module", dummy_download_fn, module_dir)
@@ -450,6 +451,14 @@ class LoadFormatResolverBehaviorTest(tf.test.TestCase):
     with test_utils.UncompressedLoadFormatContext():
       self._assert_uncompressed_resolver_called()
 
+  def test_load_format_is_snapshotted_until_refresh(self):
+    with test_utils.UncompressedLoadFormatContext():
+      os.environ[resolver._TFHUB_MODEL_LOAD_FORMAT] = (
+          resolver.ModelLoadFormat.COMPRESSED.value)
+      self._assert_uncompressed_resolver_called()
+      resolver.refresh_settings()
+      self._assert_compressed_resolver_called()
+
 
 if __name__ == "__main__":
   # Make OSS configuration used for resolvers/loaders.
@@ -0,0 +1,321 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Prunes TF1 SavedModels to a single signature before loading them.
+
+Loading a TF1 SavedModel (including the TF1 Hub format) in TF2 imports its
+whole graph and restores all of its variables, even if only one signature
+gets used. The pruned copy written here keeps only the nodes needed by one
+signature and its initializers, and a saver that restores only the variables
+used by them. The checkpoint and assets of the original are linked (or, where
+that is not possible, copied), so restoring reads only the used variables.
+
+The pruned copy is cached next to the module directory if that is local and
+writable, otherwise in the TF-Hub cache directory.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+import tensorflow as tf
+from tensorflow_hub import filesystem
+from tensorflow_hub import meta_graph_lib
+from tensorflow_hub import resolver
+from tensorflow_hub import saved_model_lib
+
+# pylint: disable=g-direct-tensorflow-import
+from tensorflow.core.framework import variable_pb2
+from tensorflow.core.protobuf import control_flow_pb2
+from tensorflow.core.protobuf import meta_graph_pb2
+from tensorflow.core.protobuf import saved_model_pb2
+# pylint: enable=g-direct-tensorflow-import
+
+_PRUNED_SUFFIX = ".pruned-"
+_INIT_OP_SIGNATURE_KEY = "__saved_model_init_op"
+_INIT_OP_COLLECTIONS = ("saved_model_main_op", "legacy_init_op")
+_SAVERS_COLLECTION = "savers"
+_SAVER_NAME = "pruned_save"
+_VARIABLE_COLLECTIONS = frozenset([
+    tf.compat.v1.GraphKeys.GLOBAL_VARIABLES,
+    tf.compat.v1.GraphKeys.LOCAL_VARIABLES,
+    tf.compat.v1.GraphKeys.METRIC_VARIABLES,
+    tf.compat.v1.GraphKeys.MODEL_VARIABLES,
+    tf.compat.v1.GraphKeys.MOVING_AVERAGE_VARIABLES,
+    tf.compat.v1.GraphKeys.TRAINABLE_VARIABLES,
+])
+_CONTEXT_COLLECTIONS = {
+    "cond_context": control_flow_pb2.CondContextDef,
+    "while_context": control_flow_pb2.WhileContextDef,
+}
+# Files of a module that are not covered by saved_model.pb.
+_MODULE_FILES = (
+    tf.compat.v1.saved_model.VARIABLES_DIRECTORY,
+    tf.compat.v1.saved_model.ASSETS_DIRECTORY,
+    "tfhub_module.pb",
+)
+
+
+def _op_name(name):
+  """Returns the op name of a tensor or control input name."""
+  return tf.compat.as_str(name).lstrip("^").split(":")[0]
+
+
+def _is_tf1_saved_model(saved_model):
+  """Returns whether no MetaGraph has a TF2 object graph."""
+  return not any(meta_graph.object_graph_def.nodes
+                 for meta_graph in saved_model.meta_graphs)
+
+
+def _select_meta_graph(saved_model, tags):
+  """Returns the MetaGraph with `tags`, like tf.saved_model.load() does."""
+  if tags is None:
+    if len(saved_model.meta_graphs) != 1:
+      raise ValueError("SavedModel has %d MetaGraphs, tags must be specified." %
+                       len(saved_model.meta_graphs))
+    return saved_model.meta_graphs[0]
+  tags = set([tags] if isinstance(tags, str) else tags)
+  for meta_graph in saved_model.meta_graphs:
+    if set(meta_graph.meta_info_def.tags) == tags:
+      return meta_graph
+  raise ValueError("SavedModel has no MetaGraph with tags %r." % sorted(tags))
+
+
+def _filter_collections(meta_graph, kept):
+  """In-place removes collection entries that refer to pruned nodes."""
+  for key in list(meta_graph.collection_def.keys()):
+    if key == _SAVERS_COLLECTION:
+      del meta_graph.collection_def[key]
+      continue
+    collection = meta_graph.collection_def[key]
+    kind = collection.WhichOneof("kind")
+    if kind == "node_list":
+      values = [v for v in collection.node_list.value if _op_name(v) in kept]
+      del collection.node_list.value[:]
+      collection.node_list.value.extend(values)
+    elif kind == "bytes_list" and (key in _VARIABLE_COLLECTIONS or
+                                   key in _CONTEXT_COLLECTIONS):
+      values = []
+      for value in collection.bytes_list.value:
+        if key in _VARIABLE_COLLECTIONS:
+          proto = variable_pb2.VariableDef.FromString(value)
+          name = proto.variable_name
+        else:
+          proto = _CONTEXT_COLLECTIONS[key].FromString(value)
+          name = proto.pivot_name
+        if _op_name(name) in kept:
+          values.append(value)
+      del collection.bytes_list.value[:]
+      collection.bytes_list.value.extend(values)
+    elif kind == "any_list" and key == tf.compat.v1.saved_model.ASSETS_KEY:
+      values = []
+      for value in collection.any_list.value:
+        asset = meta_graph_pb2.AssetFileDef()
+        value.Unpack(asset)
+        if _op_name(asset.tensor_info.name) in kept:
+          values.append(value)
+      del collection.any_list.value[:]
+      collection.any_list.value.extend(values)
+  assets = [asset for asset in meta_graph.asset_file_def
+            if _op_name(asset.tensor_info.name) in kept]
+  del meta_graph.asset_file_def[:]
+  meta_graph.asset_file_def.extend(assets)
+
+
+def prune_meta_graph(meta_graph, signature_name):
+  """Returns a copy of `meta_graph` with only what a signature needs.
+
+  Kept are the nodes needed to compute the signature's outputs from its
+  inputs, the init ops of the MetaGraph, the table initializers of the tables
+  used by the signature, and the variables used by any of them, together with
+  a new saver for just these variables.
+
+  Args:
+    meta_graph: A TF1 MetaGraphDef.
+    signature_name: The name of the signature to keep.
+
+  Returns:
+    The pruned MetaGraphDef.
+
+  Raises:
+    ValueError: if `meta_graph` has no signature `signature_name`.
+  """
+  if signature_name not in meta_graph.signature_def:
+    raise ValueError("Unknown signature %s (available signatures: %s)." %
+                     (signature_name, sorted(meta_graph.signature_def)))
+  signature = meta_graph.signature_def[signature_name]
+  graph = tf.Graph()
+  with graph.as_default():
+    tf.compat.v1.train.import_meta_graph(meta_graph)
+    get_op = lambda name: graph.get_operation_by_name(_op_name(name))
+
+    tensors = list(signature.inputs.values()) + list(signature.outputs.values())
+    kept = meta_graph_lib.mark_backward_from_ops(
+        get_op(t.name) for t in tensors)
+    roots = []
+    if _INIT_OP_SIGNATURE_KEY in meta_graph.signature_def:
+      init_signature = meta_graph.signature_def[_INIT_OP_SIGNATURE_KEY]
+      roots.extend(get_op(t.name) for t in init_signature.outputs.values())
+    for key in _INIT_OP_COLLECTIONS:
+      roots.extend(item if isinstance(item, tf.Operation) else item.op
+                   for item in graph.get_collection(key))
+    # The first input of a table initializer is the table.
+    roots.extend(
+        op for op in graph.get_collection(
+            tf.compat.v1.GraphKeys.TABLE_INITIALIZERS)
+        if op.inputs and op.inputs[0].op.name in kept)
+    kept |= meta_graph_lib.mark_backward_from_ops(roots)
+
+    # Keep what is needed to recreate the used variables on import.
+    variables = [
+        v for v in (tf.compat.v1.global_variables() +
+                    tf.compat.v1.local_variables())
+        if v.op.name in kept
+    ]
+    roots = []
+    for variable in variables:
+      variable_def = variable.to_proto()
+      roots.extend(get_op(name) for name in (
+          variable_def.variable_name, variable_def.initializer_name,
+          variable_def.snapshot_name, variable_def.initial_value_name) if name)
+    kept |= meta_graph_lib.mark_backward_from_ops(roots)
+
+    global_variables = set(id(v) for v in tf.compat.v1.global_variables())
+    saved_variables = [v for v in variables if id(v) in global_variables]
+    saver = None
+    if saved_variables:
+      saver = tf.compat.v1.train.Saver(
+          var_list=saved_variables, sharded=True, name=_SAVER_NAME)
+      kept |= meta_graph_lib.mark_backward_from_ops([
+          get_op(saver.saver_def.restore_op_name),
+          get_op(saver.saver_def.save_tensor_name),
+      ])
+    graph_def = graph.as_graph_def()
+
+  pruned = meta_graph_pb2.MetaGraphDef()
+  pruned.CopyFrom(meta_graph)
+  # Keep the original NodeDefs, plus the new ones of the saver.
+  original_names = set(node.name for node in meta_graph.graph_def.node)
+  del pruned.graph_def.node[:]
+  pruned.graph_def.node.extend(
+      node for node in meta_graph.graph_def.node if node.name in kept)
+  pruned.graph_def.node.extend(
+      node for node in graph_def.node
+      if node.name in kept and node.name not in original_names)
+  if saver is not None:
+    pruned.saver_def.CopyFrom(saver.saver_def)
+  else:
+    pruned.ClearField("saver_def")
+  for name in list(pruned.signature_def.keys()):
+    if name not in (signature_name, _INIT_OP_SIGNATURE_KEY):
+      del pruned.signature_def[name]
+  _filter_collections(pruned, kept)
+  return pruned
+
+
+def _cache_path(module_path, tags, signature_name):
+  """Returns where to cache the pruned copy of a module."""
+  module_path = tf.compat.as_str(module_path).rstrip("/")
+  stat = filesystem.stat(
+      os.path.join(module_path, tf.saved_model.SAVED_MODEL_FILENAME_PB))
+  key = json.dumps([
+      None if tags is None else sorted([tags] if isinstance(tags, str)
+                                       else tags),
+      signature_name,
+      # Re-exporting the module to the same path invalidates the cache.
+      stat.length, stat.mtime_nsec,
+  ])
+  digest = hashlib.sha1(key.encode("utf8")).hexdigest()[:16]
+  parent = os.path.dirname(os.path.abspath(module_path))
+  if filesystem.is_local(module_path) and os.access(parent, os.W_OK):
+    return module_path + _PRUNED_SUFFIX + digest
+  return os.path.join(
+      resolver.tfhub_cache_dir(use_temp=True),
+      hashlib.sha1(module_path.encode("utf8")).hexdigest() + _PRUNED_SUFFIX +
+      digest)
+
+
+def _link_or_copy(src, dst):
+  """Recreates file or directory `src` as `dst`, hard-linking if possible."""
+  if filesystem.isdir(src):
+    filesystem.makedirs(dst)
+    for name in filesystem.listdir(src):
+      _link_or_copy(os.path.join(src, name), os.path.join(dst, name))
+    return
+  if filesystem.is_local(src) and filesystem.is_local(dst):
+    try:
+      os.link(src, dst)
+      return
+    except OSError:
+      pass  # E.g., across devices; copy instead.
+  tf.io.gfile.copy(src, dst, overwrite=True)
+
+
+def _write_pruned_module(saved_model, module_path, tags, signature_name,
+                         export_dir):
+  """Writes the pruned copy of a module to `export_dir`."""
+  pruned = saved_model_pb2.SavedModel()
+  pruned.saved_model_schema_version = saved_model.saved_model_schema_version
+  pruned.meta_graphs.add().CopyFrom(prune_meta_graph(
+      _select_meta_graph(saved_model, tags), signature_name))
+  filesystem.makedirs(export_dir)
+  with filesystem.open_file(
+      os.path.join(export_dir, tf.saved_model.SAVED_MODEL_FILENAME_PB),
+      "wb") as f:
+    f.write(pruned.SerializeToString())
+  for name in _MODULE_FILES:
+    src = os.path.join(module_path, name)
+    if filesystem.exists(src):
+      _link_or_copy(src, os.path.join(export_dir, name))
+
+
+def pruned_module_path(module_path, tags, signature_name):
+  """Returns the path of a copy of a module pruned to one signature.
+
+  The copy is created on first use and cached, see the module docstring.
+
+  Args:
+    module_path: The resolved module directory.
+    tags: The tags of the MetaGraph to load, as for hub.load().
+    signature_name: The name of the signature to keep.
+
+  Returns:
+    The path of the pruned copy, or None if the module is not a TF1
+    SavedModel (or is stored as a text proto), which is not pruned.
+
+  Raises:
+    ValueError: if the module has no such MetaGraph or signature.
+  """
+  module_path = tf.compat.as_str(module_path)
+  if not filesystem.exists(
+      os.path.join(module_path, tf.saved_model.SAVED_MODEL_FILENAME_PB)):
+    return None
+  saved_model = saved_model_lib._parse_saved_model(module_path)  # pylint: disable=protected-access
+  if not _is_tf1_saved_model(saved_model):
+    return None
+  path = _cache_path(module_path, tags, signature_name)
+  if filesystem.exists(path):
+    return path
+  tmp_dir = "%s.tmp%s" % (path, uuid.uuid4().hex)
+  try:
+    _write_pruned_module(saved_model, module_path, tags, signature_name,
+                         tmp_dir)
+    filesystem.rename(tmp_dir, path)
+  except tf.errors.AlreadyExistsError:
+    pass  # Another process pruned it concurrently.
+  finally:
+    if filesystem.exists(tmp_dir):
+      filesystem.rmtree(tmp_dir)
+  return path
@@ -0,0 +1,112 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.signature_pruning."""
+
+import os
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import module_v2
+from tensorflow_hub import signature_pruning
+
+
+def _save_tf1_model(export_dir, vocab_file):
+  """Saves a model with a small "default" and a big "large" signature."""
+  with tf.Graph().as_default():
+    words = tf.compat.v1.placeholder(tf.string, [None])
+    table = tf.compat.v1.lookup.StaticHashTable(
+        tf.compat.v1.lookup.TextFileInitializer(
+            vocab_file, tf.string, tf.compat.v1.lookup.TextFileIndex.WHOLE_LINE,
+            tf.int64, tf.compat.v1.lookup.TextFileIndex.LINE_NUMBER),
+        default_value=-1)
+    scale = tf.compat.v1.get_variable("scale", initializer=2.0)
+    ids = scale * tf.cast(table.lookup(words), tf.float32)
+
+    x = tf.compat.v1.placeholder(tf.float32, [None, 1000])
+    big = tf.compat.v1.get_variable(
+        "big", initializer=np.ones([1000, 1000], dtype=np.float32))
+    y = tf.matmul(x, big)
+    with tf.compat.v1.Session() as sess:
+      sess.run([tf.compat.v1.global_variables_initializer(),
+                tf.compat.v1.tables_initializer()])
+      builder = tf.compat.v1.saved_model.Builder(export_dir)
+      builder.add_meta_graph_and_variables(
+          sess, ["serve"],
+          signature_def_map={
+              "default": tf.compat.v1.saved_model.predict_signature_def(
+                  {"words": words}, {"ids": ids}),
+              "large": tf.compat.v1.saved_model.predict_signature_def(
+                  {"x": x}, {"y": y}),
+          },
+          assets_collection=tf.compat.v1.get_collection(
+              tf.compat.v1.GraphKeys.ASSET_FILEPATHS),
+          main_op=tf.compat.v1.tables_initializer())
+      builder.save()
+
+
+class SignaturePruningTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    vocab_file = os.path.join(self.get_temp_dir(), "vocab.txt")
+    with open(vocab_file, "w") as f:
+      f.write("a\nb\nc\n")
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_tf1_model(self.model_dir, vocab_file)
+
+  def testLoadPrunedSignature(self):
+    obj = module_v2.load(self.model_dir, tags=["serve"],
+                         prune_to_signature="default")
+    self.assertEqual(list(obj.signatures.keys()), ["default"])
+    self.assertAllEqual(
+        obj.signatures["default"](words=tf.constant(["b", "c", "x"]))["ids"],
+        [2.0, 4.0, -2.0])
+    self.assertEqual([v.name for v in obj.variables], ["scale:0"])
+
+  def testPrunedCopyIsCached(self):
+    path = signature_pruning.pruned_module_path(
+        self.model_dir, ["serve"], "large")
+    self.assertStartsWith(path, self.model_dir + ".pruned-")
+    with mock.patch.object(
+        signature_pruning, "_write_pruned_module",
+        side_effect=AssertionError("pruned again")):
+      self.assertEqual(signature_pruning.pruned_module_path(
+          self.model_dir, ["serve"], "large"), path)
+      obj = module_v2.load(self.model_dir, tags=["serve"],
+                           prune_to_signature="large")
+    self.assertAllEqual(
+        obj.signatures["large"](x=tf.ones([1, 1000]))["y"],
+        np.full([1, 1000], 1000.0))
+    self.assertNotEqual(path, signature_pruning.pruned_module_path(
+        self.model_dir, ["serve"], "default"))
+
+  def testUnknownSignature(self):
+    with self.assertRaisesRegex(ValueError, "Unknown signature"):
+      signature_pruning.pruned_module_path(self.model_dir, ["serve"], "foo")
+
+  def testTf2ModelIsNotPruned(self):
+    tf2_dir = os.path.join(self.get_temp_dir(), "tf2_model")
+    obj = tf.Module()
+    obj.v = tf.Variable(1.0)
+    tf.saved_model.save(obj, tf2_dir)
+    self.assertIsNone(
+        signature_pruning.pruned_module_path(tf2_dir, None, "default"))
+    obj = module_v2.load(tf2_dir, prune_to_signature="default")
+    self.assertEqual(obj.v.numpy(), 1.0)
+
+
+if __name__ == "__main__":
+  tf.test.main()
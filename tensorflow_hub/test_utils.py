@@ -179,10 +179,12 @@ class EnvVariableContextManager(object):
 
   def __enter__(self):
     os.environ[self.key] = self.value
+    resolver.refresh_settings()
     return self
 
   def __exit__(self, exc_type, exc_value, exc_traceback):
     del os.environ[self.key]
+    resolver.refresh_settings()
     return True
 
 
@@ -0,0 +1,103 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Converts TF1 SavedModels to TF2 SavedModels, once, and caches them.
+
+Loading a TF1 SavedModel (including the TF1 Hub format) in TF2 imports its
+graph and wraps it into functions on every load. A TF2 SavedModel with the
+same signatures restores these functions directly, which is faster. The
+converted model is written to the TF-Hub cache directory, keyed by a hash of
+the module and the loaded tags, so the same module is converted only once
+per host, whatever path it is loaded from.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+from absl import logging
+import tensorflow as tf
+from tensorflow_hub import filesystem
+from tensorflow_hub import resolver
+from tensorflow_hub import tf_utils
+
+# pylint: disable=g-direct-tensorflow-import
+from tensorflow.core.protobuf import saved_model_pb2
+# pylint: enable=g-direct-tensorflow-import
+
+_CONVERTED_DIR = "tf2_converted"
+
+
+def _module_hash(module_path, tags):
+  """Returns a hash of a module's graphs and checkpoint, and of `tags`."""
+  sha1 = hashlib.sha1()
+  sha1.update(json.dumps(
+      None if tags is None else
+      sorted([tags] if isinstance(tags, str) else tags)).encode("utf8"))
+  tf_utils.update_hash_with_saved_model(sha1, module_path)
+  return sha1.hexdigest()
+
+
+def _convert(module_path, tags, export_dir):
+  """Loads a TF1 SavedModel and saves it as TF2 SavedModel to `export_dir`."""
+  # tf.compat.v1.saved_model.load_v2() is TF2 tf.saved_model.load() before TF2.
+  obj = tf.compat.v1.saved_model.load_v2(module_path, tags=tags)
+  # The loaded tables and assets are tracked by `obj`, so they are saved too.
+  tf.saved_model.save(obj, export_dir, signatures=dict(obj.signatures))
+
+
+def converted_module_path(module_path, tags):
+  """Returns the path of the TF2 conversion of a TF1 SavedModel.
+
+  The conversion is created on first use and cached, see the module
+  docstring. It must be loaded without tags.
+
+  Args:
+    module_path: The resolved module directory.
+    tags: The tags of the MetaGraph to convert, as for hub.load().
+
+  Returns:
+    The path of the converted SavedModel, or None if the module is not a TF1
+    SavedModel (or is stored as a text proto), which is not converted.
+
+  Raises:
+    ValueError: if the module needs to be converted outside of eager mode.
+  """
+  proto_path = os.path.join(tf.compat.as_str(module_path),
+                            tf.saved_model.SAVED_MODEL_FILENAME_PB)
+  if not filesystem.exists(proto_path):
+    return None
+  content = filesystem.read_file_to_string(proto_path, binary_mode=True)
+  saved_model = saved_model_pb2.SavedModel.FromString(content)
+  if any(meta_graph.object_graph_def.nodes
+         for meta_graph in saved_model.meta_graphs):
+    return None  # Already a TF2 SavedModel.
+  path = os.path.join(resolver.tfhub_cache_dir(use_temp=True), _CONVERTED_DIR,
+                      _module_hash(module_path, tags))
+  if filesystem.exists(path):
+    return path
+  if not tf.executing_eagerly():
+    raise ValueError("Converting a TF1 SavedModel to TF2 requires eager mode.")
+  logging.info("Converting %s to a TF2 SavedModel in %s.", module_path, path)
+  tmp_dir = "%s.tmp%s" % (path, uuid.uuid4().hex)
+  try:
+    _convert(module_path, tags, tmp_dir)
+    filesystem.rename(tmp_dir, path)
+  except tf.errors.AlreadyExistsError:
+    pass  # Another process converted it concurrently.
+  finally:
+    if filesystem.exists(tmp_dir):
+      filesystem.rmtree(tmp_dir)
+  return path
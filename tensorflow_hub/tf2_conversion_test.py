@@ -0,0 +1,109 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.tf2_conversion."""
+
+import os
+import shutil
+from unittest import mock
+
+import tensorflow as tf
+from tensorflow_hub import module_v2
+from tensorflow_hub import tf2_conversion
+
+
+def _save_tf1_hub_module(export_dir, vocab_file, scale):
+  """Saves a TF1 SavedModel with a vocabulary, marked as TF1 Hub format."""
+  with tf.Graph().as_default():
+    words = tf.compat.v1.placeholder(tf.string, [None])
+    table = tf.compat.v1.lookup.StaticHashTable(
+        tf.compat.v1.lookup.TextFileInitializer(
+            vocab_file, tf.string, tf.compat.v1.lookup.TextFileIndex.WHOLE_LINE,
+            tf.int64, tf.compat.v1.lookup.TextFileIndex.LINE_NUMBER),
+        default_value=-1)
+    scale = tf.compat.v1.get_variable("scale", initializer=scale)
+    ids = scale * tf.cast(table.lookup(words), tf.float32)
+    with tf.compat.v1.Session() as sess:
+      sess.run([tf.compat.v1.global_variables_initializer(),
+                tf.compat.v1.tables_initializer()])
+      builder = tf.compat.v1.saved_model.Builder(export_dir)
+      builder.add_meta_graph_and_variables(
+          sess, [],
+          signature_def_map={
+              "default": tf.compat.v1.saved_model.predict_signature_def(
+                  {"words": words}, {"default": ids}),
+          },
+          assets_collection=tf.compat.v1.get_collection(
+              tf.compat.v1.GraphKeys.ASSET_FILEPATHS),
+          main_op=tf.compat.v1.tables_initializer())
+      builder.save()
+  # An empty ModuleDef, which marks the TF1 Hub format.
+  with open(os.path.join(export_dir, "tfhub_module.pb"), "wb"):
+    pass
+
+
+class Tf2ConversionTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.vocab_file = os.path.join(self.get_temp_dir(), "vocab.txt")
+    with open(self.vocab_file, "w") as f:
+      f.write("a\nb\nc\n")
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_tf1_hub_module(self.model_dir, self.vocab_file, 2.0)
+    self.cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    env = mock.patch.dict(os.environ, {"TFHUB_CACHE_DIR": self.cache_dir})
+    env.start()
+    self.addCleanup(env.stop)
+
+  def _lookup(self, obj):
+    return obj.signatures["default"](words=tf.constant(["b", "x"]))["default"]
+
+  def testConvertsOnceAndReuses(self):
+    obj = module_v2.load(self.model_dir, convert_to_tf2=True)
+    self.assertAllEqual(self._lookup(obj), [2.0, -2.0])
+    self.assertTrue(obj._is_hub_module_v1)
+    converted = tf2_conversion.converted_module_path(self.model_dir, [])
+    self.assertStartsWith(converted, self.cache_dir)
+
+    # The conversion is independent of the original module and its path.
+    copy_dir = os.path.join(self.get_temp_dir(), "copy")
+    shutil.copytree(self.model_dir, copy_dir)
+    shutil.rmtree(self.model_dir)
+    os.remove(self.vocab_file)
+    with mock.patch.object(tf2_conversion, "_convert",
+                           side_effect=AssertionError("converted again")):
+      obj = module_v2.load(copy_dir, convert_to_tf2=True)
+    self.assertAllEqual(self._lookup(obj), [2.0, -2.0])
+
+  def testChangedModuleIsConvertedAgain(self):
+    first = tf2_conversion.converted_module_path(self.model_dir, [])
+    shutil.rmtree(self.model_dir)
+    _save_tf1_hub_module(self.model_dir, self.vocab_file, 3.0)
+    second = tf2_conversion.converted_module_path(self.model_dir, [])
+    self.assertNotEqual(first, second)
+    obj = module_v2.load(self.model_dir, convert_to_tf2=True)
+    self.assertAllEqual(self._lookup(obj), [3.0, -3.0])
+
+  def testTf2ModelIsNotConverted(self):
+    tf2_dir = os.path.join(self.get_temp_dir(), "tf2_model")
+    obj = tf.Module()
+    obj.v = tf.Variable(1.0)
+    tf.saved_model.save(obj, tf2_dir)
+    self.assertIsNone(tf2_conversion.converted_module_path(tf2_dir, None))
+    self.assertEqual(module_v2.load(tf2_dir, convert_to_tf2=True).v, 1.0)
+
+
+if __name__ == "__main__":
+  tf.test.main()
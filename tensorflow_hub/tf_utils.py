@@ -16,10 +16,10 @@
 
 import os
 import time
-import uuid
 
 from absl import logging
 import tensorflow as tf
+from tensorflow_hub import filesystem
 
 
 try:
@@ -40,17 +40,13 @@ def read_file_to_string(filename):
   Args:
     filename: string, path to a file
   """
-  return tf.compat.v1.gfile.GFile(filename, mode="r").read()
+  return filesystem.read_file_to_string(filename)
 
 
 def atomic_write_string_to_file(filename, contents, overwrite):
   """Writes to `filename` atomically.
 
-  This means that when `filename` appears in the filesystem, it will contain
-  all of `contents`. With write_string_to_file, it is possible for the file
-  to appear in the filesystem with `contents` only partially written.
-
-  Accomplished by writing to a temp file and then renaming it.
+  See filesystem.atomic_write_string_to_file().
 
   Args:
     filename: string, pathname for a file
@@ -58,16 +54,7 @@ def atomic_write_string_to_file(filename, contents, overwrite):
     overwrite: boolean, if false it's an error for `filename` to be occupied by
       an existing file.
   """
-  temp_pathname = (tf.compat.as_bytes(filename) +
-                   tf.compat.as_bytes(".tmp") +
-                   tf.compat.as_bytes(uuid.uuid4().hex))
-  with tf.compat.v1.gfile.GFile(temp_pathname, mode="w") as f:
-    f.write(contents)
-  try:
-    tf.compat.v1.gfile.Rename(temp_pathname, filename, overwrite)
-  except tf.errors.OpError:
-    tf.compat.v1.gfile.Remove(temp_pathname)
-    raise
+  filesystem.atomic_write_string_to_file(filename, contents, overwrite)
 
 
 # When we create a timestamped directory, there is a small chance that the
@@ -166,45 +153,54 @@ def garbage_collect_exports(export_dir_base, exports_to_keep):
 
 
 def bytes_to_readable_str(num_bytes, include_b=False):
-  """Generate a human-readable string representing number of bytes.
-
-  The units B, kB, MB and GB are used.
-
-  Args:
-    num_bytes: (`int` or None) Number of bytes.
-    include_b: (`bool`) Include the letter B at the end of the unit.
-
-  Returns:
-    (`str`) A string representing the number of bytes in a human-readable way,
-      including a unit at the end.
-  """
+  """Returns a human-readable string, see filesystem.bytes_to_readable_str()."""
+  return filesystem.bytes_to_readable_str(num_bytes, include_b)
 
-  if num_bytes is None:
-    return str(num_bytes)
-  if num_bytes < 1024:
-    result = "%d" % num_bytes
-  elif num_bytes < 1048576:
-    result = "%.2fk" % (num_bytes / float(1 << 10))
-  elif num_bytes < 1073741824:
-    result = "%.2fM" % (num_bytes / float(1 << 20))
-  else:
-    result = "%.2fG" % (num_bytes / float(1 << 30))
 
-  if include_b:
-    result += "B"
-  return result
+def absolute_path(path):
+  """Returns absolute path, see filesystem.absolute_path()."""
+  return filesystem.absolute_path(path)
 
 
-def absolute_path(path):
-  """Returns absolute path.
+def update_hash_with_saved_model(sha1, module_path):
+  """Updates a hashlib object with the graphs and checkpoint of a SavedModel.
 
   Args:
-    path: Path to compute absolute path from.
-
-  This implementation avoids calling os.path.abspath(path) if 'path' already
-  represents an absolute Tensorflow filesystem location (e.g. <fs type>://).
+    sha1: A hashlib object, like hashlib.sha1().
+    module_path: The SavedModel directory.
   """
-  return path if b"://" in tf.compat.as_bytes(path) else os.path.abspath(path)
+  module_path = tf.compat.as_str(module_path)
+  # The checkpoint index has checksums of all variable values, so it suffices
+  # to hash it instead of the much larger data files.
+  for filename in (tf.saved_model.SAVED_MODEL_FILENAME_PB,
+                   tf.saved_model.SAVED_MODEL_FILENAME_PBTXT,
+                   os.path.join("variables", "variables.index")):
+    path = os.path.join(module_path, filename)
+    if filesystem.exists(path):
+      sha1.update(filesystem.read_file_to_string(path, binary_mode=True))
+
+
+def relaxed_batch_spec(x):
+  """Returns the tf.TypeSpec of `x` with any batch size."""
+  spec = tf.type_spec_from_value(x)
+  shape = getattr(spec, "shape", None)
+  if shape is None or not shape.rank:
+    return spec
+  relaxed_shape = [None] + shape[1:]
+  if isinstance(spec, tf.TensorSpec):
+    return tf.TensorSpec(relaxed_shape, spec.dtype)
+  if isinstance(spec, tf.RaggedTensorSpec):
+    return tf.RaggedTensorSpec(relaxed_shape, spec.dtype, spec.ragged_rank,
+                               spec.row_splits_dtype)
+  if isinstance(spec, tf.SparseTensorSpec):
+    return tf.SparseTensorSpec(relaxed_shape, spec.dtype)
+  return spec
+
+
+def spec_key(specs):
+  """Returns a hashable key of a nest of tf.TypeSpecs and its structure."""
+  return (repr(tf.nest.map_structure(lambda _: None, specs)),
+          tuple(tf.nest.flatten(specs)))
 
 
 # A allowlist of argument types that are supported by hub.Module.  In theory,
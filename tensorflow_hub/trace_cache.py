@@ -0,0 +1,225 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Caches the traced calls of hub.KerasLayer across processes.
+
+A hub.KerasLayer with `traced_call_signatures` saves its call, traced for
+each of these input signatures, as a small SavedModel in the TF-Hub cache
+directory. It also contains the loaded model, which the traced functions
+capture. The cache key is a hash of the module, the layer arguments that
+affect the call, the input signatures and the TensorFlow version, so later
+constructions of the same layer load the traced functions instead of loading
+the module and tracing the call again.
+
+The cached SavedModel does not keep a copy of the variables: it records which
+tensor of the module's checkpoint each variable was read from, and load()
+restores them from there. Only if a variable cannot be found in the module's
+checkpoint (or the model has other state to save, like mutable tables) does
+the cache keep its own checkpoint, which is as large as the module's.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+from absl import logging
+import tensorflow as tf
+from tensorflow_hub import filesystem
+from tensorflow_hub import resolver
+from tensorflow_hub import tf_utils
+
+_TRACED_CALLS_DIR = "traced_calls"
+# Lists the checkpoint key in the module of each variable of a cached
+# SavedModel that has no checkpoint of its own.
+_VARIABLE_KEYS_FILENAME = "variable_keys.json"
+_VARIABLE_VALUE_SUFFIX = "/.ATTRIBUTES/VARIABLE_VALUE"
+
+
+def _signature_key(signature):
+  """Returns a JSON-serializable key for a nest of tf.TensorSpecs."""
+  def _spec_key(spec):
+    shape = None if spec.shape.rank is None else spec.shape.as_list()
+    return [shape, spec.dtype.name]
+  return tf.nest.map_structure(_spec_key, signature)
+
+
+def cache_path(module_path, layer_config, signatures):
+  """Returns the cache directory of the traced calls of a layer.
+
+  Args:
+    module_path: The resolved module directory.
+    layer_config: A JSON-serializable dict of the layer arguments that affect
+      the traced call.
+    signatures: A list of nests of tf.TensorSpecs, one per traced function.
+
+  Returns:
+    The path of the cached SavedModel, which may not exist yet.
+  """
+  sha1 = hashlib.sha1()
+  sha1.update(json.dumps({
+      "layer_config": layer_config,
+      "signatures": [_signature_key(s) for s in signatures],
+      "tf_version": tf.__version__,
+  }, sort_keys=True).encode("utf8"))
+  tf_utils.update_hash_with_saved_model(sha1, module_path)
+  return os.path.join(resolver.tfhub_cache_dir(use_temp=True),
+                      _TRACED_CALLS_DIR, sha1.hexdigest())
+
+
+def _checkpoint_prefix(module_path):
+  return os.path.join(tf.compat.as_str(module_path), "variables", "variables")
+
+
+def load(path, module_path):
+  """Returns the cached object at `path`, or None if there is none.
+
+  The object has attributes
+    * `calls`: a list of the traced functions, in the order of `signatures`;
+    * `variables`: a list of all variables of the model.
+
+  Args:
+    path: The cache directory returned by cache_path().
+    module_path: The resolved module directory passed to cache_path().
+  """
+  if not filesystem.exists(path):
+    return None
+  keys_path = os.path.join(path, _VARIABLE_KEYS_FILENAME)
+  if not filesystem.exists(keys_path):
+    return tf.saved_model.load(path)
+  keys = json.loads(filesystem.read_file_to_string(keys_path))
+  cached = tf.saved_model.load(
+      path,
+      options=tf.saved_model.LoadOptions(experimental_skip_checkpoint=True))
+  if keys:
+    reader = tf.train.load_checkpoint(_checkpoint_prefix(module_path))
+    for variable, key in zip(cached.variables, keys):
+      variable.assign(reader.get_tensor(key))
+  return cached
+
+
+def _value_key(value):
+  """Returns a hashable key of the dtype, shape and contents of a value."""
+  value = tf.convert_to_tensor(value)
+  return (value.dtype.name, tuple(value.shape.as_list()),
+          hashlib.sha1(tf.io.serialize_tensor(value).numpy()).digest())
+
+
+def _module_checkpoint_keys(variables, module_path):
+  """Returns the keys in the module's checkpoint of the variables' values.
+
+  Variables are matched by value, so for variables with equal values any of
+  the matching keys is returned. Tensors of the checkpoint are only read if
+  their dtype and shape are the ones of a variable.
+
+  Args:
+    variables: A list of variables.
+    module_path: The module directory.
+
+  Returns:
+    A list with a key for each variable, or None if some variable was not
+    found.
+  """
+  if not variables:
+    return []
+  prefix = _checkpoint_prefix(module_path)
+  if not filesystem.exists(prefix + ".index"):
+    return None
+  reader = tf.train.load_checkpoint(prefix)
+  dtypes = reader.get_variable_to_dtype_map()
+  wanted = {(v.dtype.base_dtype.name, tuple(v.shape.as_list()))
+            for v in variables}
+  keys_by_value = {}
+  for key, shape in reader.get_variable_to_shape_map().items():
+    if (dtypes[key].name, tuple(shape)) in wanted:
+      keys_by_value.setdefault(_value_key(reader.get_tensor(key)), key)
+  keys = [keys_by_value.get(_value_key(v)) for v in variables]
+  return None if None in keys else keys
+
+
+def _only_saves_variables(saved_model_dir, variables):
+  """Returns whether the checkpoint of a SavedModel holds just `variables`."""
+  num_values = 0
+  for key, _ in tf.train.list_variables(
+      os.path.join(saved_model_dir, "variables", "variables")):
+    # The save counters of tf.train.Checkpoint objects do not affect calls.
+    if (key == "_CHECKPOINTABLE_OBJECT_GRAPH" or
+        key.endswith("save_counter" + _VARIABLE_VALUE_SUFFIX)):
+      continue
+    if not key.endswith(_VARIABLE_VALUE_SUFFIX):
+      return False
+    num_values += 1
+  return num_values == len({id(v) for v in variables})
+
+
+def save(path, model, call, signatures, module_path):
+  """Traces `call` for each signature and saves it to `path`.
+
+  Args:
+    path: The cache directory returned by cache_path().
+    model: The loaded object used by `call`.
+    call: A callable taking the inputs of the layer.
+    signatures: A list of nests of tf.TensorSpecs, one per traced function.
+    module_path: The resolved module directory passed to cache_path(). The
+      variables of `model` are restored from its checkpoint by load().
+  """
+  root = tf.train.Checkpoint()
+  # Tracking the model saves the variables, tables and assets it captures.
+  root.model = model
+  root.variables = list(getattr(model, "variables", []))
+  root.calls = [tf.function(call, input_signature=[signature])
+                for signature in signatures]
+  logging.info("Saving traced calls to %s.", path)
+  tmp_dir = "%s.tmp%s" % (path, uuid.uuid4().hex)
+  try:
+    tf.saved_model.save(root, tmp_dir)
+    keys = None
+    if _only_saves_variables(tmp_dir, root.variables):
+      keys = _module_checkpoint_keys(root.variables, module_path)
+    if keys is None:
+      logging.warning(
+          "Not all variables used by the traced calls were found in the "
+          "checkpoint of %s, so %s keeps a copy of them.", module_path, path)
+    else:
+      filesystem.rmtree(os.path.join(tmp_dir, "variables"))
+      with filesystem.open_file(
+          os.path.join(tmp_dir, _VARIABLE_KEYS_FILENAME), "w") as f:
+        f.write(json.dumps(keys))
+    filesystem.rename(tmp_dir, path)
+  except tf.errors.AlreadyExistsError:
+    pass  # Another process saved it concurrently.
+  finally:
+    if filesystem.exists(tmp_dir):
+      filesystem.rmtree(tmp_dir)
+
+
+def _is_compatible(signature, inputs):
+  """Returns whether `inputs` can be passed for a nest of tf.TensorSpecs."""
+  try:
+    tf.nest.assert_same_structure(signature, inputs)
+  except (TypeError, ValueError):
+    return False
+  return all(
+      spec.is_compatible_with(tf.TensorSpec.from_tensor(
+          tf.convert_to_tensor(value, dtype_hint=spec.dtype)))
+      for spec, value in zip(tf.nest.flatten(signature),
+                             tf.nest.flatten(inputs)))
+
+
+def find_call(cached, inputs):
+  """Returns the first traced function of `cached` that accepts `inputs`."""
+  for call in cached.calls:
+    if _is_compatible(call.input_signature[0], inputs):
+      return call
+  return None
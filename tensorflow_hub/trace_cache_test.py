@@ -0,0 +1,98 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.trace_cache."""
+
+import os
+from unittest import mock
+
+import tensorflow as tf
+from tensorflow_hub import trace_cache
+
+
+def _save_times_two_model(export_dir, factor=2.):
+  obj = tf.train.Checkpoint()
+  obj.v = tf.Variable(factor)
+  obj.__call__ = tf.function(lambda x: x * obj.v,
+                             input_signature=[tf.TensorSpec(None)])
+  obj.variables = [obj.v]
+  tf.saved_model.save(obj, export_dir)
+
+
+class TraceCacheTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_times_two_model(self.model_dir)
+    self.cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    env = mock.patch.dict(os.environ, {"TFHUB_CACHE_DIR": self.cache_dir})
+    env.start()
+    self.addCleanup(env.stop)
+
+  def testCachePath(self):
+    signatures = [tf.TensorSpec([None, 3])]
+    path = trace_cache.cache_path(self.model_dir, {"a": 1}, signatures)
+    self.assertStartsWith(path, self.cache_dir)
+    self.assertEqual(
+        path, trace_cache.cache_path(self.model_dir, {"a": 1}, signatures))
+    self.assertNotEqual(
+        path, trace_cache.cache_path(self.model_dir, {"a": 2}, signatures))
+    self.assertNotEqual(path, trace_cache.cache_path(
+        self.model_dir, {"a": 1}, [tf.TensorSpec([None, 4])]))
+    other_dir = os.path.join(self.get_temp_dir(), "other")
+    _save_times_two_model(other_dir, factor=3.)
+    self.assertNotEqual(
+        path, trace_cache.cache_path(other_dir, {"a": 1}, signatures))
+
+  def testSaveAndLoad(self):
+    path = os.path.join(self.cache_dir, "traced")
+    self.assertIsNone(trace_cache.load(path, self.model_dir))
+    model = tf.saved_model.load(self.model_dir)
+    signatures = [tf.TensorSpec([None, 3]),
+                  {"x": tf.TensorSpec([None], tf.int64)}]
+    def call(inputs):
+      if isinstance(inputs, dict):
+        return tf.cast(inputs["x"], tf.float32) * model.v
+      return model(inputs) + 1.
+    trace_cache.save(path, model, call, signatures, self.model_dir)
+
+    # The variables are restored from the module instead of a copy.
+    self.assertFalse(os.path.exists(os.path.join(path, "variables")))
+    cached = trace_cache.load(path, self.model_dir)
+    self.assertLen(cached.variables, 1)
+    self.assertAllEqual(cached.variables[0], 2.)
+    x = tf.ones([2, 3])
+    self.assertIs(trace_cache.find_call(cached, x), cached.calls[0])
+    self.assertAllEqual(trace_cache.find_call(cached, x)(x), [[3.] * 3] * 2)
+    inputs = {"x": tf.constant([1, 2], tf.int64)}
+    self.assertAllEqual(trace_cache.find_call(cached, inputs)(inputs),
+                        [2., 4.])
+    self.assertIsNone(trace_cache.find_call(cached, tf.ones([2, 4])))
+    self.assertIsNone(trace_cache.find_call(cached, {"y": tf.ones([2])}))
+
+  def testSaveKeepsVariablesNotInTheModelCheckpoint(self):
+    path = os.path.join(self.cache_dir, "traced")
+    model = tf.saved_model.load(self.model_dir)
+    model.v.assign(5.)
+    trace_cache.save(path, model, model.__call__, [tf.TensorSpec([None])],
+                     self.model_dir)
+
+    self.assertTrue(os.path.exists(os.path.join(path, "variables")))
+    cached = trace_cache.load(path, self.model_dir)
+    self.assertAllEqual(cached.calls[0](tf.ones([2])), [5., 5.])
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -13,7 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 """Functions to resolve TF-Hub Modules stored in uncompressed folders on GCS."""
-import urllib
+import urllib.error
+import urllib.request
 
 from tensorflow_hub import resolver
 
@@ -0,0 +1,240 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Serves variable values of loaded models from a memory-mapped cache file.
+
+The values of all variables of a model are written once into a cache file
+next to the resolved module directory, each at a page-aligned offset. On
+load, the file is memory-mapped and every variable adopts a tensor that
+points into the mapping (imported through DLPack, which does not copy).
+The pages belong to the page cache, so all processes using the same model,
+including forked workers, share one copy of the values.
+
+The mapping is private: should a variable be assigned to in place, the
+touched pages are copied for that process only and the file is unchanged.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import uuid
+
+from absl import logging
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import filesystem
+from tensorflow_hub import resolver
+from tensorflow_hub import tf_utils
+
+CACHE_SUFFIX = ".variables.mmap"
+_MANIFEST_SUFFIX = ".json"
+_FORMAT_VERSION = 1
+_CHECKPOINT_INDEX = os.path.join("variables", "variables.index")
+# DTypes whose values can be shared. Others (e.g. strings) are restored from
+# the checkpoint as usual.
+_SHAREABLE_DTYPES = frozenset([
+    tf.float16, tf.float32, tf.float64,
+    tf.int8, tf.int16, tf.int32, tf.int64,
+    tf.uint8, tf.uint16, tf.uint32, tf.uint64,
+])
+
+
+def is_supported():
+  """Returns whether TensorFlow and numpy can share memory via DLPack."""
+  return (hasattr(getattr(tf, "experimental", None), "dlpack") and
+          hasattr(np.ndarray, "__dlpack__"))
+
+
+def cache_path(module_path):
+  """Returns the path of the variable cache file for a module directory.
+
+  The cache lives next to the module directory if that is local and
+  writable, otherwise in the TF-Hub cache directory.
+  """
+  module_path = tf.compat.as_str(module_path).rstrip("/")
+  parent = os.path.dirname(os.path.abspath(module_path))
+  if filesystem.is_local(module_path) and os.access(parent, os.W_OK):
+    return module_path + CACHE_SUFFIX
+  cache_dir = resolver.tfhub_cache_dir(use_temp=True)
+  return os.path.join(
+      cache_dir,
+      hashlib.sha1(module_path.encode("utf8")).hexdigest() + CACHE_SUFFIX)
+
+
+def _checkpoint_stamp(module_path):
+  """Returns size and mtime of the checkpoint index, to detect re-exports."""
+  index_path = os.path.join(tf.compat.as_str(module_path), _CHECKPOINT_INDEX)
+  if not filesystem.exists(index_path):
+    return None
+  stat = filesystem.stat(index_path)
+  return [stat.length, stat.mtime_nsec]
+
+
+def _model_variables(obj):
+  """Returns the variables of a loaded object in a deterministic order."""
+  if hasattr(tf.train, "TrackableView"):
+    candidates = tf.train.TrackableView(obj).descendants()
+  else:  # Before TF2.10.
+    candidates = getattr(obj, "variables", [])
+  variables = []
+  seen = set()
+  for candidate in candidates:
+    if isinstance(candidate, tf.Variable) and id(candidate) not in seen:
+      seen.add(id(candidate))
+      variables.append(candidate)
+  return variables
+
+
+class _Manifest(object):
+  """Describes the contents of a variable cache file."""
+
+  def __init__(self, fingerprint, checkpoint_stamp, entries):
+    self.fingerprint = fingerprint
+    self.checkpoint_stamp = checkpoint_stamp
+    # One dict per variable, with "name", "dtype", "shape" and "offset".
+    # The offset is None for variables whose values are not in the cache.
+    self.entries = entries
+
+  @property
+  def complete(self):
+    """Whether the values of all variables are in the cache."""
+    return all(entry["offset"] is not None for entry in self.entries)
+
+  def to_json(self):
+    return json.dumps({
+        "format_version": _FORMAT_VERSION,
+        "fingerprint": self.fingerprint,
+        "checkpoint_stamp": self.checkpoint_stamp,
+        "variables": self.entries,
+    })
+
+  @classmethod
+  def from_json(cls, content):
+    data = json.loads(content)
+    if data.get("format_version") != _FORMAT_VERSION:
+      return None
+    return cls(data["fingerprint"], data["checkpoint_stamp"],
+               data["variables"])
+
+
+def read_manifest(module_path, fingerprint=None):
+  """Returns the manifest of the variable cache of a module, if up to date.
+
+  Args:
+    module_path: The resolved module directory.
+    fingerprint: Optional SavedModel fingerprint of the module.
+
+  Returns:
+    The manifest, or None if there is no cache or it was created for a
+    different version of the module.
+  """
+  manifest_path = cache_path(module_path) + _MANIFEST_SUFFIX
+  if not filesystem.exists(manifest_path):
+    return None
+  try:
+    manifest = _Manifest.from_json(tf_utils.read_file_to_string(manifest_path))
+  except (ValueError, KeyError):
+    logging.warning("Ignoring corrupted variable cache %s.", manifest_path)
+    return None
+  if (manifest is None or manifest.fingerprint != fingerprint or
+      manifest.checkpoint_stamp != _checkpoint_stamp(module_path)):
+    return None
+  return manifest
+
+
+def write_cache(obj, module_path, fingerprint=None):
+  """Writes the variable values of a loaded object to its cache file.
+
+  Args:
+    obj: An object loaded from `module_path` with restored variables.
+    module_path: The resolved module directory.
+    fingerprint: Optional SavedModel fingerprint of the module.
+
+  Returns:
+    The manifest of the written cache.
+  """
+  path = cache_path(module_path)
+  filesystem.makedirs(os.path.dirname(path))
+  temp_path = "%s.tmp%s" % (path, uuid.uuid4().hex)
+  entries = []
+  offset = 0
+  with open(temp_path, "wb") as f:
+    for variable in _model_variables(obj):
+      entry = {
+          "name": variable.name,
+          "dtype": variable.dtype.name,
+          "shape": variable.shape.as_list(),
+          "offset": None,
+      }
+      if variable.dtype in _SHAREABLE_DTYPES:
+        # Page-aligned offsets keep every value aligned for TensorFlow, so
+        # that it can use the mapped memory without copying it.
+        offset = -(-offset // mmap.PAGESIZE) * mmap.PAGESIZE
+        f.seek(offset)
+        value = variable.numpy()
+        f.write(value.tobytes())
+        entry["offset"] = offset
+        offset += value.nbytes
+      entries.append(entry)
+    # Empty files cannot be memory-mapped.
+    f.truncate(max(offset, 1))
+  filesystem.rename(temp_path, path, overwrite=True)
+  manifest = _Manifest(fingerprint, _checkpoint_stamp(module_path), entries)
+  tf_utils.atomic_write_string_to_file(
+      path + _MANIFEST_SUFFIX, manifest.to_json(), overwrite=True)
+  return manifest
+
+
+def map_variables(obj, module_path, manifest):
+  """Makes the variables of a loaded object use the memory-mapped cache.
+
+  Args:
+    obj: An object loaded from `module_path`. Its variables need not be
+      restored if the cache is complete.
+    module_path: The resolved module directory.
+    manifest: The manifest of the cache, see read_manifest().
+
+  Returns:
+    False if the cache does not match the variables of `obj`; nothing has
+    been changed then. True otherwise.
+  """
+  variables = _model_variables(obj)
+  if len(variables) != len(manifest.entries):
+    return False
+  for variable, entry in zip(variables, manifest.entries):
+    if (entry["name"] != variable.name or
+        entry["dtype"] != variable.dtype.name or
+        entry["shape"] != variable.shape.as_list()):
+      return False
+
+  with open(cache_path(module_path), "rb") as f:
+    # A private, writable mapping: numpy cannot export read-only memory via
+    # DLPack, and writes must not reach the file.
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+  for variable, entry in zip(variables, manifest.entries):
+    if entry["offset"] is None:
+      continue
+    dtype = tf.as_dtype(entry["dtype"])
+    count = int(np.prod(entry["shape"], dtype=np.int64))
+    if not count:
+      variable.assign(tf.zeros(entry["shape"], dtype))
+      continue
+    value = np.frombuffer(
+        mapped, dtype=dtype.as_numpy_dtype, count=count,
+        offset=entry["offset"]).reshape(entry["shape"])
+    # The variable adopts the buffer of the imported tensor instead of
+    # copying it, as nothing else refers to that tensor.
+    variable.assign(tf.experimental.dlpack.from_dlpack(value.__dlpack__()))
+  return True
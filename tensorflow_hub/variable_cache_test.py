@@ -0,0 +1,122 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.variable_cache."""
+
+import json
+import os
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import module_v2
+from tensorflow_hub import variable_cache
+
+
+def _save_model(path, scale=1.0):
+  obj = tf.Module()
+  obj.w = tf.Variable(scale * np.arange(1000, dtype=np.float32))
+  obj.b = tf.Variable(np.int64(7))
+  obj.empty = tf.Variable(tf.zeros([0, 3]))
+  obj.vocab = tf.Variable(["a", "b"])
+
+  @tf.function(input_signature=[tf.TensorSpec([1000], tf.float32)])
+  def call(x):
+    return tf.reduce_sum(x * obj.w) + tf.cast(obj.b, tf.float32)
+
+  obj.__call__ = call
+  tf.saved_model.save(obj, path)
+
+
+class VariableCacheTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    if not variable_cache.is_supported():
+      self.skipTest("DLPack is not supported.")
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_model(self.model_dir)
+    self.inputs = tf.ones([1000])
+    self.expected = sum(range(1000)) + 7.0
+
+  def testCacheIsWrittenNextToModel(self):
+    obj = module_v2.load(self.model_dir, mmap_variables=True)
+    self.assertEqual(obj(self.inputs), self.expected)
+    cache = self.model_dir + variable_cache.CACHE_SUFFIX
+    self.assertEqual(variable_cache.cache_path(self.model_dir), cache)
+    self.assertTrue(tf.io.gfile.exists(cache))
+
+    with open(cache + ".json") as f:
+      entries = json.load(f)["variables"]
+    offsets = [e["offset"] for e in entries if e["offset"] is not None]
+    self.assertLen(offsets, 3)  # All but the string variable.
+    for offset in offsets:
+      self.assertEqual(offset % os.sysconf("SC_PAGE_SIZE"), 0)
+
+  def testVariablesUseMappedMemory(self):
+    obj = module_v2.load(self.model_dir, mmap_variables=True)
+    manifest = variable_cache.read_manifest(
+        self.model_dir, module_v2._saved_model_fingerprint(self.model_dir))
+    offset = [e["offset"] for e in manifest.entries if e["shape"] == [1000]][0]
+    # Writing to the file changes what the variable sees, so the variable
+    # holds no private copy of the value.
+    with open(variable_cache.cache_path(self.model_dir), "r+b") as f:
+      f.seek(offset)
+      f.write(np.zeros(1000, dtype=np.float32).tobytes())
+    self.assertEqual(obj(self.inputs), 7.0)
+
+  def testSecondLoadSkipsCheckpoint(self):
+    module_v2.load(self.model_dir, mmap_variables=True)
+    with mock.patch.object(
+        variable_cache, "write_cache",
+        side_effect=AssertionError("cache was rewritten")):
+      obj = module_v2.load(self.model_dir, mmap_variables=True)
+    self.assertEqual(obj(self.inputs), self.expected)
+    self.assertAllEqual(obj.vocab, [b"a", b"b"])
+
+  def testStaleCacheIsReplaced(self):
+    module_v2.load(self.model_dir, mmap_variables=True)
+    _save_model(self.model_dir, scale=2.0)
+    obj = module_v2.load(self.model_dir, mmap_variables=True)
+    self.assertEqual(obj(self.inputs), 2 * sum(range(1000)) + 7.0)
+
+  def testAssignDoesNotChangeCache(self):
+    obj = module_v2.load(self.model_dir, mmap_variables=True)
+    obj.w.assign_add(tf.ones([1000]))
+    self.assertEqual(obj(self.inputs), self.expected + 1000)
+    obj = module_v2.load(self.model_dir, mmap_variables=True)
+    self.assertEqual(obj(self.inputs), self.expected)
+
+  def testTf1SavedModel(self):
+    export_dir = os.path.join(self.get_temp_dir(), "tf1_model")
+    with tf.Graph().as_default():
+      x = tf.compat.v1.placeholder(tf.float32, [None])
+      a = tf.compat.v1.get_variable("a", initializer=0.5)
+      y = a * x + 2.0
+      with tf.compat.v1.Session() as sess:
+        sess.run(tf.compat.v1.global_variables_initializer())
+        builder = tf.compat.v1.saved_model.Builder(export_dir)
+        builder.add_meta_graph_and_variables(
+            sess, ["serve"], signature_def_map={
+                "default": tf.compat.v1.saved_model.predict_signature_def(
+                    {"x": x}, {"y": y})})
+        builder.save()
+    for _ in range(2):  # Create the cache, then use it.
+      obj = module_v2.load(export_dir, tags=["serve"], mmap_variables=True)
+      self.assertAllEqual(
+          obj.signatures["default"](x=tf.constant([2.0]))["y"], [3.0])
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -0,0 +1,82 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.variable_prefetch."""
+
+import os
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import module_v2
+from tensorflow_hub import variable_prefetch
+
+
+def _save_model(path):
+  obj = tf.Module()
+  obj.w = tf.Variable(np.ones(100000, dtype=np.float32))
+
+  @tf.function(input_signature=[])
+  def call():
+    return tf.reduce_sum(obj.w)
+
+  obj.__call__ = call
+  tf.saved_model.save(obj, path)
+
+
+def _checkpoint_size(path):
+  variables_dir = os.path.join(path, "variables")
+  return sum(os.path.getsize(os.path.join(variables_dir, name))
+             for name in os.listdir(variables_dir))
+
+
+class VariablePrefetchTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_model(self.model_dir)
+
+  def testReadsAllCheckpointFiles(self):
+    prefetcher = variable_prefetch.VariablePrefetcher(
+        self.model_dir, max_workers=3, chunk_size=4096).start()
+    prefetcher.wait()
+    self.assertEqual(prefetcher.bytes_read, _checkpoint_size(self.model_dir))
+
+  def testCancelledPrefetcherReadsNothing(self):
+    prefetcher = variable_prefetch.VariablePrefetcher(
+        self.model_dir, max_workers=1, chunk_size=4096)
+    prefetcher.cancel()
+    prefetcher.start()
+    prefetcher.wait()
+    self.assertEqual(prefetcher.bytes_read, 0)
+
+  def testIgnoresNonLocalAndMissingPaths(self):
+    for path in ("gs://bucket/model", os.path.join(self.get_temp_dir(), "x")):
+      prefetcher = variable_prefetch.VariablePrefetcher(path).start()
+      prefetcher.wait()
+      self.assertEqual(prefetcher.bytes_read, 0)
+
+  def testLoadWithPrefetch(self):
+    with mock.patch.object(
+        variable_prefetch.VariablePrefetcher, "start",
+        autospec=True,
+        side_effect=variable_prefetch.VariablePrefetcher.start) as start:
+      obj = module_v2.load(self.model_dir, prefetch_variables=True)
+    start.assert_called_once()
+    self.assertEqual(obj(), 100000.0)
+
+
+if __name__ == "__main__":
+  tf.test.main()
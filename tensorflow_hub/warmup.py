@@ -0,0 +1,267 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Runs sample inputs through loaded models before they serve requests.
+
+The first call of a loaded function instantiates and optimizes its graph,
+which can take seconds for large models. Warming up moves that cost from the
+first request to load time.
+
+A warmup is specified either as True, to replay the requests of TensorFlow
+Serving's warmup file in the module (see WARMUP_REQUESTS_FILE), or as a list
+of specs, each one of
+  * an int: a batch size, which is combined with the input signature of the
+    called function (other unknown dimensions become 1) to call it with
+    zeros;
+  * a tf.TensorSpec, or a nest of them: the function is called with zeros of
+    these shapes and dtypes;
+  * anything else: sample inputs to call the function with as they are.
+"""
+
+import os
+
+from absl import logging
+import tensorflow as tf
+from tensorflow_hub import filesystem
+
+# pylint: disable=g-direct-tensorflow-import
+from tensorflow.core.framework import tensor_pb2
+# pylint: enable=g-direct-tensorflow-import
+
+WARMUP_REQUESTS_FILE = os.path.join("assets.extra",
+                                    "tf_serving_warmup_requests")
+
+# Field numbers of TensorFlow Serving's PredictionLog protos. They are
+# decoded by hand to avoid a dependency on tensorflow-serving-api.
+_PREDICTION_LOG_PREDICT_LOG = 6
+_PREDICT_LOG_REQUEST = 1
+_PREDICT_REQUEST_MODEL_SPEC = 1
+_PREDICT_REQUEST_INPUTS = 2
+_MODEL_SPEC_SIGNATURE_NAME = 3
+_MAP_ENTRY_KEY = 1
+_MAP_ENTRY_VALUE = 2
+
+_DEFAULT_SERVING_SIGNATURE = "serving_default"
+
+
+def _read_varint(data, pos):
+  """Returns the varint at data[pos:] and the position after it."""
+  result = 0
+  shift = 0
+  while True:
+    byte = data[pos]
+    pos += 1
+    result |= (byte & 0x7f) << shift
+    if not byte & 0x80:
+      return result, pos
+    shift += 7
+
+
+def _parse_fields(data):
+  """Yields the (field number, value) pairs of a serialized proto."""
+  pos = 0
+  while pos < len(data):
+    key, pos = _read_varint(data, pos)
+    field_number, wire_type = key >> 3, key & 7
+    if wire_type == 0:
+      value, pos = _read_varint(data, pos)
+    elif wire_type == 1:
+      value, pos = data[pos:pos + 8], pos + 8
+    elif wire_type == 2:
+      length, pos = _read_varint(data, pos)
+      value, pos = data[pos:pos + length], pos + length
+    elif wire_type == 5:
+      value, pos = data[pos:pos + 4], pos + 4
+    else:
+      raise ValueError("Unsupported proto wire type %d." % wire_type)
+    yield field_number, value
+
+
+def _get_field(data, field_number, default=b""):
+  """Returns the last value of a field of a serialized proto."""
+  for number, value in _parse_fields(data):
+    if number == field_number:
+      default = value
+  return default
+
+
+def _parse_predict_request(request):
+  """Returns the signature name and input tensors of a PredictRequest."""
+  model_spec = _get_field(request, _PREDICT_REQUEST_MODEL_SPEC)
+  signature_name = tf.compat.as_str(
+      _get_field(model_spec, _MODEL_SPEC_SIGNATURE_NAME))
+  inputs = {}
+  for number, entry in _parse_fields(request):
+    if number == _PREDICT_REQUEST_INPUTS:
+      key = tf.compat.as_str(_get_field(entry, _MAP_ENTRY_KEY))
+      value = tensor_pb2.TensorProto.FromString(
+          _get_field(entry, _MAP_ENTRY_VALUE))
+      inputs[key] = tf.constant(tf.make_ndarray(value))
+  return signature_name or _DEFAULT_SERVING_SIGNATURE, inputs
+
+
+def read_warmup_requests(module_path):
+  """Reads the warmup requests of TensorFlow Serving from a module.
+
+  Only requests for the Predict API are read; others are skipped.
+
+  Args:
+    module_path: The resolved module directory.
+
+  Returns:
+    A list of (signature name, dict of input tensors) pairs, or None if the
+    module has no file with warmup requests.
+  """
+  path = os.path.join(tf.compat.as_str(module_path), WARMUP_REQUESTS_FILE)
+  if not filesystem.exists(path):
+    return None
+  requests = []
+  for record in tf.compat.v1.io.tf_record_iterator(path):
+    predict_log = _get_field(record, _PREDICTION_LOG_PREDICT_LOG, None)
+    if predict_log is None:
+      logging.warning("Skipping a warmup request in %s that is not for the "
+                      "Predict API.", path)
+      continue
+    requests.append(_parse_predict_request(
+        _get_field(predict_log, _PREDICT_LOG_REQUEST)))
+  return requests
+
+
+def _is_function(fn):
+  """Returns whether `fn` is a tf.function or (restored) concrete function."""
+  return any(hasattr(fn, attr) for attr in (
+      "input_signature", "concrete_functions", "structured_input_signature"))
+
+
+def input_signature(fn):
+  """Returns the nest of tf.TensorSpecs of the input of `fn`, or None.
+
+  Args:
+    fn: A tf.function, restored function or concrete function, or a loaded
+      object with such a __call__ function. Signatures take a dict of inputs
+      as keyword arguments, everything else a single positional argument.
+
+  Returns:
+    The nest of TensorSpecs of the dict of inputs or the positional
+    argument, or None if that is not known.
+  """
+  if not _is_function(fn) and _is_function(getattr(fn, "__call__", None)):
+    # Loaded objects are called through their restored __call__ function.
+    fn = fn.__call__
+  if getattr(fn, "input_signature", None):
+    return fn.input_signature[0]
+  concrete_functions = getattr(fn, "concrete_functions", None)
+  if concrete_functions:
+    fn = concrete_functions[0]
+  signature = getattr(fn, "structured_input_signature", None)
+  if signature is None:
+    return None
+  args, kwargs = signature
+  return args[0] if args else kwargs
+
+
+def make_inputs(spec, signature):
+  """Returns the sample inputs for one warmup spec, see module docstring."""
+  if isinstance(spec, int) and not isinstance(spec, bool):
+    if signature is None:
+      raise ValueError(
+          "Cannot warm up with batch size %d: the input signature of the "
+          "model is unknown. Pass tf.TensorSpecs or sample inputs instead."
+          % spec)
+    batch_size = spec
+    def _batched(tensor_spec):
+      if tensor_spec.shape.rank is None:
+        dims = [batch_size]
+      else:
+        dims = tensor_spec.shape.as_list()
+        if dims:
+          dims = [batch_size] + [1 if d is None else d for d in dims[1:]]
+      return tf.TensorSpec(dims, tensor_spec.dtype)
+    spec = tf.nest.map_structure(_batched, signature)
+  if all(isinstance(s, tf.TensorSpec) for s in tf.nest.flatten(spec)):
+    def _zeros(tensor_spec):
+      if not tensor_spec.shape.is_fully_defined():
+        raise ValueError("Cannot warm up with %s of unknown shape."
+                         % tensor_spec)
+      return tf.zeros(tensor_spec.shape, tensor_spec.dtype)
+    return tf.nest.map_structure(_zeros, spec)
+  return spec
+
+
+def warm_up(call, specs, signature=None):
+  """Calls `call` with the sample inputs of each warmup spec.
+
+  Args:
+    call: A callable taking the sample inputs.
+    specs: A list of warmup specs, see module docstring.
+    signature: The nest of tf.TensorSpecs of the inputs of `call` as
+      returned by input_signature(), or None if unknown.
+  """
+  for spec in specs:
+    call(make_inputs(spec, signature))
+
+
+def warm_up_signatures(obj, requests):
+  """Calls the signatures of a loaded object with the given requests.
+
+  Args:
+    obj: An object loaded by hub.load().
+    requests: A list of (signature name, dict of inputs) pairs, as returned
+      by read_warmup_requests().
+  """
+  for signature_name, inputs in requests:
+    if signature_name not in obj.signatures:
+      # For example, when loading a pruned copy of a TF1 model.
+      logging.info("Skipping warmup request for unknown signature %s.",
+                   signature_name)
+      continue
+    obj.signatures[signature_name](**inputs)
+
+
+def warm_up_loaded_object(obj, module_path, warmup):
+  """Warms up an object loaded by hub.load() from `module_path`.
+
+  A warmup of True replays the module's warmup requests on its signatures.
+  A list of specs is applied to the object itself, if it is callable and not
+  in the TF1 Hub format, or else to its default signature.
+
+  Args:
+    obj: The loaded object.
+    module_path: The resolved module directory, to read warmup requests from.
+    warmup: True, or a list of warmup specs. See module docstring.
+
+  Raises:
+    ValueError: if the warmup cannot be applied to the object.
+  """
+  if not tf.executing_eagerly():
+    raise ValueError("Warmup requires eager mode.")
+  if warmup is True:
+    requests = read_warmup_requests(module_path)
+    if requests is None:
+      raise ValueError("Module %s has no warmup requests in %s."
+                       % (module_path, WARMUP_REQUESTS_FILE))
+    warm_up_signatures(obj, requests)
+    return
+  if callable(obj) and not getattr(obj, "_is_hub_module_v1", False):
+    warm_up(obj, warmup, input_signature(obj))
+    return
+  signatures = getattr(obj, "signatures", {})
+  names = [name for name in ("default", _DEFAULT_SERVING_SIGNATURE)
+           if name in signatures]
+  if not names:
+    raise ValueError("Cannot warm up %s: it is not callable and has neither "
+                     "a 'default' nor a '%s' signature."
+                     % (module_path, _DEFAULT_SERVING_SIGNATURE))
+  fn = signatures[names[0]]
+  warm_up(lambda inputs: fn(**inputs), warmup, input_signature(fn))
@@ -0,0 +1,126 @@
+# Copyright 2026 The TensorFlow Hub Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for tensorflow_hub.warmup."""
+
+import os
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow_hub import module_v2
+from tensorflow_hub import warmup
+
+
+def _field(number, payload):
+  """Serializes a length-delimited proto field."""
+  key = bytes([number << 3 | 2])
+  length = len(payload)
+  varint = b""
+  while length >= 0x80:
+    varint += bytes([length & 0x7f | 0x80])
+    length >>= 7
+  return key + varint + bytes([length]) + payload
+
+
+def _predict_log(signature_name, inputs):
+  """Serializes a tensorflow.serving.PredictionLog with a PredictRequest."""
+  request = _field(1, _field(3, signature_name.encode("utf8")))
+  for key, value in inputs.items():
+    tensor = tf.make_tensor_proto(value).SerializeToString()
+    request += _field(2, _field(1, key.encode("utf8")) + _field(2, tensor))
+  return _field(6, _field(1, request))
+
+
+def _save_plus_one_model(export_dir):
+  obj = tf.Module()
+  obj.__call__ = tf.function(
+      lambda x: x + 1., input_signature=[tf.TensorSpec([None, 3])])
+  tf.saved_model.save(obj, export_dir, signatures={
+      "serving_default": obj.__call__.get_concrete_function(),
+  })
+
+
+class WarmupTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.model_dir = os.path.join(self.get_temp_dir(), "model")
+    _save_plus_one_model(self.model_dir)
+
+  def _write_warmup_requests(self, records):
+    path = os.path.join(self.model_dir, warmup.WARMUP_REQUESTS_FILE)
+    os.makedirs(os.path.dirname(path))
+    with tf.io.TFRecordWriter(path) as writer:
+      for record in records:
+        writer.write(record)
+
+  def testReadWarmupRequests(self):
+    self.assertIsNone(warmup.read_warmup_requests(self.model_dir))
+    big_input = np.zeros([100, 3], dtype=np.float32)
+    self._write_warmup_requests([
+        _predict_log("", {"x": big_input}),
+        _field(2, b""),  # A ClassifyLog, which is skipped.
+        _predict_log("other", {"a": np.array([b"foo"]), "b": 1}),
+    ])
+    requests = warmup.read_warmup_requests(self.model_dir)
+    self.assertEqual([name for name, _ in requests],
+                     ["serving_default", "other"])
+    self.assertAllEqual(requests[0][1]["x"], big_input)
+    self.assertAllEqual(requests[1][1]["a"], [b"foo"])
+    self.assertEqual(requests[1][1]["b"], 1)
+
+  def testLoadWithWarmupRequests(self):
+    self._write_warmup_requests(
+        [_predict_log("", {"x": np.ones([4, 3], np.float32)})])
+    with mock.patch.object(warmup, "warm_up_signatures",
+                           side_effect=warmup.warm_up_signatures) as run:
+      obj, report = module_v2.load(self.model_dir, warmup=True,
+                                   return_report=True)
+    self.assertEqual(run.call_count, 1)
+    self.assertIsNotNone(report.get("warmup"))
+    self.assertAllEqual(obj(tf.ones([1, 3])), [[2., 2., 2.]])
+
+  def testLoadWithoutWarmupRequestsFails(self):
+    with self.assertRaisesRegex(ValueError, "has no warmup requests"):
+      module_v2.load(self.model_dir, warmup=True)
+
+  def testLoadWithWarmupSpecs(self):
+    specs = [2, tf.TensorSpec([5, 3]), np.ones([1, 3], np.float32)]
+    with mock.patch.object(warmup, "make_inputs",
+                           side_effect=warmup.make_inputs) as make_inputs:
+      obj = module_v2.load(self.model_dir, warmup=specs)
+    inputs = [make_inputs.side_effect(*args)
+              for args, _ in make_inputs.call_args_list]
+    self.assertEqual([list(x.shape) for x in inputs],
+                     [[2, 3], [5, 3], [1, 3]])
+    self.assertAllEqual(obj(tf.ones([1, 3])), [[2., 2., 2.]])
+
+  def testMakeInputs(self):
+    signature = {"ids": tf.TensorSpec([None, None], tf.int64),
+                 "text": tf.TensorSpec(None, tf.string)}
+    inputs = warmup.make_inputs(8, signature)
+    self.assertEqual(inputs["ids"].shape, [8, 1])
+    self.assertEqual(inputs["ids"].dtype, tf.int64)
+    self.assertAllEqual(inputs["text"], [b""] * 8)
+    sample = {"ids": np.array([[1, 2]])}
+    self.assertIs(warmup.make_inputs(sample, signature), sample)
+    with self.assertRaisesRegex(ValueError, "input signature"):
+      warmup.make_inputs(8, None)
+    with self.assertRaisesRegex(ValueError, "unknown shape"):
+      warmup.make_inputs(tf.TensorSpec([None]), None)
+
+
+if __name__ == "__main__":
+  tf.test.main()